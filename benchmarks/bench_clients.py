@@ -0,0 +1,441 @@
+"""Offline benchmark of every `KorapayClient` and `AsyncKorapayClient` method.
+
+Requests are answered in-process by an `httpx.MockTransport` with canned Korapay responses, so the
+results only reflect the client's own overhead i.e., validation, serialization, encryption, the
+httpx request/response cycle and deserialization. For each client method it reports:
+
+- calls/s: calls completed per second of wall clock time.
+- cpu us/call: process CPU time per call.
+- peak KiB/call: the peak memory allocated while making a call.
+- retained KiB: memory still allocated after all the calls, which should not grow with `--allocations-number`.
+
+Run with `python -m benchmarks.bench_clients` from the project root. Save the results with
+`--json results.json` and compare a later run against them with `--baseline results.json` to exit
+with a non-zero status when a method regressed by more than `--threshold`.
+
+To benchmark against real Korapay responses instead of canned ones, record them once from the
+sandbox with `--record cassette.jsonl.gz`, using the keys in the `KORAPAY_*` environmental
+variables, then replay them offline with `--cassette cassette.jsonl.gz`. Client methods without a
+recorded response are skipped.
+"""
+
+import argparse
+import asyncio
+import functools
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+import httpx
+
+from korapay_client import (
+    AsyncKorapayClient,
+    Authorization,
+    Country,
+    Currency,
+    KorapayClient,
+    MobileMoneyOperator,
+    PayoutOrder,
+)
+from korapay_client.enums import ClientMethod
+from korapay_client.testing import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+ENCRYPTION_KEY = "0123456789abcdef0123456789abcdef"
+
+CANNED_DATA: dict[str, object] = {
+    "/merchant/api/v1/balances": {
+        "NGN": {"pending_balance": 0, "available_balance": 250_000},
+        "KES": {"pending_balance": 0, "available_balance": 10_000},
+    },
+    "/merchant/api/v1/misc/banks": [
+        {"name": f"Bank {index}", "slug": f"bank-{index}", "code": f"{index:03}"}
+        for index in range(40)
+    ],
+    "/merchant/api/v1/misc/mobile-money": [
+        {
+            "name": f"Operator {index}",
+            "slug": f"operator-{index}",
+            "code": f"op-{index}",
+        }
+        for index in range(5)
+    ],
+}
+DEFAULT_DATA = {
+    "reference": "ref-0000000001",
+    "status": "success",
+    "amount": 1000,
+    "fee": 15,
+    "currency": "NGN",
+    "narration": "Benchmark",
+    "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+}
+
+CLIENT_CALLS: dict[ClientMethod, tuple[str, dict]] = {
+    ClientMethod.CHARGE_VIA_CARD: (
+        "charge_via_card",
+        {
+            "reference": "ref-0000000001",
+            "customer_name": "John Doe",
+            "customer_email": "johndoe@example.com",
+            "card": {
+                "number": "4084127883172787",
+                "cvv": "123",
+                "expiry_month": "09",
+                "expiry_year": "30",
+            },
+            "amount": 1000,
+            "currency": Currency.NGN,
+            "redirect_url": "https://example.com/redirect",
+            "metadata": {"client_id": "qwerty"},
+        },
+    ),
+    ClientMethod.AUTHORIZE_CARD_CHARGE: (
+        "authorize_card_charge",
+        {
+            "transaction_reference": "KPY-CA-0000000001",
+            "authorization": Authorization(pin="1234"),
+        },
+    ),
+    ClientMethod.RESEND_CARD_OTP: (
+        "resend_card_otp",
+        {"transaction_reference": "KPY-CA-0000000001"},
+    ),
+    ClientMethod.CHARGE_VIA_BANK_TRANSFER: (
+        "charge_via_bank_transfer",
+        {
+            "reference": "ref-0000000002",
+            "customer_email": "johndoe@example.com",
+            "amount": Decimal("1000.50"),
+            "currency": Currency.NGN,
+            "customer_name": "John Doe",
+            "narration": "Benchmark transfer",
+            "merchant_bears_cost": True,
+        },
+    ),
+    ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT: (
+        "create_virtual_bank_account",
+        {
+            "account_name": "John Doe",
+            "account_reference": "ref-0000000003",
+            "bank_code": "000",
+            "customer_name": "John Doe",
+            "bvn": "12345678901",
+            "customer_email": "johndoe@example.com",
+        },
+    ),
+    ClientMethod.GET_VIRTUAL_BANK_ACCOUNT: (
+        "get_virtual_bank_account",
+        {"account_reference": "ref-0000000003"},
+    ),
+    ClientMethod.GET_VIRTUAL_BANK_ACCOUNT_TRANSACTIONS: (
+        "get_virtual_bank_account_transactions",
+        {"account_number": "0000000000"},
+    ),
+    ClientMethod.CREDIT_SANDBOX_VIRTUAL_BANK_ACCOUNT: (
+        "credit_sandbox_virtual_bank_account",
+        {"account_number": "0000000000", "amount": 1000, "currency": Currency.NGN},
+    ),
+    ClientMethod.CHARGE_VIA_MOBILE_MONEY: (
+        "charge_via_mobile_money",
+        {
+            "reference": "ref-0000000004",
+            "customer_email": "johndoe@example.com",
+            "amount": 1000,
+            "mobile_money_number": "254700000000",
+            "currency": Currency.KES,
+        },
+    ),
+    ClientMethod.AUTHORIZE_MOBILE_MONEY_CHARGE: (
+        "authorize_mobile_money_charge",
+        {"reference": "ref-0000000004", "token": "123456"},
+    ),
+    ClientMethod.RESEND_MOBILE_MONEY_OTP: (
+        "resend_mobile_money_otp",
+        {"transaction_reference": "KPY-MM-0000000001"},
+    ),
+    ClientMethod.RESEND_STK: (
+        "resend_stk",
+        {"transaction_reference": "KPY-MM-0000000001"},
+    ),
+    ClientMethod.AUTHORIZE_STK: (
+        "authorize_stk",
+        {"reference": "ref-0000000004", "pin": "1234"},
+    ),
+    ClientMethod.INITIATE_CHARGE: (
+        "initiate_charge",
+        {
+            "reference": "ref-0000000005",
+            "amount": 1000,
+            "currency": Currency.NGN,
+            "narration": "Benchmark charge",
+            "notification_url": "https://example.com/webhook",
+            "customer_email": "johndoe@example.com",
+            "customer_name": "John Doe",
+        },
+    ),
+    ClientMethod.GET_CHARGE: ("get_charge", {"reference": "ref-0000000005"}),
+    ClientMethod.RESOLVE_BANK_ACCOUNT: (
+        "resolve_bank_account",
+        {"bank_code": "033", "account_number": "0000000000"},
+    ),
+    ClientMethod.GET_BALANCES: ("get_balances", {}),
+    ClientMethod.GET_BANKS: ("get_banks", {"country": Country.NIGERIA}),
+    ClientMethod.GET_MMO: ("get_mmo", {"country": Country.KENYA}),
+    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: (
+        "payout_to_bank_account",
+        {
+            "reference": "ref-0000000006",
+            "amount": 1000,
+            "currency": Currency.NGN,
+            "bank_code": "033",
+            "account_number": "0000000000",
+            "customer_email": "johndoe@example.com",
+            "narration": "Benchmark payout",
+            "customer_name": "John Doe",
+        },
+    ),
+    ClientMethod.PAYOUT_TO_MOBILE_MONEY: (
+        "payout_to_mobile_money",
+        {
+            "reference": "ref-0000000007",
+            "amount": 1000,
+            "currency": Currency.KES,
+            "mobile_money_operator": MobileMoneyOperator.SAFARICOM_KENYA,
+            "mobile_number": "254700000000",
+            "customer_email": "johndoe@example.com",
+        },
+    ),
+    ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT: (
+        "bulk_payout_to_bank_account",
+        {
+            "batch_reference": "batch-0000000001",
+            "description": "Benchmark bulk payout",
+            "merchant_bears_cost": True,
+            "currency": Currency.NGN,
+            "payouts": [
+                PayoutOrder.model_validate(
+                    {
+                        "reference": f"ref-{index:010}",
+                        "amount": 1000,
+                        "bank_account": {
+                            "bank_code": "033",
+                            "account_number": "0000000000",
+                        },
+                        "customer": {"email": "johndoe@example.com"},
+                    }
+                )
+                for index in range(10)
+            ],
+        },
+    ),
+    ClientMethod.GET_PAYOUTS: ("get_payouts", {"bulk_reference": "batch-0000000001"}),
+    ClientMethod.GET_BULK_TRANSACTION: (
+        "get_bulk_transaction",
+        {"bulk_reference": "batch-0000000001"},
+    ),
+    ClientMethod.VERIFY_PAYOUT_TRANSACTION: (
+        "get_payout_transaction",
+        {"transaction_reference": "ref-0000000006"},
+    ),
+}
+
+
+def handle_request(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "status": True,
+            "message": "Request completed successfully",
+            "data": CANNED_DATA.get(request.url.path, DEFAULT_DATA),
+        },
+    )
+
+
+def make_client(client_class, transport=None):
+    return client_class(
+        public_key="pk_test_benchmark",
+        secret_key="sk_test_benchmark",
+        encryption_key=ENCRYPTION_KEY,
+        transport=transport or httpx.MockTransport(handle_request),
+    )
+
+
+def record(path: str) -> None:
+    with KorapayClient(transport=RecordingTransport(path)) as client:
+        for method_name, kwargs in CLIENT_CALLS.values():
+            response = getattr(client, method_name)(**kwargs)
+            print(f"{method_name:<40}{response.status_code:>5}")
+
+
+def measure_allocations(call, number: int) -> tuple[float, float]:
+    tracemalloc.start()
+    try:
+        call()
+        gc.collect()
+        current_before, _ = tracemalloc.get_traced_memory()
+        peak_total = 0
+        for _ in range(number):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+        gc.collect()
+        current_after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_total / number / 1024, (current_after - current_before) / 1024
+
+
+def measure(call, number: int, allocations_number: int) -> dict:
+    call()
+    wall_started_at, cpu_started_at = time.perf_counter(), time.process_time()
+    for _ in range(number):
+        call()
+    wall, cpu = (
+        time.perf_counter() - wall_started_at,
+        time.process_time() - cpu_started_at,
+    )
+    peak_kib, retained_kib = measure_allocations(call, allocations_number)
+    return {
+        "calls_per_second": number / wall,
+        "cpu_us_per_call": cpu / number * 1e6,
+        "peak_kib_per_call": peak_kib,
+        "retained_kib": retained_kib,
+    }
+
+
+def run_sync(number: int, allocations_number: int, transport=None) -> dict[str, dict]:
+    results = {}
+    with make_client(KorapayClient, transport) as client:
+        for method_name, kwargs in CLIENT_CALLS.values():
+            method = getattr(client, method_name)
+            try:
+                results[method_name] = measure(
+                    functools.partial(method, **kwargs), number, allocations_number
+                )
+            except CassetteMissError:
+                continue
+    return results
+
+
+def run_async(number: int, allocations_number: int, transport=None) -> dict[str, dict]:
+    # Each call runs to completion on one event loop so the measurements cover the client
+    # rather than event loop start up.
+    loop = asyncio.new_event_loop()
+    client = make_client(AsyncKorapayClient, transport)
+    results = {}
+    try:
+        for method_name, kwargs in CLIENT_CALLS.values():
+            method = getattr(client, method_name)
+            try:
+                results[method_name] = measure(
+                    lambda method=method, kwargs=kwargs: loop.run_until_complete(
+                        method(**kwargs)
+                    ),
+                    number,
+                    allocations_number,
+                )
+            except CassetteMissError:
+                continue
+        loop.run_until_complete(client.close())
+    finally:
+        loop.close()
+    return results
+
+
+def print_results(title: str, results: dict[str, dict]) -> None:
+    print(title)
+    print(
+        f"{'client method':<40}{'calls/s':>12}{'cpu us/call':>14}"
+        f"{'peak KiB/call':>16}{'retained KiB':>15}"
+    )
+    for method_name, result in results.items():
+        print(
+            f"{method_name:<40}{result['calls_per_second']:>12.0f}"
+            f"{result['cpu_us_per_call']:>14.1f}{result['peak_kib_per_call']:>16.1f}"
+            f"{result['retained_kib']:>15.1f}"
+        )
+    print()
+
+
+def find_regressions(
+    results: dict[str, dict[str, dict]],
+    baseline: dict[str, dict[str, dict]],
+    threshold: float,
+) -> list[str]:
+    regressions = []
+    for client_name, client_results in results.items():
+        for method_name, result in client_results.items():
+            previous = baseline.get(client_name, {}).get(method_name)
+            if previous is None:
+                continue
+            if result["cpu_us_per_call"] > previous["cpu_us_per_call"] * (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{client_name}.{method_name}: cpu us/call "
+                    f"{previous['cpu_us_per_call']:.1f} -> {result['cpu_us_per_call']:.1f}"
+                )
+            if result["peak_kib_per_call"] > previous["peak_kib_per_call"] * (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{client_name}.{method_name}: peak KiB/call "
+                    f"{previous['peak_kib_per_call']:.1f} -> {result['peak_kib_per_call']:.1f}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=2_000)
+    parser.add_argument("--allocations-number", type=int, default=100)
+    parser.add_argument("--client", choices=("sync", "async", "all"), default="all")
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Compare the results with this file.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--record", help="Record Korapay's responses to this cassette.")
+    parser.add_argument("--cassette", help="Replay the responses in this cassette.")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return 0
+
+    def transport():
+        return ReplayTransport(args.cassette, repeat=True) if args.cassette else None
+
+    results = {}
+    if args.client in {"sync", "all"}:
+        results["KorapayClient"] = run_sync(
+            args.number, args.allocations_number, transport()
+        )
+        print_results("KorapayClient", results["KorapayClient"])
+    if args.client in {"async", "all"}:
+        results["AsyncKorapayClient"] = run_async(
+            args.number, args.allocations_number, transport()
+        )
+        print_results("AsyncKorapayClient", results["AsyncKorapayClient"])
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = find_regressions(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
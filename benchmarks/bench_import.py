@@ -0,0 +1,59 @@
+"""Import-time benchmark for `korapay_client`.
+
+Each statement is executed in a fresh interpreter so module caches do not leak between runs.
+Run with `python -m benchmarks.bench_import` from the project root.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "pass",
+    "import korapay_client",
+    "from korapay_client import Currency, ClientError",
+    "from korapay_client import KorapayClient",
+    "from korapay_client import AsyncKorapayClient",
+    "from korapay_client import KorapayClient, Card; KorapayClient.charge_via_card",
+]
+
+TIMER = (
+    "import time; _start = time.perf_counter(); {statement}; "
+    "print(time.perf_counter() - _start)"
+)
+
+
+def measure(statement: str, repeat: int) -> list[float]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(float(output.stdout.strip()))
+    return timings
+
+
+def run(repeat: int) -> None:
+    print(f"{'statement':<80}{'median (ms)':>14}{'min (ms)':>12}")
+    for statement in STATEMENTS:
+        timings = measure(statement, repeat)
+        print(
+            f"{statement:<80}"
+            f"{statistics.median(timings) * 1e3:>14.2f}"
+            f"{min(timings) * 1e3:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    run(parser.parse_args().repeat)
@@ -0,0 +1,59 @@
+"""Throughput of recording payout intents in `korapay_client.journal` journals.
+
+Every intent is durable before `record_intent` returns, so a single thread pays a full `fsync` per
+payout, while concurrent threads share each `fsync` through group commit.
+
+Run with `python -m benchmarks.bench_journal` from the project root.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from korapay_client.enums import ClientMethod
+from korapay_client.journal import FileJournal, SQLiteJournal
+
+JOURNALS = {"file": FileJournal, "sqlite": SQLiteJournal}
+
+
+def record_intents(journal, threads: int, number: int) -> float:
+    def record(index: int) -> None:
+        journal.record_intent(
+            ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
+            {
+                "reference": f"payout-{threads}-{index}",
+                "destination": {
+                    "amount": "1000.00",
+                    "currency": "NGN",
+                    "bank_account": {"bank": "033", "account": "0000000000"},
+                    "customer": {"email": "johndoe@example.com"},
+                },
+            },
+        )
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(record, range(number)))
+    return number / (time.perf_counter() - started_at)
+
+
+def run(number: int, thread_counts: list[int]) -> None:
+    print(f"{'journal':<10}{'threads':>8}{'intents/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, journal_class in JOURNALS.items():
+            with journal_class(os.path.join(directory, name)) as journal:
+                for threads in thread_counts:
+                    rate = record_intents(journal, threads, number)
+                    print(f"{name:<10}{threads:>8}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=2_000)
+    parser.add_argument(
+        "-t", "--threads", type=int, nargs="+", default=[1, 8, 64], metavar="N"
+    )
+    arguments = parser.parse_args()
+    run(arguments.number, arguments.threads)
@@ -0,0 +1,52 @@
+"""Throughput of reconciling ledger records with `korapay_client.reconciliation`.
+
+Compares `diff_records` with transactions already retrieved, and `Reconciler` looking the
+transactions up from an in-process fake of Korapay.
+
+Run with `python -m benchmarks.bench_reconciliation` from the project root.
+"""
+
+import argparse
+import time
+
+from korapay_client import KorapayClient, TransactionKind
+from korapay_client.reconciliation import LedgerRecord, Reconciler, diff_records
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+
+def run(number: int) -> None:
+    transactions = [
+        {"reference": f"charge-{index}", "amount": 1000, "status": "success"}
+        for index in range(number)
+    ]
+    records = [
+        LedgerRecord(f"charge-{index}", TransactionKind.CHARGE, 1000, "success")
+        for index in range(number)
+    ]
+    print(f"{'reconciliation':<24}{'records/s':>16}")
+    start = time.perf_counter()
+    for _ in diff_records(records, transactions):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{'diff_records':<24}{number / elapsed:>16,.0f}")
+
+    fake = FakeKorapay()
+    client = KorapayClient(
+        public_key="public-key",
+        secret_key="secret-key",
+        encryption_key="a" * 32,
+        transport=FakeKorapayTransport(fake),
+    )
+    lookups = min(number, 10_000)
+    for concurrency in (1, 8):
+        reconciler = Reconciler(client, concurrency=concurrency)
+        start = time.perf_counter()
+        reconciler.run(records[:lookups])
+        elapsed = time.perf_counter() - start
+        print(f"{f'Reconciler({concurrency})':<24}{lookups / elapsed:>16,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=1_000_000)
+    run(parser.parse_args().number)
@@ -0,0 +1,36 @@
+"""Throughput of generating references with `korapay_client.references` against `uuid4`.
+
+Run with `python -m benchmarks.bench_references` from the project root.
+"""
+
+import argparse
+import timeit
+import uuid
+
+from korapay_client.enums import ClientMethod
+from korapay_client.references import ReferenceGenerator
+
+
+def run(number: int) -> None:
+    generator = ReferenceGenerator(
+        prefixes={ClientMethod.PAYOUT_TO_BANK_ACCOUNT: "PO-"}
+    )
+    generate = generator.generate
+    candidates = {
+        "str(uuid4())": lambda: str(uuid.uuid4()),
+        "uuid4().hex": lambda: uuid.uuid4().hex,
+        "generate()": generate,
+        "generate(method)": lambda: generate(ClientMethod.PAYOUT_TO_BANK_ACCOUNT),
+    }
+    print(f"{'generator':<20}{'references/s':>16}")
+    for name, candidate in candidates.items():
+        elapsed = timeit.timeit(candidate, number=number)
+        print(f"{name:<20}{number / elapsed:>16,.0f}")
+    elapsed = timeit.timeit(lambda: generator.batch(1000), number=number // 1000)
+    print(f"{'batch(1000)':<20}{number / elapsed:>16,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=1_000_000)
+    run(parser.parse_args().number)
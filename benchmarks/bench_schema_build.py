@@ -0,0 +1,81 @@
+"""Import-time and first-call latency benchmark for the deferred model schemas.
+
+Each scenario runs in a fresh interpreter. The `lazy` scenario pays for schema building on the
+first call of every model, the `warmup` scenario pays for it up front in
+`korapay_client.models.warmup()`.
+Run with `python -m benchmarks.bench_schema_build` from the project root.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIO = """
+import json, time
+_start = time.perf_counter()
+from korapay_client.clients.client_method_parameter_validator import get_validator_class
+import_time = time.perf_counter() - _start
+from benchmarks.bench_serialization import SAMPLE_PAYLOADS
+warmup_time = 0.0
+if {warmup}:
+    from korapay_client.models import warmup
+    _start = time.perf_counter()
+    warmup()
+    warmup_time = time.perf_counter() - _start
+first_calls = {{}}
+for client_method, payload in SAMPLE_PAYLOADS.items():
+    model_class = get_validator_class(client_method)
+    _start = time.perf_counter()
+    model_class.model_validate(payload).model_dump(exclude_none=True)
+    first_calls[model_class.__name__] = time.perf_counter() - _start
+print(json.dumps({{"import": import_time, "warmup": warmup_time, "first_calls": first_calls}}))
+"""
+
+
+def measure(warmup: bool, repeat: int) -> list[dict]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.path.join(PROJECT_ROOT, "src"), env.get("PYTHONPATH")])
+    )
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", SCENARIO.format(warmup=warmup)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(output.stdout))
+    return results
+
+
+def run(repeat: int) -> None:
+    for scenario, warmup in (("lazy", False), ("warmup", True)):
+        results = measure(warmup, repeat)
+        print(f"[{scenario}]")
+        print(
+            f"  {'import (ms)':<48}"
+            f"{statistics.median(r['import'] for r in results) * 1e3:>10.2f}"
+        )
+        print(
+            f"  {'warmup() (ms)':<48}"
+            f"{statistics.median(r['warmup'] for r in results) * 1e3:>10.2f}"
+        )
+        for model_name in results[0]["first_calls"]:
+            first_call = statistics.median(
+                r["first_calls"][model_name] for r in results
+            )
+            print(f"  {model_name + ' first call (ms)':<48}{first_call * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    run(parser.parse_args().repeat)
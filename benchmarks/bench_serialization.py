@@ -0,0 +1,110 @@
+"""Microbenchmarks for serializing the request payload models in `korapay_client.models.internal`.
+
+Run with `python -m benchmarks.bench_serialization` from the project root.
+"""
+
+import argparse
+import functools
+import timeit
+from decimal import Decimal
+
+from korapay_client.enums import ClientMethod, Currency, MobileMoneyOperator
+from korapay_client.clients.client_method_parameter_validator import (
+    get_validator_class,
+)
+
+SAMPLE_PAYLOADS: dict[ClientMethod, dict] = {
+    ClientMethod.CHARGE_VIA_CARD: {
+        "reference": "ref-0000000001",
+        "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+        "card": {
+            "number": "4084127883172787",
+            "cvv": "123",
+            "expiry_month": "09",
+            "expiry_year": "30",
+        },
+        "amount": 1000,
+        "currency": Currency.NGN,
+        "redirect_url": "https://example.com/redirect",
+        "metadata": {"client_id": "qwerty"},
+    },
+    ClientMethod.CHARGE_VIA_BANK_TRANSFER: {
+        "reference": "ref-0000000002",
+        "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+        "amount": Decimal("1000.50"),
+        "currency": Currency.NGN,
+        "narration": "Test transfer",
+        "merchant_bears_cost": True,
+    },
+    ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT: {
+        "account_name": "John Doe",
+        "account_reference": "ref-0000000003",
+        "bank_code": "000",
+        "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+        "kyc": {"bvn": "12345678901", "nin": None},
+    },
+    ClientMethod.CHARGE_VIA_MOBILE_MONEY: {
+        "reference": "ref-0000000004",
+        "customer": {"name": None, "email": "johndoe@example.com"},
+        "amount": 1000,
+        "mobile_money": {"number": "254700000000"},
+        "currency": Currency.KES,
+    },
+    ClientMethod.INITIATE_CHARGE: {
+        "reference": "ref-0000000005",
+        "amount": 1000,
+        "currency": Currency.NGN,
+        "narration": "Test charge",
+        "notification_url": "https://example.com/webhook",
+        "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+    },
+    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: {
+        "reference": "ref-0000000006",
+        "destination": {
+            "amount": 1000,
+            "currency": Currency.NGN,
+            "narration": "Test payout",
+            "bank_account": {"bank": "033", "account": "0000000000"},
+            "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+        },
+    },
+    ClientMethod.PAYOUT_TO_MOBILE_MONEY: {
+        "reference": "ref-0000000007",
+        "destination": {
+            "amount": 1000,
+            "currency": Currency.KES,
+            "mobile_money": {
+                "operator": MobileMoneyOperator.SAFARICOM_KENYA,
+                "mobile_number": "254700000000",
+            },
+            "customer": {"name": None, "email": "johndoe@example.com"},
+        },
+    },
+}
+
+
+def run(number: int) -> None:
+    print(f"{'model':<32}{'model_dump (us)':>18}{'validate+dump (us)':>22}")
+    for client_method, payload in SAMPLE_PAYLOADS.items():
+        model_class = get_validator_class(client_method)
+        model = model_class.model_validate(payload)
+        dump_time = timeit.timeit(
+            functools.partial(model.model_dump, exclude_none=True), number=number
+        )
+        round_trip_time = timeit.timeit(
+            lambda model_class=model_class, payload=payload: model_class.model_validate(
+                payload
+            ).model_dump(exclude_none=True),
+            number=number,
+        )
+        print(
+            f"{model_class.__name__:<32}"
+            f"{dump_time / number * 1e6:>18.2f}"
+            f"{round_trip_time / number * 1e6:>22.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    run(parser.parse_args().number)
@@ -0,0 +1,89 @@
+"""Throughput of verifying and parsing webhook notifications with `korapay_client.webhooks`.
+
+Compares verifying the signature from the raw request body, verifying it by re-serializing the
+decoded `data`, and verifying and parsing the notification into an event model.
+
+Run with `python -m benchmarks.bench_webhooks` from the project root.
+"""
+
+import argparse
+import functools
+import json
+import timeit
+
+from korapay_client.webhooks import WebhookVerifier
+
+SECRET_KEY = "sk_test_benchmark"
+
+SAMPLE_EVENTS: dict[str, dict] = {
+    "charge.success": {
+        "event": "charge.success",
+        "data": {
+            "reference": "KPY-C-0000000001",
+            "currency": "NGN",
+            "amount": "1000.00",
+            "fee": "15.00",
+            "status": "success",
+            "payment_method": "bank_transfer",
+            "payment_reference": "ref-0000000001",
+            "transaction_date": "2024-01-01 12:00:00",
+            "virtual_bank_account_details": {
+                "payer_bank_account": {
+                    "account_name": "John Doe",
+                    "account_number": "0000000000",
+                    "bank_name": "Access Bank",
+                },
+                "virtual_bank_account": {
+                    "account_name": "Jane Doe",
+                    "account_number": "1111111111",
+                    "account_reference": "ref-vba-0000000001",
+                    "bank_name": "Wema Bank",
+                },
+            },
+            "metadata": {"order_id": "1234"},
+        },
+    },
+    "transfer.success": {
+        "event": "transfer.success",
+        "data": {
+            "fee": "10.75",
+            "amount": "1000.00",
+            "status": "success",
+            "currency": "NGN",
+            "reference": "ref-0000000002",
+            "narration": "Salary",
+            "transaction_date": "2024-01-01 12:00:00",
+        },
+    },
+}
+
+
+def run(number: int) -> None:
+    verifier = WebhookVerifier(SECRET_KEY)
+    print(f"{'event':<20}{'raw (events/s)':>18}{'re-serialized':>18}{'parse':>18}")
+    for name, payload in SAMPLE_EVENTS.items():
+        # Korapay sends the compact serialization of notifications, like `JSON.stringify`.
+        body = json.dumps(payload, separators=(",", ":")).encode("utf8")
+        signature = verifier.sign(payload["data"])
+        assert verifier.verify(body, signature)
+        results = [
+            timeit.timeit(
+                functools.partial(verifier.verify, body, signature), number=number
+            ),
+            timeit.timeit(
+                lambda body=body, signature=signature: verifier.verify_data(
+                    json.loads(body)["data"], signature
+                ),
+                number=number,
+            ),
+            timeit.timeit(
+                functools.partial(verifier.parse, body, signature), number=number
+            ),
+        ]
+        print(f"{name:<20}" + "".join(f"{number / t:>18,.0f}" for t in results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20_000)
+    run(parser.parse_args().number)
@@ -1,5 +1,7 @@
 # ruff: noqa: F401
-from korapay_client.clients import AsyncKorapayClient, KorapayClient
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from korapay_client._metadata import (
     __title__,
     __version__,
@@ -7,18 +9,96 @@ from korapay_client._metadata import (
     __license__,
     __copyright__,
 )
-from korapay_client.enums import MobileMoneyOperator, Currency, PaymentChannel, Country
+from korapay_client.enums import (
+    MobileMoneyOperator,
+    Currency,
+    PaymentChannel,
+    Country,
+    HookEvent,
+    WebhookEventType,
+    PayoutOutcome,
+    DuplicateReferencePolicy,
+    TransactionKind,
+    DiscrepancyType,
+    PlannedPayoutStatus,
+)
 from korapay_client.exceptions import (
     MissingAPIKeyError,
     UnsupportedHTTPMethodError,
     ClientError,
+    RequestTimeoutError,
+    DuplicateReferenceError,
+    WebhookError,
+    InvalidWebhookSignatureError,
+    InvalidWebhookPayloadError,
 )
-from korapay_client.models import (
-    Response,
-    AVS,
-    Authorization,
-    BankAccount,
-    Customer,
-    PayoutOrder,
-    Card,
-)
+
+if TYPE_CHECKING:
+    from korapay_client.clients import AsyncKorapayClient, KorapayClient
+    from korapay_client.models import (
+        Response,
+        AVS,
+        Authorization,
+        BankAccount,
+        Customer,
+        PayoutOrder,
+        Card,
+    )
+
+# The clients pull in `httpx` and the models pull in `pydantic` (and `email-validator`).
+# They are resolved on first attribute access to keep `import korapay_client` cheap.
+_LAZY_ATTRIBUTES = {
+    "KorapayClient": "korapay_client.clients.sync_client",
+    "AsyncKorapayClient": "korapay_client.clients.async_client",
+    "Response": "korapay_client.models",
+    "AVS": "korapay_client.models",
+    "Authorization": "korapay_client.models",
+    "BankAccount": "korapay_client.models",
+    "Customer": "korapay_client.models",
+    "PayoutOrder": "korapay_client.models",
+    "Card": "korapay_client.models",
+}
+
+__all__ = [
+    "MobileMoneyOperator",
+    "Currency",
+    "PaymentChannel",
+    "Country",
+    "HookEvent",
+    "WebhookEventType",
+    "PayoutOutcome",
+    "DuplicateReferencePolicy",
+    "TransactionKind",
+    "DiscrepancyType",
+    "PlannedPayoutStatus",
+    "MissingAPIKeyError",
+    "UnsupportedHTTPMethodError",
+    "ClientError",
+    "RequestTimeoutError",
+    "DuplicateReferenceError",
+    "WebhookError",
+    "InvalidWebhookSignatureError",
+    "InvalidWebhookPayloadError",
+    "KorapayClient",
+    "AsyncKorapayClient",
+    "Response",
+    "AVS",
+    "Authorization",
+    "BankAccount",
+    "Customer",
+    "PayoutOrder",
+    "Card",
+]
+
+
+def __getattr__(name: str):
+    module_path = _LAZY_ATTRIBUTES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_path), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
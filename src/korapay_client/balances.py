@@ -0,0 +1,266 @@
+"""
+A cache of the balances returned by `get_balances`, serving a recent snapshot while refreshing it.
+
+`BalanceCache` is given to a client with its `balance_cache` parameter. The snapshot is served as
+is while it is younger than `max_age`. Once older, it is still served immediately while a single
+refresh runs in the background, a thread for `KorapayClient` and a task for `AsyncKorapayClient`,
+up to `max_staleness`. Past `max_staleness`, or when there is no snapshot, `get_balances` waits
+for the refresh, sharing one request between concurrent callers.
+
+The snapshot is invalidated after every payout the client makes that may have been debited, so
+the next `get_balances` waits for the balances after the payout instead of serving older ones.
+Refreshes started before an invalidation are not cached.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.balances import BalanceCache
+
+    client = KorapayClient(balance_cache=BalanceCache(max_age=5, max_staleness=60))
+    balances = client.get_balances()  # Requests the balances.
+    balances = client.get_balances()  # Served from the cache.
+    client.payout_to_bank_account(...)
+    balances = client.get_balances()  # Requests the balances after the payout.
+    ```
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from korapay_client.enums import ClientMethod, HookEvent
+from korapay_client.hooks import EventHook, RequestEvent
+from korapay_client.models import Response
+
+INVALIDATING_CLIENT_METHODS = frozenset(
+    {
+        ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
+        ClientMethod.PAYOUT_TO_MOBILE_MONEY,
+        ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT,
+    }
+)
+"""The client methods invalidating the balances."""
+
+
+@dataclass(slots=True, frozen=True)
+class BalanceSnapshot:
+    """The balances retrieved at a point in time.
+
+    Attributes:
+        response: The response of `get_balances`.
+        fetched_at: The time of the cache's clock the balances were retrieved at.
+    """
+
+    response: Response
+    fetched_at: float
+
+
+class BalanceCache:
+    """A stale-while-revalidate cache of the balances of a Korapay account.
+
+    A cache is thread safe, and may be shared by the clients of the same Korapay account.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 5.0,
+        max_staleness: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_age: The number of seconds a snapshot is served without being refreshed.
+            max_staleness: The maximum age in seconds of a snapshot served while it is refreshed
+                in the background. Older snapshots are not served.
+            clock: The monotonic clock the age of snapshots is measured with.
+
+        Raises:
+            ValueError: When `max_age` is negative or greater than `max_staleness`.
+        """
+        if max_age < 0 or max_staleness < max_age:
+            raise ValueError("max_age must be between 0 and max_staleness")
+        self.max_age = max_age
+        self.max_staleness = max_staleness
+        self.stats: Counter[str] = Counter()
+        """Counts of `fresh`, `stale` and `missed` lookups, `refreshes` and `invalidations`."""
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: BalanceSnapshot | None = None
+        # Incremented by every invalidation, so refreshes started before it are not cached.
+        self._generation = 0
+        self._refresh: Future | None = None
+        self._refresh_generation = -1
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def snapshot(self) -> BalanceSnapshot | None:
+        """The cached balances, or `None` when there are none."""
+        return self._snapshot
+
+    @property
+    def event_hooks(self) -> dict[HookEvent, list[EventHook]]:
+        """The event hooks invalidating the cache after payouts, for use as a client's
+        `event_hooks`. Added to the hooks of clients given the cache as `balance_cache`."""
+        return {
+            HookEvent.AFTER_RESPONSE: [self.after_response],
+            HookEvent.ON_ERROR: [self.on_error],
+        }
+
+    def after_response(self, event: RequestEvent) -> None:
+        if event.client_method in INVALIDATING_CLIENT_METHODS and (
+            event.response.status or event.status_code >= 500
+        ):
+            self.invalidate()
+
+    def on_error(self, event: RequestEvent) -> None:
+        # Without a response, or with a server error, the payout may have been made.
+        if event.client_method in INVALIDATING_CLIENT_METHODS and (
+            event.status_code is None or event.status_code >= 500
+        ):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discard the snapshot, so the next lookup waits for the balances to be retrieved."""
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+            self.stats["invalidations"] += 1
+
+    def _lookup(self) -> tuple[Response | None, Future | None, int | None]:
+        """Return the response to serve, the refresh to wait on or start, and the generation of
+        the refresh when the caller has to run it."""
+        with self._lock:
+            snapshot = self._snapshot
+            age = self._clock() - snapshot.fetched_at if snapshot else None
+            if snapshot is not None and age < self.max_age:
+                self.stats["fresh"] += 1
+                return snapshot.response, None, None
+            if (
+                self._refresh is not None
+                and self._refresh_generation == self._generation
+            ):
+                refresh, generation = self._refresh, None
+            else:
+                refresh = self._refresh = Future()
+                generation = self._refresh_generation = self._generation
+                self.stats["refreshes"] += 1
+            if snapshot is not None and age < self.max_staleness:
+                self.stats["stale"] += 1
+                return snapshot.response, refresh, generation
+            self.stats["missed"] += 1
+            return None, refresh, generation
+
+    def _complete(
+        self,
+        refresh: Future,
+        generation: int,
+        response: Response | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            if self._refresh is refresh:
+                self._refresh = None
+            if (
+                response is not None
+                and response.status
+                and generation == self._generation
+            ):
+                self._snapshot = BalanceSnapshot(response, self._clock())
+        if error is not None and not isinstance(error, Exception):
+            # The refresh was interrupted, e.g., its caller was cancelled. Its waiters are not,
+            # so they are woken up without a response to retry.
+            refresh.set_result(None)
+        elif error is not None:
+            refresh.set_exception(error)
+        else:
+            refresh.set_result(response)
+
+    def _run(
+        self, fetch: Callable[[], Response], refresh: Future, generation: int
+    ) -> None:
+        try:
+            response = fetch()
+        except BaseException as error:
+            self._complete(refresh, generation, error=error)
+            if not isinstance(error, Exception):
+                raise
+        else:
+            self._complete(refresh, generation, response)
+
+    async def _run_async(
+        self,
+        fetch: Callable[[], Awaitable[Response]],
+        refresh: Future,
+        generation: int,
+    ) -> None:
+        try:
+            response = await fetch()
+        except BaseException as error:
+            self._complete(refresh, generation, error=error)
+            if not isinstance(error, Exception):
+                raise
+        else:
+            self._complete(refresh, generation, response)
+
+    def get(self, fetch: Callable[[], Response]) -> Response:
+        """Return the cached balances, retrieving them with `fetch` when needed.
+
+        Args:
+            fetch: The callable retrieving the balances, e.g., a client's uncached `get_balances`.
+
+        Raises:
+            ClientError: When the balances had to be retrieved and the request failed.
+        """
+        while True:
+            response, refresh, generation = self._lookup()
+            if refresh is None:
+                return response
+            if generation is not None:
+                if response is not None:
+                    threading.Thread(
+                        target=self._run,
+                        args=(fetch, refresh, generation),
+                        name="korapay-balance-refresh",
+                        daemon=True,
+                    ).start()
+                    return response
+                self._run(fetch, refresh, generation)
+            if response is not None:
+                return response
+            response = refresh.result()
+            if response is not None:
+                return response
+
+    async def get_async(self, fetch: Callable[[], Awaitable[Response]]) -> Response:
+        """Return the cached balances, retrieving them with `fetch` when needed.
+
+        Args:
+            fetch: The coroutine function retrieving the balances, e.g., a client's uncached
+                `get_balances`.
+
+        Raises:
+            ClientError: When the balances had to be retrieved and the request failed.
+        """
+        while True:
+            response, refresh, generation = self._lookup()
+            if refresh is None:
+                return response
+            if generation is not None:
+                if response is not None:
+                    task = asyncio.ensure_future(
+                        self._run_async(fetch, refresh, generation)
+                    )
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                    return response
+                await self._run_async(fetch, refresh, generation)
+            if response is not None:
+                return response
+            # Shielded, as cancelling a waiter would otherwise cancel the shared refresh.
+            response = await asyncio.shield(asyncio.wrap_future(refresh))
+            if response is not None:
+                return response
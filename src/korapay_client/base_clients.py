@@ -1,18 +1,119 @@
+import asyncio
+import inspect
 import os
 import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
 from json import JSONDecodeError
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterator, Mapping, NamedTuple
 
 import httpx
 
-from korapay_client.enums import HTTPMethod
+from korapay_client.clients.client_method_parameter_validator import (
+    client_methods_to_model_classes,
+)
+from korapay_client.enums import (
+    HTTPMethod,
+    ClientMethod,
+    DuplicateReferencePolicy,
+    HookEvent,
+    RequestPhase,
+)
 from korapay_client.exceptions import (
     MissingAPIKeyError,
     UnsupportedHTTPMethodError,
     ClientError,
+    RequestTimeoutError,
+    DuplicateReferenceError,
 )
 from korapay_client._metadata import __version__
-from korapay_client.models import Response
+from korapay_client.hooks import EventHook, RequestEvent, merge_event_hooks
+from korapay_client.metrics import MetricsCollector
+from korapay_client.tracing import NoopTracer, Span, Tracer
+from korapay_client.models import Response, warmup as warmup_models
+from korapay_client.utils import AES256Encryptor
+
+if TYPE_CHECKING:
+    # Only imported by the clients configured with them, as the journal pulls in `sqlite3`.
+    from korapay_client.balances import BalanceCache
+    from korapay_client.journal import PayoutJournal
+
+DEFAULT_BASE_URL = "https://api.korapay.com"
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+
+REFERENCE_FIELDS = {
+    ClientMethod.CHARGE_VIA_CARD: "reference",
+    ClientMethod.CHARGE_VIA_BANK_TRANSFER: "reference",
+    ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT: "account_reference",
+    ClientMethod.CHARGE_VIA_MOBILE_MONEY: "reference",
+    ClientMethod.INITIATE_CHARGE: "reference",
+    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: "reference",
+    ClientMethod.PAYOUT_TO_MOBILE_MONEY: "reference",
+    ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT: "batch_reference",
+}
+"""The parameter holding the reference of the resource created by each client method."""
+
+
+class _Credentials:
+    """The keys of a client with the headers and encryptor derived from them.
+
+    A client holds a single instance, read once per request and replaced as a whole by
+    `rotate_keys`, so every request is authorized and encrypted with keys of the same rotation.
+    """
+
+    __slots__ = (
+        "public_key",
+        "secret_key",
+        "encryption_key",
+        "public_headers",
+        "secret_headers",
+        "_encryptor",
+    )
+
+    def __init__(
+        self,
+        public_key: str,
+        secret_key: str,
+        encryption_key: str,
+        base_headers: dict,
+        encryptor: AES256Encryptor | None = None,
+    ):
+        self.public_key = public_key
+        self.secret_key = secret_key
+        self.encryption_key = encryption_key
+        self.public_headers = MappingProxyType(
+            {**base_headers, "Authorization": f"Bearer {public_key}"}
+        )
+        self.secret_headers = MappingProxyType(
+            {**base_headers, "Authorization": f"Bearer {secret_key}"}
+        )
+        self._encryptor = encryptor
+
+    @property
+    def encryptor(self) -> AES256Encryptor:
+        # Built on first use, so clients with an invalid key can serve requests without
+        # encryption. Concurrent first uses may build it twice, which is harmless.
+        if self._encryptor is None:
+            self._encryptor = AES256Encryptor(self.encryption_key)
+        return self._encryptor
+
+
+class _TimeoutOverride(NamedTuple):
+    timeout: httpx.Timeout | None
+    deadline: float | None
+
+
+# The timeout overrides of the current thread or asyncio task, by client.
+_timeout_overrides: ContextVar[Mapping["AbstractBaseClient", _TimeoutOverride]] = (
+    ContextVar("korapay_client_timeout_overrides", default=MappingProxyType({}))
+)
 
 
 class AbstractBaseClient(ABC):
@@ -25,18 +126,111 @@ class AbstractBaseClient(ABC):
         public_key: str | None = None,
         secret_key: str | None = None,
         encryption_key: str | None = None,
+        limits: httpx.Limits | None = None,
+        timeout: httpx.Timeout | float | None = DEFAULT_TIMEOUT,
+        endpoint_timeouts: dict[ClientMethod, httpx.Timeout | float | None]
+        | None = None,
+        deadline: float | None = None,
+        event_hooks: dict[HookEvent | str, list[EventHook]] | None = None,
+        metrics: MetricsCollector | None = None,
+        tracer: Tracer | None = None,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        base_url: str | None = None,
+        payout_journal: "PayoutJournal | None" = None,
+        duplicate_reference_policy: DuplicateReferencePolicy | str | None = None,
+        balance_cache: "BalanceCache | None" = None,
+        http_client: httpx.Client | httpx.AsyncClient | None = None,
     ):
-        self._public_key = None
-        self._secret_key = None
-        self._encryption_key = None
+        """
+        Args:
+            public_key: Your Korapay public key. Read from the `KORAPAY_PUBLIC_KEY` environmental
+                variable when it is not provided.
+            secret_key: Your Korapay secret key. Read from the `KORAPAY_SECRET_KEY` environmental
+                variable when it is not provided.
+            encryption_key: Your Korapay encryption key. Read from the `KORAPAY_ENCRYPTION_KEY`
+                environmental variable when it is not provided.
+            limits: The connection pool limits of the client.
+            timeout: The connect, read, write and pool timeouts used for every request. A float
+                sets all four timeouts, `None` disables them.
+            endpoint_timeouts: Timeouts for specific client methods, overriding `timeout`.
+                E.g., `{ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT: httpx.Timeout(5.0, read=30.0)}`
+            deadline: The maximum number of seconds a request may take in total. Every timeout
+                of a request is capped by the time left before its deadline. `AsyncKorapayClient`
+                cancels a request at its deadline, while `KorapayClient` cannot interrupt a
+                request, so its deadline only bounds each phase of the request: a request whose
+                connect, write and read phases each take almost the time left may exceed it.
+            event_hooks: Callables to call with a `RequestEvent` at each `HookEvent` of a
+                request's lifecycle. Hooks are called in the order they are provided.
+            metrics: A collector to record the latency, status codes, errors and sizes of
+                the requests made by the client.
+            tracer: A tracer to open a span for every call made by the client. Defaults to a
+                tracer that records nothing.
+            transport: The httpx transport to send requests with instead of the network, e.g., an
+                `httpx.MockTransport` for tests and benchmarks. An `httpx.AsyncBaseTransport` is
+                required by `AsyncKorapayClient`.
+            base_url: The URL of the Korapay API to send requests to, e.g., the URL of a
+                `korapay_client.testing` fake server. Defaults to `https://api.korapay.com`.
+            payout_journal: A journal to durably record the intent of every payout before it is
+                sent and its outcome once Korapay answers, for `korapay_client.journal` to
+                recover the payouts in flight when a process crashes.
+            duplicate_reference_policy: How to handle a charge, virtual bank account or payout
+                made with the reference of one the client is still waiting on. With
+                `DuplicateReferencePolicy.REJECT` a `DuplicateReferenceError` is raised and with
+                `DuplicateReferencePolicy.JOIN` the response of the request in flight is returned,
+                without sending another request. Duplicates are sent to Korapay when it is `None`.
+            balance_cache: A cache for `get_balances` to serve recent balances from while
+                refreshing them in the background. It is invalidated after every payout made by
+                the client.
+            http_client: The httpx client to send requests with, e.g., one shared by the clients of
+                many merchants through a `korapay_client.pool.ClientPool`. The client is not closed
+                by `close`, and `limits` and `transport` do not apply to it. An `httpx.AsyncClient`
+                is required by `AsyncKorapayClient`.
+        """
+        self._limits = limits or DEFAULT_LIMITS
+        self._timeout = httpx.Timeout(timeout)
+        self._endpoint_timeouts = {
+            client_method: httpx.Timeout(endpoint_timeout)
+            for client_method, endpoint_timeout in (endpoint_timeouts or {}).items()
+        }
+        self._deadline = deadline
+        self._event_hooks = merge_event_hooks(
+            metrics.event_hooks if metrics else None,
+            balance_cache.event_hooks if balance_cache else None,
+            event_hooks,
+        )
+        self._balance_cache = balance_cache
+        self._tracer = tracer or NoopTracer()
+        self._transport = transport
+        self._api_base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self._payout_journal = payout_journal
+        self._journaled_client_methods: frozenset[ClientMethod] = frozenset()
+        if payout_journal is not None:
+            from korapay_client.journal import JOURNALED_CLIENT_METHODS
+
+            self._journaled_client_methods = JOURNALED_CLIENT_METHODS
+        self._duplicate_reference_policy = (
+            DuplicateReferencePolicy(duplicate_reference_policy)
+            if duplicate_reference_policy
+            else None
+        )
+        # The futures of the requests in flight by endpoint and reference. Entries are removed
+        # when their requests complete, so it never outgrows the requests in flight.
+        self._in_flight: dict[tuple[str, str], Future | asyncio.Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._lock = threading.RLock()
 
-        self._load_public_key(public_key)
-        self._load_secret_key(secret_key)
-        self._load_encryption_key(encryption_key)
+        self._credentials = _Credentials(
+            self._load_public_key(public_key),
+            self._load_secret_key(secret_key),
+            self._load_encryption_key(encryption_key),
+            self._base_headers,
+        )
 
     @property
     def _base_url(self) -> str:
-        return "https://api.korapay.com"
+        return self._api_base_url
 
     @property
     def _base_headers(self) -> dict:
@@ -45,41 +239,292 @@ class AbstractBaseClient(ABC):
             "User-Agent": f"korapay-client-{__version__} Python-{sys.version}",
         }
 
+    @property
+    def _public_key(self) -> str:
+        return self._credentials.public_key
+
+    @property
+    def _secret_key(self) -> str:
+        return self._credentials.secret_key
+
+    @property
+    def _encryption_key(self) -> str:
+        return self._credentials.encryption_key
+
     @property
     def _headers_with_public_authorization(self):
-        headers = self._base_headers
-        headers["Authorization"] = f"Bearer {self._public_key}"
-        return headers
+        return self._credentials.public_headers
 
     @property
     def _headers_with_secret_authorization(self):
-        headers = self._base_headers
-        headers["Authorization"] = f"Bearer {self._secret_key}"
-        return headers
+        return self._credentials.secret_headers
+
+    def _get_encryptor(self) -> AES256Encryptor:
+        return self._credentials.encryptor
+
+    def rotate_keys(
+        self,
+        public_key: str | None = None,
+        secret_key: str | None = None,
+        encryption_key: str | None = None,
+    ) -> None:
+        """Replace the keys of the client without recreating it.
+
+        The client keeps its connections and state. The keys are swapped atomically, so requests
+        made concurrently are sent either with all the previous keys or with all the new ones,
+        and requests started after `rotate_keys` returns use the new keys. Keys that are not
+        provided are kept.
+
+        Args:
+            public_key: The new public key.
+            secret_key: The new secret key.
+            encryption_key: The new encryption key.
+
+        Raises:
+            ValueError: When no key is provided, or the encryption key is invalid. The keys are
+                left unchanged.
+
+        Example:
+            ```python
+            client.rotate_keys(secret_key=new_secret_key, encryption_key=new_encryption_key)
+            ```
+        """
+        if not (public_key or secret_key or encryption_key):
+            raise ValueError("At least one key is required to rotate the keys")
+        with self._lock:
+            current = self._credentials
+            encryptor = current._encryptor
+            if encryption_key and encryption_key != current.encryption_key:
+                # Built before the swap, so an invalid key is rejected and card charges do not
+                # pay for building it.
+                encryptor = AES256Encryptor(encryption_key)
+            self._credentials = _Credentials(
+                public_key or current.public_key,
+                secret_key or current.secret_key,
+                encryption_key or current.encryption_key,
+                self._base_headers,
+                encryptor,
+            )
+
+    def _prepare_warmup(self, connections: int) -> None:
+        if connections < 1:
+            raise ValueError("At least one connection is required to warm up a client")
+        max_connections = self._limits.max_connections
+        if max_connections is not None and connections > max_connections:
+            raise ValueError(
+                f"Cannot open {connections} connections, the client is limited to "
+                f"{max_connections} connections"
+            )
+        warmup_models()
+        self._get_encryptor()
+
+    @contextmanager
+    def timeout_override(
+        self,
+        timeout: httpx.Timeout | float | None = None,
+        deadline: float | None = None,
+    ) -> Iterator[None]:
+        """Override the timeouts of the requests made by this client within a `with` block.
+
+        The override only applies to the current thread or asyncio task, so concurrent calls made
+        elsewhere keep using the client's timeouts.
+
+        Args:
+            timeout: The timeouts to use instead of the client and endpoint timeouts. Use
+                `httpx.Timeout(None)` to disable timeouts.
+            deadline: The maximum number of seconds each request may take in total, with the
+                same semantics as the client's `deadline`.
+
+        Example:
+            ```python
+            from korapay_client import KorapayClient
+            client = KorapayClient()
+            with client.timeout_override(timeout=2.0, deadline=3.0):
+                response = client.get_balances()
+            ```
+        """
+        override = _TimeoutOverride(
+            timeout=httpx.Timeout(timeout) if timeout is not None else None,
+            deadline=deadline,
+        )
+        token = _timeout_overrides.set(
+            MappingProxyType({**_timeout_overrides.get(), self: override})
+        )
+        try:
+            yield
+        finally:
+            _timeout_overrides.reset(token)
+
+    def _resolve_timeout(
+        self, client_method: ClientMethod
+    ) -> tuple[httpx.Timeout, float | None]:
+        timeout = self._endpoint_timeouts.get(client_method, self._timeout)
+        deadline = self._deadline
+        override = _timeout_overrides.get().get(self)
+        if override is not None:
+            if override.timeout is not None:
+                timeout = override.timeout
+            if override.deadline is not None:
+                deadline = override.deadline
+        return timeout, deadline
+
+    @staticmethod
+    def _bound_timeout(timeout: httpx.Timeout, remaining: float) -> httpx.Timeout:
+        if remaining <= 0:
+            raise RequestTimeoutError(
+                "The deadline for the request to Korapay servers was exceeded"
+            )
+        return httpx.Timeout(
+            connect=min(timeout.connect or remaining, remaining),
+            read=min(timeout.read or remaining, remaining),
+            write=min(timeout.write or remaining, remaining),
+            pool=min(timeout.pool or remaining, remaining),
+        )
+
+    @staticmethod
+    def _to_client_error(error: BaseException) -> BaseException:
+        if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+            return RequestTimeoutError(
+                f"A request to Korapay servers timed out. Error: {error!r}"
+            )
+        if isinstance(error, httpx.RequestError):
+            return ClientError(
+                f"An error occurred while making a request to Korapay servers. Error: {error}"
+            )
+        return error
+
+    @staticmethod
+    def _record_response(event: RequestEvent, raw_response: httpx.Response) -> None:
+        event.elapsed = time.perf_counter() - event.started_at
+        event.status_code = raw_response.status_code
+        event.request_bytes = len(raw_response.request.content)
+        event.response_bytes = len(raw_response.content)
+
+    @classmethod
+    def _record_failure(
+        cls,
+        event: RequestEvent,
+        raw_response: httpx.Response | None,
+        error: BaseException,
+    ) -> None:
+        if raw_response is not None:
+            cls._record_response(event, raw_response)
+        else:
+            event.elapsed = time.perf_counter() - event.started_at
+        event.error = error
+
+    def _in_flight_key(
+        self, client_method: ClientMethod, endpoint: str, data: dict | list | None
+    ) -> tuple[str, str] | None:
+        field = REFERENCE_FIELDS.get(client_method)
+        if (
+            field is None
+            or self._duplicate_reference_policy is None
+            or not isinstance(data, dict)
+        ):
+            return None
+        reference = data.get(field)
+        return (endpoint, reference) if reference else None
+
+    @staticmethod
+    def _duplicate_reference_error(key: tuple[str, str]) -> DuplicateReferenceError:
+        return DuplicateReferenceError(
+            f"A request with the reference {key[1]!r} to {key[0]} is already in flight"
+        )
+
+    @staticmethod
+    def _format_date(value: date | str | None) -> str | None:
+        if isinstance(value, date):
+            return value.strftime("%Y-%m-%d")
+        return value
+
+    @staticmethod
+    def _transactions_page(response: Response, limit: int) -> tuple[list, bool]:
+        """Return the transactions of a page of virtual bank account transactions and whether
+        another page follows it."""
+        if not response.status or not isinstance(response.data, dict):
+            raise ClientError(
+                "Unable to retrieve virtual bank account transactions: status_code:"
+                f" {response.status_code} message: {response.message}"
+            )
+        transactions = response.data.get("transactions") or []
+        pagination = response.data.get("pagination")
+        if isinstance(pagination, dict) and "total_pages" in pagination:
+            return transactions, pagination.get("page", 1) < pagination["total_pages"]
+        return transactions, len(transactions) >= limit
 
     @abstractmethod
     def _process_request(
         self,
+        client_method: ClientMethod,
         endpoint: str,
         method: HTTPMethod,
         data: dict | list | None = None,
         use_public_auth: bool = False,
+        encrypt: bool = False,
+        params: dict | None = None,
     ) -> Response: ...
 
+    def _start_span(
+        self, client_method: ClientMethod, endpoint: str, method: HTTPMethod
+    ) -> Span:
+        return self._tracer.start_span(
+            client_method.name,
+            {
+                "korapay.client_method": client_method.name,
+                "http.request.method": method.value,
+                "korapay.endpoint": endpoint,
+            },
+        )
+
+    def _prepare_request(
+        self,
+        span: Span,
+        client_method: ClientMethod,
+        endpoint: str,
+        method: HTTPMethod,
+        data: dict | list | None,
+        use_public_auth: bool,
+        encrypt: bool,
+        params: dict | None = None,
+    ) -> dict:
+        model_class = client_methods_to_model_classes.get(client_method)
+        if model_class is not None:
+            with span.phase(RequestPhase.VALIDATION):
+                parameter_model = model_class.model_validate(data)
+            with span.phase(RequestPhase.SERIALIZATION):
+                data = parameter_model.model_dump(exclude_none=True)
+        credentials = self._credentials
+        if encrypt:
+            with span.phase(RequestPhase.ENCRYPTION):
+                data = {"charge_data": credentials.encryptor.encrypt(data)}
+        with span.phase(RequestPhase.HEADERS):
+            headers = (
+                credentials.public_headers
+                if use_public_auth
+                else credentials.secret_headers
+            )
+        return self._serialize_request_payload(
+            endpoint=endpoint, method=method, headers=headers, data=data, params=params
+        )
+
     def _serialize_request_payload(
         self,
         endpoint: str,
         method: HTTPMethod,
+        headers: Mapping[str, str],
         data: dict | list | None = None,
-        use_public_auth: bool = False,
+        params: dict | None = None,
     ) -> dict:
         payload = {
             "url": f"{self._base_url}{endpoint}",
             "json": data,
-            "headers": self._headers_with_secret_authorization
-            if not use_public_auth
-            else self._headers_with_public_authorization,
+            "headers": headers,
         }
+        if params:
+            payload["params"] = {
+                name: value for name, value in params.items() if value is not None
+            }
         if method in {HTTPMethod.GET, HTTPMethod.DELETE}:
             payload.pop("json", None)
         return payload
@@ -102,100 +547,457 @@ class AbstractBaseClient(ABC):
             data=response_body.get("data", None),
         )
 
-    def _load_public_key(self, public_key: str | None = None):
-        if public_key:
-            self._public_key = public_key
-        else:
-            self._public_key = os.getenv(self.KORAPAY_ENV_PUBLIC_KEY_NAME, None)
-        if not self._public_key:
+    def _load_public_key(self, public_key: str | None = None) -> str:
+        public_key = public_key or os.getenv(self.KORAPAY_ENV_PUBLIC_KEY_NAME, None)
+        if not public_key:
             raise MissingAPIKeyError(
                 "Client could not find any public key. Please provide a public key on instantiation of this "
                 f"client or provide it in your environmental variables as {self.KORAPAY_ENV_PUBLIC_KEY_NAME}"
             )
+        return public_key
 
-    def _load_secret_key(self, secret_key: str | None = None):
-        if secret_key:
-            self._secret_key = secret_key
-        else:
-            self._secret_key = os.getenv(self.KORAPAY_ENV_SECRET_KEY_NAME, None)
-        if not self._secret_key:
+    def _load_secret_key(self, secret_key: str | None = None) -> str:
+        secret_key = secret_key or os.getenv(self.KORAPAY_ENV_SECRET_KEY_NAME, None)
+        if not secret_key:
             raise MissingAPIKeyError(
                 "Client could not find any secret key. Please provide a secret key on instantiation of this "
                 f"client or provide it in your environmental variables as {self.KORAPAY_ENV_SECRET_KEY_NAME}"
             )
+        return secret_key
 
-    def _load_encryption_key(self, encryption_key: str | None = None):
-        if encryption_key:
-            self._encryption_key = encryption_key
-        else:
-            self._encryption_key = os.getenv(self.KORAPAY_ENV_ENCRYPTION_KEY_NAME, None)
-        if not self._encryption_key:
+    def _load_encryption_key(self, encryption_key: str | None = None) -> str:
+        encryption_key = encryption_key or os.getenv(
+            self.KORAPAY_ENV_ENCRYPTION_KEY_NAME, None
+        )
+        if not encryption_key:
             raise MissingAPIKeyError(
                 "Client could not find any encryption key. Please provide an encryption key on instantiation of "
                 f"this client or provide it in your environmental variables as {self.KORAPAY_ENV_ENCRYPTION_KEY_NAME}"
             )
+        return encryption_key
 
 
 class BaseClient(AbstractBaseClient):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Close the client's pooled connections.
+
+        The client can still be used after it is closed, the connection pool is recreated on the
+        next request. An `http_client` provided on instantiation is left open.
+        """
+        if not self._owns_http_client:
+            return
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+        if http_client is not None:
+            http_client.close()
+
+    def warmup(self, connections: int = 1) -> None:
+        """Prepare the client to serve requests at steady-state latency.
+
+        Opens `connections` pooled connections to Korapay concurrently, so the DNS lookup, TCP and
+        TLS handshakes are not paid by the first requests, builds the validators and serializers
+        of the request models and the card payload encryptor.
+
+        Args:
+            connections: The number of connections to open. It must not exceed the
+                `max_connections` of the client's `limits`, and connections beyond its
+                `max_keepalive_connections` are closed once they become idle.
+
+        Raises:
+            ValueError: When `connections` is out of range, or the encryption key is invalid.
+            ClientError: When a connection to Korapay could not be established.
+        """
+        self._prepare_warmup(connections)
+        http_client = self._get_http_client()
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [
+                executor.submit(
+                    http_client.head, self._base_url, headers=self._base_headers
+                )
+                for _ in range(connections)
+            ]
+        try:
+            for future in futures:
+                future.result()
+        except httpx.RequestError as error:
+            raise ClientError(
+                f"An error occurred while connecting to Korapay servers. Error: {error}"
+            )
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(
+                        limits=self._limits,
+                        timeout=self._timeout,
+                        transport=self._transport,
+                    )
+        return self._http_client
+
     def _process_request(
         self,
+        client_method: ClientMethod,
         endpoint: str,
         method: HTTPMethod,
         data: dict | list | None = None,
         use_public_auth: bool = False,
+        encrypt: bool = False,
+        params: dict | None = None,
     ) -> Response:
-        request_handlers = {
-            HTTPMethod.GET: httpx.get,
-            HTTPMethod.POST: httpx.post,
-            HTTPMethod.PUT: httpx.put,
-            HTTPMethod.PATCH: httpx.patch,
-            HTTPMethod.DELETE: httpx.delete,
-            HTTPMethod.OPTIONS: httpx.options,
-            HTTPMethod.HEAD: httpx.head,
-        }
-        handler = request_handlers.get(method)
+        key = self._in_flight_key(client_method, endpoint, data)
+        if key is None:
+            return self._send_request(
+                client_method, endpoint, method, data, use_public_auth, encrypt, params
+            )
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            joining = future is not None
+            if not joining:
+                future = self._in_flight[key] = Future()
+        if joining:
+            if self._duplicate_reference_policy is DuplicateReferencePolicy.REJECT:
+                raise self._duplicate_reference_error(key)
+            return future.result()
+        try:
+            response = self._send_request(
+                client_method, endpoint, method, data, use_public_auth, encrypt, params
+            )
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _send_request(
+        self,
+        client_method: ClientMethod,
+        endpoint: str,
+        method: HTTPMethod,
+        data: dict | list | None,
+        use_public_auth: bool,
+        encrypt: bool,
+        params: dict | None,
+    ) -> Response:
+        started_at = time.perf_counter()
+        timeout, deadline = self._resolve_timeout(client_method)
+        handler = getattr(self._get_http_client(), method.value.lower(), None)
 
         if not handler:
             raise UnsupportedHTTPMethodError(
                 "HTTP Request method not recognized or supported"
             )
-        payload = self._serialize_request_payload(
-            endpoint=endpoint, method=method, data=data, use_public_auth=use_public_auth
-        )
+        with self._start_span(client_method, endpoint, method) as span:
+            event = None
+            if self._event_hooks:
+                event = RequestEvent(
+                    client_method=client_method,
+                    method=method,
+                    url=f"{self._base_url}{endpoint}",
+                    started_at=started_at,
+                )
+                self._emit(HookEvent.BEFORE_REQUEST, event)
+            raw_response = None
+            # Every request announced to the hooks ends with `AFTER_RESPONSE` or `ON_ERROR`,
+            # including requests that fail before they are sent or are interrupted.
+            try:
+                payload = self._prepare_request(
+                    span,
+                    client_method,
+                    endpoint,
+                    method,
+                    data,
+                    use_public_auth,
+                    encrypt,
+                    params,
+                )
+                if deadline is not None:
+                    # Checked before journaling, so no intent is recorded for a request that is
+                    # not sent.
+                    timeout = self._bound_timeout(
+                        timeout, deadline - (time.perf_counter() - started_at)
+                    )
+                journal_reference = None
+                if client_method in self._journaled_client_methods:
+                    journal_reference = self._payout_journal.record_intent(
+                        client_method, payload["json"]
+                    )
+                with span.phase(RequestPhase.NETWORK):
+                    raw_response = handler(**payload, timeout=timeout)
+                span.set_attribute(
+                    "http.response.status_code", raw_response.status_code
+                )
+                with span.phase(RequestPhase.DESERIALIZATION):
+                    response = self._deserialize_response(raw_response)
+            except BaseException as error:
+                client_error = self._to_client_error(error)
+                if event is not None:
+                    self._record_failure(event, raw_response, client_error)
+                    self._emit(HookEvent.ON_ERROR, event)
+                if client_error is error:
+                    raise
+                raise client_error from error
+            if journal_reference is not None:
+                self._payout_journal.record_response(journal_reference, response)
+            if event is not None:
+                self._record_response(event, raw_response)
+                event.response = response
+                self._emit(HookEvent.AFTER_RESPONSE, event)
+            return response
+
+    def _emit(self, hook_event: HookEvent, event: RequestEvent) -> None:
+        for hook in self._event_hooks.get(hook_event, ()):
+            hook(event)
+
+
+class AsyncBaseClient(AbstractBaseClient):
+    # Pooled connections are bound to the event loop that opened them, so the client keeps a
+    # connection pool per event loop it is used from.
+    _http_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] | None = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the client's pooled connections.
+
+        The connection pools the client opened from other event loops are closed too, on their
+        own event loop when it is still running. Those of event loops already closed cannot be
+        closed, they are released when garbage collected.
+
+        The client can still be used after it is closed, the connection pool is recreated on the
+        next request. An `http_client` provided on instantiation is left open.
+        """
+        if not self._owns_http_client:
+            return
+        with self._lock:
+            http_clients, self._http_clients = self._http_clients or {}, None
+        loop = asyncio.get_running_loop()
+        closing = []
+        for http_client_loop, http_client in http_clients.items():
+            if http_client_loop is loop:
+                closing.append(http_client.aclose())
+            elif http_client_loop.is_running():
+                closing.append(
+                    asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(
+                            http_client.aclose(), http_client_loop
+                        )
+                    )
+                )
+        await asyncio.gather(*closing)
+
+    async def warmup(self, connections: int = 1) -> None:
+        """Prepare the client to serve requests at steady-state latency.
+
+        Opens `connections` pooled connections to Korapay concurrently, so the DNS lookup, TCP and
+        TLS handshakes are not paid by the first requests, builds the validators and serializers
+        of the request models and the card payload encryptor.
+
+        Args:
+            connections: The number of connections to open. It must not exceed the
+                `max_connections` of the client's `limits`, and connections beyond its
+                `max_keepalive_connections` are closed once they become idle.
+
+        Raises:
+            ValueError: When `connections` is out of range, or the encryption key is invalid.
+            ClientError: When a connection to Korapay could not be established.
+        """
+        self._prepare_warmup(connections)
+        http_client = self._get_http_client()
         try:
-            raw_response = handler(**payload)
-            return self._deserialize_response(raw_response)
+            await asyncio.gather(
+                *(
+                    http_client.head(self._base_url, headers=self._base_headers)
+                    for _ in range(connections)
+                )
+            )
         except httpx.RequestError as error:
             raise ClientError(
-                f"An error occurred while making a request to Korapay servers. Error: {error}"
+                f"An error occurred while connecting to Korapay servers. Error: {error}"
             )
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if not self._owns_http_client:
+            return self._http_client
+        loop = asyncio.get_running_loop()
+        http_clients = self._http_clients
+        if http_clients is not None and loop in http_clients:
+            return http_clients[loop]
+        with self._lock:
+            if self._http_clients is None:
+                self._http_clients = {}
+            http_client = self._http_clients.get(loop)
+            if http_client is None:
+                # The connection pools of closed event loops can no longer be used or closed.
+                for http_client_loop in list(self._http_clients):
+                    if http_client_loop.is_closed():
+                        del self._http_clients[http_client_loop]
+                http_client = self._http_clients[loop] = httpx.AsyncClient(
+                    limits=self._limits,
+                    timeout=self._timeout,
+                    transport=self._transport,
+                )
+        return http_client
 
-class AsyncBaseClient(AbstractBaseClient):
     async def _process_request(
         self,
+        client_method: ClientMethod,
         endpoint: str,
         method: HTTPMethod,
         data: dict | list | None = None,
         use_public_auth: bool = False,
+        encrypt: bool = False,
+        params: dict | None = None,
     ) -> Response:
-        async with httpx.AsyncClient() as client:
-            handler = getattr(client, method.value.lower(), None)
-
-            if not handler:
-                raise UnsupportedHTTPMethodError(
-                    "HTTP Request method not recognized or supported"
+        key = self._in_flight_key(client_method, endpoint, data)
+        if key is None:
+            return await self._send_request(
+                client_method, endpoint, method, data, use_public_auth, encrypt, params
+            )
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            joining = future is not None
+            if not joining:
+                future = self._in_flight[key] = (
+                    asyncio.get_running_loop().create_future()
                 )
-            payload = self._serialize_request_payload(
-                endpoint=endpoint,
-                method=method,
-                data=data,
-                use_public_auth=use_public_auth,
+        if joining:
+            if self._duplicate_reference_policy is DuplicateReferencePolicy.REJECT:
+                raise self._duplicate_reference_error(key)
+            response = await asyncio.shield(future)
+            if response is None:
+                # The request joined was cancelled, so it is sent again.
+                return await self._process_request(
+                    client_method,
+                    endpoint,
+                    method,
+                    data,
+                    use_public_auth,
+                    encrypt,
+                    params,
+                )
+            return response
+        try:
+            response = await self._send_request(
+                client_method, endpoint, method, data, use_public_auth, encrypt, params
             )
+        except asyncio.CancelledError:
+            # The requests joining it are not cancelled, they are woken up without a response
+            # to retry.
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            future.set_result(None)
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Marks the error as retrieved, it is raised here whether or not requests joined.
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    async def _send_request(
+        self,
+        client_method: ClientMethod,
+        endpoint: str,
+        method: HTTPMethod,
+        data: dict | list | None,
+        use_public_auth: bool,
+        encrypt: bool,
+        params: dict | None,
+    ) -> Response:
+        started_at = time.perf_counter()
+        timeout, deadline = self._resolve_timeout(client_method)
+        handler = getattr(self._get_http_client(), method.value.lower(), None)
+
+        if not handler:
+            raise UnsupportedHTTPMethodError(
+                "HTTP Request method not recognized or supported"
+            )
+        with self._start_span(client_method, endpoint, method) as span:
+            event = None
+            if self._event_hooks:
+                event = RequestEvent(
+                    client_method=client_method,
+                    method=method,
+                    url=f"{self._base_url}{endpoint}",
+                    started_at=started_at,
+                )
+                await self._emit(HookEvent.BEFORE_REQUEST, event)
+            raw_response = None
+            # Every request announced to the hooks ends with `AFTER_RESPONSE` or `ON_ERROR`,
+            # including requests that fail before they are sent or are cancelled.
             try:
-                raw_response = await handler(**payload)
-                return self._deserialize_response(raw_response)
-            except httpx.RequestError as error:
-                raise ClientError(
-                    f"An error occurred while making a request to Korapay servers. Error: {error}"
+                payload = self._prepare_request(
+                    span,
+                    client_method,
+                    endpoint,
+                    method,
+                    data,
+                    use_public_auth,
+                    encrypt,
+                    params,
                 )
+                if deadline is not None:
+                    # Checked before journaling, so no intent is recorded for a request that is
+                    # not sent.
+                    timeout = self._bound_timeout(
+                        timeout, deadline - (time.perf_counter() - started_at)
+                    )
+                journal_reference = None
+                if client_method in self._journaled_client_methods:
+                    journal_reference = await self._payout_journal.record_intent_async(
+                        client_method, payload["json"]
+                    )
+                remaining = None
+                if deadline is not None:
+                    # The phase timeouts only bound each phase, the deadline bounds the request.
+                    remaining = deadline - (time.perf_counter() - started_at)
+                with span.phase(RequestPhase.NETWORK):
+                    raw_response = await asyncio.wait_for(
+                        handler(**payload, timeout=timeout), remaining
+                    )
+                span.set_attribute(
+                    "http.response.status_code", raw_response.status_code
+                )
+                with span.phase(RequestPhase.DESERIALIZATION):
+                    response = self._deserialize_response(raw_response)
+            except BaseException as error:
+                client_error = self._to_client_error(error)
+                if event is not None:
+                    self._record_failure(event, raw_response, client_error)
+                    await self._emit(HookEvent.ON_ERROR, event)
+                if client_error is error:
+                    raise
+                raise client_error from error
+            if journal_reference is not None:
+                self._payout_journal.record_response(journal_reference, response)
+            if event is not None:
+                self._record_response(event, raw_response)
+                event.response = response
+                await self._emit(HookEvent.AFTER_RESPONSE, event)
+            return response
+
+    async def _emit(self, hook_event: HookEvent, event: RequestEvent) -> None:
+        for hook in self._event_hooks.get(hook_event, ()):
+            result = hook(event)
+            if inspect.isawaitable(result):
+                await result
@@ -1,3 +1,23 @@
 # ruff: noqa: F401
-from korapay_client.clients.async_client import AsyncKorapayClient
-from korapay_client.clients.sync_client import KorapayClient
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from korapay_client.clients.async_client import AsyncKorapayClient
+    from korapay_client.clients.sync_client import KorapayClient
+
+_LAZY_ATTRIBUTES = {
+    "KorapayClient": "korapay_client.clients.sync_client",
+    "AsyncKorapayClient": "korapay_client.clients.async_client",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module_path = _LAZY_ATTRIBUTES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_path), name)
+    globals()[name] = value
+    return value
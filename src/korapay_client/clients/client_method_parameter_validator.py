@@ -5,22 +5,26 @@ from pydantic import BaseModel
 from korapay_client.enums.internal import ClientMethod
 from korapay_client.models.internal import (
     ChargeViaCardModel,
+    AuthorizeCardChargeModel,
     ChargeViaBankTransferModel,
     CreateVirtualBankAccountModel,
     ChargeViaMobileMoneyModel,
     InitiateChargeModel,
     PayoutToBankAccountModel,
     PayoutToMobileMoneyModel,
+    BulkPayoutToBankAccountModel,
 )
 
 client_methods_to_model_classes: dict[ClientMethod, Type[BaseModel]] = {
     ClientMethod.CHARGE_VIA_CARD: ChargeViaCardModel,
+    ClientMethod.AUTHORIZE_CARD_CHARGE: AuthorizeCardChargeModel,
     ClientMethod.CHARGE_VIA_BANK_TRANSFER: ChargeViaBankTransferModel,
     ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT: CreateVirtualBankAccountModel,
     ClientMethod.CHARGE_VIA_MOBILE_MONEY: ChargeViaMobileMoneyModel,
     ClientMethod.INITIATE_CHARGE: InitiateChargeModel,
     ClientMethod.PAYOUT_TO_BANK_ACCOUNT: PayoutToBankAccountModel,
     ClientMethod.PAYOUT_TO_MOBILE_MONEY: PayoutToMobileMoneyModel,
+    ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT: BulkPayoutToBankAccountModel,
 }
 
 
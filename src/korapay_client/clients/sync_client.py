@@ -1,9 +1,13 @@
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from decimal import Decimal
+from typing import Iterator
 
 from pydantic import EmailStr, HttpUrl
 
 from korapay_client.base_clients import BaseClient
-from korapay_client.clients.client_method_parameter_validator import get_validator_class
 from korapay_client.enums import (
     Currency,
     PaymentChannel,
@@ -13,7 +17,6 @@ from korapay_client.enums import (
 )
 from korapay_client.enums.public import MobileMoneyOperator
 from korapay_client.models import Authorization, Card, Response, PayoutOrder
-from korapay_client.utils import encrypt_aes256
 
 
 class KorapayClient(BaseClient):
@@ -51,25 +54,20 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(ClientMethod.CHARGE_VIA_CARD)
-        parameter_model = parameter_validator_class.model_validate(
-            {
+        return self._process_request(
+            client_method=ClientMethod.CHARGE_VIA_CARD,
+            endpoint="/merchant/api/v1/charges/card",
+            method=HTTPMethod.POST,
+            data={
                 "reference": reference,
-                "customer_name": customer_name,
-                "customer_email": customer_email,
+                "customer": {"name": customer_name, "email": customer_email},
                 "card": card,
                 "amount": amount,
                 "currency": currency,
                 "redirect_url": redirect_url,
                 "metadata": metadata,
-            }
-        )
-        payload = parameter_model.model_dump(exclude_none=True)
-        charge_data = encrypt_aes256(self._encryption_key, payload)
-        return self._process_request(
-            endpoint="/merchant/api/v1/charges/card",
-            method=HTTPMethod.POST,
-            data={"charge_data": charge_data},
+            },
+            encrypt=True,
         )
 
     def authorize_card_charge(
@@ -95,9 +93,10 @@ class KorapayClient(BaseClient):
         """
         data = {
             "transaction_reference": transaction_reference,
-            "authorization": authorization.model_dump(exclude_none=True),
+            "authorization": authorization,
         }
         return self._process_request(
+            client_method=ClientMethod.AUTHORIZE_CARD_CHARGE,
             endpoint="/merchant/api/v1/charges/card/authorize",
             method=HTTPMethod.POST,
             data=data,
@@ -117,6 +116,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.RESEND_CARD_OTP,
             endpoint="/merchant/api/v1/charges/card/resend-otp",
             method=HTTPMethod.POST,
             data={"transaction_reference": transaction_reference},
@@ -160,28 +160,21 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(
-            ClientMethod.CHARGE_VIA_BANK_TRANSFER
-        )
-        parameter_model = parameter_validator_class.model_validate(
-            {
+        return self._process_request(
+            client_method=ClientMethod.CHARGE_VIA_BANK_TRANSFER,
+            endpoint="/merchant/api/v1/charges/bank-transfer",
+            method=HTTPMethod.POST,
+            data={
                 "reference": reference,
                 "amount": amount,
                 "currency": currency,
                 "notification_url": notification_url,
-                "customer_name": customer_name,
-                "customer_email": customer_email,
+                "customer": {"name": customer_name, "email": customer_email},
                 "account_name": account_name,
                 "merchant_bears_cost": merchant_bears_cost,
                 "narration": narration,
                 "metadata": metadata,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
-        return self._process_request(
-            endpoint="/merchant/api/v1/charges/bank-transfer",
-            method=HTTPMethod.POST,
-            data=data,
+            },
         )
 
     def create_virtual_bank_account(
@@ -215,25 +208,17 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(
-            ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT
-        )
-        parameter_model = parameter_validator_class.model_validate(
-            {
-                "account_name": account_name,
-                "account_reference": account_reference,
-                "bank_code": bank_code,
-                "customer_name": customer_name,
-                "customer_email": customer_email,
-                "bvn": bvn,
-                "nin": nin,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
         return self._process_request(
+            client_method=ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT,
             endpoint="/merchant/api/v1/virtual-bank-account",
             method=HTTPMethod.POST,
-            data=data,
+            data={
+                "account_name": account_name,
+                "account_reference": account_reference,
+                "bank_code": bank_code,
+                "customer": {"name": customer_name, "email": customer_email},
+                "kyc": {"bvn": bvn, "nin": nin},
+            },
         )
 
     def get_virtual_bank_account(self, account_reference: str) -> Response:
@@ -249,15 +234,28 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.GET_VIRTUAL_BANK_ACCOUNT,
             endpoint=f"/merchant/api/v1/virtual-bank-account/{account_reference}",
             method=HTTPMethod.GET,
         )
 
-    def get_virtual_bank_account_transactions(self, account_number: str) -> Response:
+    def get_virtual_bank_account_transactions(
+        self,
+        account_number: str,
+        start_date: date | str | None = None,
+        end_date: date | str | None = None,
+        page: int | None = None,
+        limit: int | None = None,
+    ) -> Response:
         """Retrieve transactions associated with a virtual bank account.
 
         Args:
             account_number: The account number of the virtual account.
+            start_date: Only retrieve transactions made on or after this date. E.g., `date(2024, 1, 31)`
+                or `"2024-01-31"`.
+            end_date: Only retrieve transactions made on or before this date.
+            page: The page of transactions to retrieve, starting from 1.
+            limit: The number of transactions per page.
 
         Returns:
             A pydantic model containing the result of the request.
@@ -266,10 +264,87 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
-            endpoint=f"/merchant/api/v1/virtual-bank-account/transactions?account_number={account_number}",
+            client_method=ClientMethod.GET_VIRTUAL_BANK_ACCOUNT_TRANSACTIONS,
+            endpoint="/merchant/api/v1/virtual-bank-account/transactions",
             method=HTTPMethod.GET,
+            params={
+                "account_number": account_number,
+                "start_date": self._format_date(start_date),
+                "end_date": self._format_date(end_date),
+                "page": page,
+                "limit": limit,
+            },
         )
 
+    def iter_virtual_bank_account_transactions(
+        self,
+        account_number: str,
+        start_date: date | str | None = None,
+        end_date: date | str | None = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """Iterate over the transactions of a virtual bank account, a page at a time.
+
+        While the transactions of a page are consumed, the next page is fetched in a background
+        thread when `prefetch` is `True`, so at most two pages are held in memory.
+
+        Args:
+            account_number: The account number of the virtual account.
+            start_date: Only retrieve transactions made on or after this date.
+            end_date: Only retrieve transactions made on or before this date.
+            page_size: The number of transactions retrieved per request.
+            prefetch: Whether to fetch the next page while the current page is consumed.
+
+        Returns:
+            An iterator of the transactions, as returned by Korapay.
+
+        Raises:
+            ClientError: When an error or exception occurs while retrieving a page.
+
+        Example:
+            ```python
+            for transaction in client.iter_virtual_bank_account_transactions(
+                "0000000000", start_date=date(2024, 1, 1)
+            ):
+                print(transaction["reference"], transaction["amount"])
+            ```
+        """
+
+        def fetch(page: int) -> Response:
+            return self.get_virtual_bank_account_transactions(
+                account_number, start_date, end_date, page=page, limit=page_size
+            )
+
+        page = 1
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Pages are fetched in the caller's context, so timeout overrides and the active
+            # trace span apply to them.
+            next_page = (
+                executor.submit(contextvars.copy_context().run, fetch, page)
+                if prefetch
+                else None
+            )
+            response = None if prefetch else fetch(page)
+            while True:
+                if next_page is not None:
+                    response = next_page.result()
+                transactions, has_more = self._transactions_page(response, page_size)
+                next_page = response = None
+                if not has_more:
+                    yield from transactions
+                    return
+                page += 1
+                if prefetch:
+                    next_page = executor.submit(
+                        contextvars.copy_context().run, fetch, page
+                    )
+                    yield from transactions
+                else:
+                    yield from transactions
+                    response = fetch(page)
+                del transactions
+
     def credit_sandbox_virtual_bank_account(
         self, account_number: str, amount: int | float | Decimal, currency: Currency
     ) -> Response:
@@ -294,6 +369,7 @@ class KorapayClient(BaseClient):
             "currency": currency.value,
         }
         return self._process_request(
+            client_method=ClientMethod.CREDIT_SANDBOX_VIRTUAL_BANK_ACCOUNT,
             endpoint="/merchant/api/v1/virtual-bank-account/sandbox/credit",
             method=HTTPMethod.POST,
             data=data,
@@ -343,29 +419,22 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(
-            ClientMethod.CHARGE_VIA_MOBILE_MONEY
-        )
-        parameter_model = parameter_validator_class.model_validate(
-            {
+        return self._process_request(
+            client_method=ClientMethod.CHARGE_VIA_MOBILE_MONEY,
+            endpoint="/merchant/api/v1/charges/mobile-money",
+            method=HTTPMethod.POST,
+            data={
                 "reference": reference,
                 "amount": amount,
                 "currency": currency.value,
                 "redirect_url": redirect_url,
-                "customer_email": customer_email,
-                "customer_name": customer_name,
-                "mobile_money_number": mobile_money_number,
+                "customer": {"name": customer_name, "email": customer_email},
+                "mobile_money": {"number": mobile_money_number},
                 "notification_url": notification_url,
                 "merchant_bears_cost": merchant_bears_cost,
                 "description": description,
                 "metadata": metadata,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
-        return self._process_request(
-            endpoint="/merchant/api/v1/charges/mobile-money",
-            method=HTTPMethod.POST,
-            data=data,
+            },
         )
 
     def authorize_mobile_money_charge(self, reference: str, token: str) -> Response:
@@ -393,6 +462,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.AUTHORIZE_MOBILE_MONEY_CHARGE,
             endpoint="/merchant/api/v1/charges/mobile-money/authorize",
             method=HTTPMethod.POST,
             data={
@@ -417,6 +487,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.RESEND_MOBILE_MONEY_OTP,
             endpoint="/merchant/api/v1/charges/mobile-money/resend-otp",
             method=HTTPMethod.POST,
             data={"transaction_reference": transaction_reference},
@@ -438,6 +509,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.RESEND_STK,
             endpoint="/merchant/api/v1/charges/mobile-money/resend-stk",
             method=HTTPMethod.POST,
             data={"transaction_reference": transaction_reference},
@@ -460,6 +532,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.AUTHORIZE_STK,
             endpoint="/merchant/api/v1/charges/mobile-money/sandbox/authorize-stk",
             method=HTTPMethod.POST,
             data={"reference": reference, "pin": pin},
@@ -502,26 +575,21 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(ClientMethod.INITIATE_CHARGE)
-        parameter_model = parameter_validator_class.model_validate(
-            {
+        return self._process_request(
+            client_method=ClientMethod.INITIATE_CHARGE,
+            endpoint="/merchant/api/v1/charges/initialize",
+            method=HTTPMethod.POST,
+            data={
                 "reference": reference,
                 "amount": amount,
                 "currency": currency,
                 "narration": narration,
                 "notification_url": notification_url,
-                "customer_email": customer_email,
-                "customer_name": customer_name,
+                "customer": {"name": customer_name, "email": customer_email},
                 "default_channel": default_channel,
                 "redirect_url": redirect_url,
                 "channels": channels,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
-        return self._process_request(
-            endpoint="/merchant/api/v1/charges/initialize",
-            method=HTTPMethod.POST,
-            data=data,
+            },
         )
 
     def get_charge(self, reference: str) -> Response:
@@ -537,7 +605,9 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
-            endpoint=f"/merchant/api/v1/charges/{reference}", method=HTTPMethod.GET
+            client_method=ClientMethod.GET_CHARGE,
+            endpoint=f"/merchant/api/v1/charges/{reference}",
+            method=HTTPMethod.GET,
         )
 
     def resolve_bank_account(self, bank_code: str, account_number: str) -> Response:
@@ -556,24 +626,34 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.RESOLVE_BANK_ACCOUNT,
             endpoint="/merchant/api/v1/misc/banks/resolve",
             method=HTTPMethod.POST,
             data={"bank": bank_code, "account": account_number},
         )
 
-    def get_balances(self) -> Response:
+    def get_balances(self, cached: bool = True) -> Response:
         """Retrieve all your pending and available balances.
 
+        Args:
+            cached: Whether to serve the balances from the client's `balance_cache`, when it has
+                one. The cache is bypassed, and left as is, when it is `False`.
+
         Returns:
             A pydantic model containing the result of the request.
 
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        return self._process_request(
+        fetch = functools.partial(
+            self._process_request,
+            client_method=ClientMethod.GET_BALANCES,
             endpoint="/merchant/api/v1/balances",
             method=HTTPMethod.GET,
         )
+        if cached and self._balance_cache is not None:
+            return self._balance_cache.get(fetch)
+        return fetch()
 
     def get_banks(self, country: Country) -> Response:
         """Retrieve a list of all banks supported by Korapay and their properties.
@@ -588,9 +668,11 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
-            endpoint=f"/merchant/api/v1/misc/banks?countryCode={country.value}",
+            client_method=ClientMethod.GET_BANKS,
+            endpoint="/merchant/api/v1/misc/banks",
             method=HTTPMethod.GET,
             use_public_auth=True,
+            params={"countryCode": country.value},
         )
 
     def get_mmo(self, country: Country) -> Response:
@@ -606,9 +688,11 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
-            endpoint=f"/merchant/api/v1/misc/mobile-money?countryCode={country.value}",
+            client_method=ClientMethod.GET_MMO,
+            endpoint="/merchant/api/v1/misc/mobile-money",
             method=HTTPMethod.GET,
             use_public_auth=True,
+            params={"countryCode": country.value},
         )
 
     def payout_to_bank_account(
@@ -642,26 +726,20 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(
-            ClientMethod.PAYOUT_TO_BANK_ACCOUNT
-        )
-        parameter_model = parameter_validator_class.model_validate(
-            {
-                "reference": reference,
-                "amount": amount,
-                "currency": currency,
-                "narration": narration,
-                "bank_code": bank_code,
-                "account_number": account_number,
-                "customer_email": customer_email,
-                "customer_name": customer_name,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
         return self._process_request(
+            client_method=ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
             endpoint="/merchant/api/v1/transactions/disburse",
             method=HTTPMethod.POST,
-            data=data,
+            data={
+                "reference": reference,
+                "destination": {
+                    "amount": amount,
+                    "currency": currency,
+                    "narration": narration,
+                    "bank_account": {"bank": bank_code, "account": account_number},
+                    "customer": {"name": customer_name, "email": customer_email},
+                },
+            },
         )
 
     def payout_to_mobile_money(
@@ -694,26 +772,23 @@ class KorapayClient(BaseClient):
         Raises:
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
-        parameter_validator_class = get_validator_class(
-            ClientMethod.PAYOUT_TO_MOBILE_MONEY
-        )
-        parameter_model = parameter_validator_class.model_validate(
-            {
-                "reference": reference,
-                "amount": amount,
-                "currency": currency,
-                "narration": narration,
-                "mobile_money_operator": mobile_money_operator,
-                "mobile_number": mobile_number,
-                "customer_email": customer_email,
-                "customer_name": customer_name,
-            }
-        )
-        data = parameter_model.model_dump(exclude_none=True)
         return self._process_request(
+            client_method=ClientMethod.PAYOUT_TO_MOBILE_MONEY,
             endpoint="/merchant/api/v1/transactions/disburse",
             method=HTTPMethod.POST,
-            data=data,
+            data={
+                "reference": reference,
+                "destination": {
+                    "amount": amount,
+                    "currency": currency,
+                    "narration": narration,
+                    "mobile_money": {
+                        "operator": mobile_money_operator,
+                        "mobile_number": mobile_number,
+                    },
+                    "customer": {"name": customer_name, "email": customer_email},
+                },
+            },
         )
 
     def bulk_payout_to_bank_account(
@@ -746,10 +821,11 @@ class KorapayClient(BaseClient):
             "batch_reference": batch_reference,
             "description": description,
             "merchant_bears_cost": merchant_bears_cost,
-            "currency": currency.value,
-            "payouts": [payout.model_dump(exclude_none=True) for payout in payouts],
+            "currency": currency,
+            "payouts": payouts,
         }
         return self._process_request(
+            client_method=ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT,
             endpoint="/api/v1/transactions/disburse/bulk",
             method=HTTPMethod.POST,
             data=data,
@@ -768,6 +844,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.GET_PAYOUTS,
             endpoint=f"/api/v1/transactions/bulk/{bulk_reference}/payout",
             method=HTTPMethod.GET,
         )
@@ -785,6 +862,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.GET_BULK_TRANSACTION,
             endpoint=f"/api/v1/transactions/bulk/{bulk_reference}",
             method=HTTPMethod.GET,
         )
@@ -804,6 +882,7 @@ class KorapayClient(BaseClient):
             ClientError: When an error or exception occurs while making the request to Korapay.
         """
         return self._process_request(
+            client_method=ClientMethod.VERIFY_PAYOUT_TRANSACTION,
             endpoint=f"/merchant/api/v1/transactions/{transaction_reference}",
             method=HTTPMethod.GET,
         )
@@ -21,4 +21,12 @@ from korapay_client.enums.public import (
     Currency,
     PaymentChannel,
     Country,
+    HookEvent,
+    RequestPhase,
+    WebhookEventType,
+    PayoutOutcome,
+    DuplicateReferencePolicy,
+    TransactionKind,
+    DiscrepancyType,
+    PlannedPayoutStatus,
 )
@@ -100,3 +100,142 @@ class Country(str, Enum):
     NIGERIA = "NG"
     KENYA = "KE"
     GHANA = "GH"
+
+
+class HookEvent(str, Enum):
+    """An enum of the request lifecycle events that hooks can be registered for on a client.
+
+    Attributes:
+        BEFORE_REQUEST (str): an enum variant. Emitted before a request is sent to Korapay.
+        AFTER_RESPONSE (str): an enum variant. Emitted after a response is received and parsed.
+        ON_ERROR (str): an enum variant. Emitted when a request fails.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient, HookEvent
+        client = KorapayClient(event_hooks={HookEvent.AFTER_RESPONSE: [print]})
+        ```
+    """
+
+    BEFORE_REQUEST = "before_request"
+    AFTER_RESPONSE = "after_response"
+    ON_ERROR = "on_error"
+
+
+class RequestPhase(str, Enum):
+    """An enum of the phases of a request made by a client, as reported to tracers.
+
+    Attributes:
+        VALIDATION (str): an enum variant. Validating the client method's parameters.
+        SERIALIZATION (str): an enum variant. Building the request body.
+        ENCRYPTION (str): an enum variant. Encrypting the request body for card charges.
+        HEADERS (str): an enum variant. Building the request headers.
+        NETWORK (str): an enum variant. Sending the request and receiving the response.
+        DESERIALIZATION (str): an enum variant. Parsing the response.
+    """
+
+    VALIDATION = "validation"
+    SERIALIZATION = "serialization"
+    ENCRYPTION = "encryption"
+    HEADERS = "headers"
+    NETWORK = "network"
+    DESERIALIZATION = "deserialization"
+
+
+class WebhookEventType(str, Enum):
+    """An enum of the events Korapay sends webhook notifications for.
+
+    Attributes:
+        CHARGE_SUCCESS (str): an enum variant. A charge was successful.
+        CHARGE_FAILED (str): an enum variant. A charge failed.
+        TRANSFER_SUCCESS (str): an enum variant. A payout was successful.
+        TRANSFER_FAILED (str): an enum variant. A payout failed.
+        REFUND_SUCCESS (str): an enum variant. A refund was successful.
+        REFUND_FAILED (str): an enum variant. A refund failed.
+    """
+
+    CHARGE_SUCCESS = "charge.success"
+    CHARGE_FAILED = "charge.failed"
+    TRANSFER_SUCCESS = "transfer.success"
+    TRANSFER_FAILED = "transfer.failed"
+    REFUND_SUCCESS = "refund.success"
+    REFUND_FAILED = "refund.failed"
+
+
+class PayoutOutcome(str, Enum):
+    """An enum of the outcomes of payouts recorded in a `korapay_client.journal.PayoutJournal`.
+
+    Attributes:
+        SENT (str): an enum variant. Korapay accepted the payout.
+        REJECTED (str): an enum variant. Korapay rejected the payout, so no money moved.
+        NOT_FOUND (str): an enum variant. Recovery found no payout with the reference on Korapay,
+            so no money moved and the payout can be retried.
+    """
+
+    SENT = "sent"
+    REJECTED = "rejected"
+    NOT_FOUND = "not_found"
+
+
+class DuplicateReferencePolicy(str, Enum):
+    """An enum of how a client handles a request made with the reference of a request it is still
+    waiting on.
+
+    Attributes:
+        REJECT (str): an enum variant. Raise a `DuplicateReferenceError` without sending the request.
+        JOIN (str): an enum variant. Wait for the request in flight and return its response.
+    """
+
+    REJECT = "reject"
+    JOIN = "join"
+
+
+class TransactionKind(str, Enum):
+    """An enum of the kinds of transactions reconciled by `korapay_client.reconciliation`.
+
+    Attributes:
+        CHARGE (str): an enum variant. A charge, looked up with `get_charge`.
+        PAYOUT (str): an enum variant. A payout, looked up with `get_payout_transaction`.
+    """
+
+    CHARGE = "charge"
+    PAYOUT = "payout"
+
+
+class DiscrepancyType(str, Enum):
+    """An enum of the differences found between a local ledger and Korapay by
+    `korapay_client.reconciliation`.
+
+    Attributes:
+        MISSING (str): an enum variant. The transaction is in the ledger but not on Korapay.
+        UNEXPECTED (str): an enum variant. The transaction is on Korapay but not in the ledger.
+        AMOUNT_MISMATCH (str): an enum variant. The amounts of the transaction differ.
+        STATUS_MISMATCH (str): an enum variant. The statuses of the transaction differ.
+        DUPLICATE (str): an enum variant. The ledger has more than one record of the transaction.
+        LOOKUP_FAILED (str): an enum variant. The transaction could not be retrieved from Korapay.
+    """
+
+    MISSING = "missing"
+    UNEXPECTED = "unexpected"
+    AMOUNT_MISMATCH = "amount_mismatch"
+    STATUS_MISMATCH = "status_mismatch"
+    DUPLICATE = "duplicate"
+    LOOKUP_FAILED = "lookup_failed"
+
+
+class PlannedPayoutStatus(str, Enum):
+    """An enum of the statuses of the payouts of a `korapay_client.payouts.PayoutPlanner` run.
+
+    Attributes:
+        SENT (str): an enum variant. Korapay accepted the payout.
+        FAILED (str): an enum variant. Korapay rejected the payout, or the request failed.
+        DEFERRED (str): an enum variant. The payout was not sent, as the balance left after the
+            payouts sent could not cover it.
+        REJECTED (str): an enum variant. The payout was not sent, as it exceeds the whole
+            available balance of its currency.
+    """
+
+    SENT = "sent"
+    FAILED = "failed"
+    DEFERRED = "deferred"
+    REJECTED = "rejected"
@@ -11,3 +11,33 @@ class ClientError(Exception):
     """Raised when an error or exception occurs while making the request to Korapay."""
 
     ...
+
+
+class RequestTimeoutError(ClientError):
+    """Raised when a request to Korapay times out or exceeds its deadline."""
+
+    ...
+
+
+class WebhookError(Exception):
+    """Raised when a webhook notification from Korapay cannot be processed."""
+
+    ...
+
+
+class InvalidWebhookSignatureError(WebhookError):
+    """Raised when the signature of a webhook notification is missing or does not match its data."""
+
+    ...
+
+
+class InvalidWebhookPayloadError(WebhookError):
+    """Raised when the body of a webhook notification is not a valid Korapay event."""
+
+    ...
+
+
+class DuplicateReferenceError(ClientError):
+    """Raised when a request is made with the reference of a request the client is still waiting on."""
+
+    ...
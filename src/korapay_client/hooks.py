@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from korapay_client.enums import ClientMethod, HookEvent, HTTPMethod
+from korapay_client.models import Response
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """The information about a request passed to the event hooks of a client.
+
+    The same object is passed to every hook of a request, and its fields are filled in as
+    the request progresses.
+
+    Attributes:
+        client_method: The client method that made the request.
+        method: The HTTP method of the request.
+        url: The URL of the request.
+        started_at: The `time.perf_counter()` value when the request was started.
+        elapsed: The number of seconds the request took. `None` before the request completes.
+        status_code: The HTTP status code of the response. `None` when no response was received.
+        request_bytes: The size of the request body.
+        response_bytes: The size of the response body.
+        response: The parsed response. Only set for `HookEvent.AFTER_RESPONSE`.
+        error: The error raised by the request. Only set for `HookEvent.ON_ERROR`.
+    """
+
+    client_method: ClientMethod
+    method: HTTPMethod
+    url: str
+    started_at: float
+    elapsed: float | None = None
+    status_code: int | None = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    response: Response | None = None
+    error: BaseException | None = None
+
+
+EventHook = Callable[[RequestEvent], Any | Awaitable[Any]]
+
+
+def merge_event_hooks(
+    *event_hooks: dict[HookEvent | str, list[EventHook]] | None,
+) -> dict[HookEvent, list[EventHook]]:
+    """Combine event hook mappings into one, keeping the order of the hooks."""
+    merged: dict[HookEvent, list[EventHook]] = {}
+    for hooks in event_hooks:
+        for event, callbacks in (hooks or {}).items():
+            merged.setdefault(HookEvent(event), []).extend(callbacks)
+    return merged
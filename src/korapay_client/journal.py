@@ -0,0 +1,524 @@
+"""
+A write-ahead journal of payouts, to find out after a crash whether the payouts in flight moved money.
+
+A client given a `PayoutJournal` durably records the intent of every payout before sending it and
+records its outcome once Korapay answers. After a crash, the payouts whose intent was recorded
+without an outcome are exactly the ones that may or may not have been made. `recover_payouts`
+looks them up with `get_payout_transaction`, or `get_bulk_transaction` for bulk payouts, and
+records what it finds.
+
+Intents are group committed: the records submitted while a commit is being synced to disk are
+written and synced together by the next commit, so concurrent payouts share the cost of `fsync`
+instead of queueing behind each other's.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.journal import FileJournal, recover_payouts
+
+    journal = FileJournal("payouts.journal")
+    client = KorapayClient(payout_journal=journal)
+    for entry in recover_payouts(client, journal):
+        print(entry.reference, entry.outcome, entry.status)
+    ```
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+from korapay_client.enums import ClientMethod, PayoutOutcome
+from korapay_client.exceptions import ClientError
+
+if TYPE_CHECKING:
+    from korapay_client.clients import AsyncKorapayClient, KorapayClient
+    from korapay_client.models import Response
+
+JOURNALED_CLIENT_METHODS = frozenset(
+    {
+        ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
+        ClientMethod.PAYOUT_TO_MOBILE_MONEY,
+        ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT,
+    }
+)
+"""The client methods whose requests are recorded in a client's payout journal."""
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    """A payout recorded in a `PayoutJournal`.
+
+    Attributes:
+        reference: The reference of the payout, or the batch reference of a bulk payout.
+        client_method: The client method that made the payout.
+        request: The body of the payout request.
+        created_at: The UNIX time the intent of the payout was recorded.
+        outcome: The outcome of the payout. `None` while it is unresolved.
+        status: The status of the payout reported by Korapay e.g., `processing`.
+        message: The message of Korapay's response.
+        updated_at: The UNIX time the outcome of the payout was recorded.
+    """
+
+    reference: str
+    client_method: ClientMethod
+    request: dict
+    created_at: float
+    outcome: PayoutOutcome | None = None
+    status: str | None = None
+    message: str | None = None
+    updated_at: float | None = None
+
+
+_FAILED_STATUSES = frozenset({"failed"})
+"""The statuses of payouts that moved no money."""
+
+
+def _payout_reference(client_method: ClientMethod, request: dict) -> str:
+    if client_method is ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT:
+        return request["batch_reference"]
+    return request["reference"]
+
+
+def _response_status(response: "Response") -> str | None:
+    return response.data.get("status") if isinstance(response.data, dict) else None
+
+
+def _payout_outcome(
+    response: "Response",
+) -> tuple[PayoutOutcome, str | None] | None:
+    """Return the outcome of a payout from Korapay's response to it, or `None` when the
+    response leaves it unknown."""
+    status = _response_status(response)
+    if 200 <= response.status_code < 300 and response.status:
+        return PayoutOutcome.SENT, status
+    if 400 <= response.status_code < 500:
+        # A retry of a payout is rejected for reusing its reference, whether or not an earlier
+        # attempt made the payout, so its outcome is left to a lookup.
+        if "duplicate" in (response.message or "").lower():
+            return None
+        return PayoutOutcome.REJECTED, status
+    # Korapay may have made a payout it answered with a server error.
+    return None
+
+
+def _lookup_outcome(
+    response: "Response",
+) -> tuple[PayoutOutcome, str | None] | None:
+    """Return the outcome of a payout from Korapay's response to a lookup of it, or `None` when
+    the response leaves it unknown, e.g., when the lookup was unauthorized or rate limited."""
+    status = _response_status(response)
+    if 200 <= response.status_code < 300 and response.status:
+        if status in _FAILED_STATUSES:
+            return PayoutOutcome.REJECTED, status
+        return PayoutOutcome.SENT, status
+    if response.status_code == 404:
+        return PayoutOutcome.NOT_FOUND, status
+    return None
+
+
+class PayoutJournal(ABC):
+    """Records the intents and outcomes of payouts durably, committing them in groups.
+
+    The unresolved payouts are kept in memory, resolved payouts are only kept by the storage.
+    Implement `_load` and `_write` to store the journal elsewhere.
+    """
+
+    def __init__(self):
+        self._unresolved: dict[str, JournalEntry] = {}
+        self._pending: list[tuple[dict, Future]] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        for entry in self._load():
+            if entry.outcome is None:
+                self._unresolved[entry.reference] = entry
+        self._committer = threading.Thread(
+            target=self._commit_loop, name="korapay-payout-journal", daemon=True
+        )
+        self._committer.start()
+
+    @abstractmethod
+    def _load(self) -> Iterable[JournalEntry]:
+        """Return the latest state of the payouts in the journal's storage."""
+        ...
+
+    @abstractmethod
+    def _write(self, records: list[dict]) -> None:
+        """Durably store intent and outcome records before returning."""
+        ...
+
+    def _close(self) -> None: ...
+
+    def _commit_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+            try:
+                with self._write_lock:
+                    self._write([record for record, _ in batch])
+            except BaseException as error:
+                for _, future in batch:
+                    future.set_exception(error)
+            else:
+                for _, future in batch:
+                    future.set_result(None)
+
+    def _submit(self, record: dict) -> Future:
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The payout journal is closed")
+            self._pending.append((record, future))
+            self._condition.notify()
+        return future
+
+    def _intent(self, client_method: ClientMethod, request: dict) -> Future:
+        entry = JournalEntry(
+            reference=_payout_reference(client_method, request),
+            client_method=client_method,
+            request=request,
+            created_at=time.time(),
+        )
+        self._unresolved[entry.reference] = entry
+        return self._submit(
+            {
+                "type": "intent",
+                "reference": entry.reference,
+                "client_method": client_method.name,
+                "request": request,
+                "at": entry.created_at,
+            }
+        )
+
+    def record_intent(self, client_method: ClientMethod, request: dict) -> str:
+        """Record that a payout is about to be sent, returning once the record is durable.
+
+        Args:
+            client_method: The client method making the payout.
+            request: The body of the payout request.
+
+        Returns:
+            The reference of the payout.
+        """
+        self._intent(client_method, request).result()
+        return _payout_reference(client_method, request)
+
+    async def record_intent_async(
+        self, client_method: ClientMethod, request: dict
+    ) -> str:
+        """Like `record_intent`, waiting for the record to be durable without blocking the event
+        loop."""
+        await asyncio.wrap_future(self._intent(client_method, request))
+        return _payout_reference(client_method, request)
+
+    def record_outcome(
+        self,
+        reference: str,
+        outcome: PayoutOutcome,
+        status: str | None = None,
+        message: str | None = None,
+    ) -> Future:
+        """Record the outcome of a payout.
+
+        The outcome is committed with the next group of records. Losing it to a crash only costs
+        a lookup by `recover_payouts`, so callers need not wait for it.
+
+        Returns:
+            A future resolved once the record is durable.
+        """
+        self._unresolved.pop(reference, None)
+        return self._submit(
+            {
+                "type": "outcome",
+                "reference": reference,
+                "outcome": PayoutOutcome(outcome).value,
+                "status": status,
+                "message": message,
+                "at": time.time(),
+            }
+        )
+
+    def record_response(self, reference: str, response: "Response") -> None:
+        """Record the outcome of a payout from Korapay's response, unless the response leaves the
+        outcome unknown."""
+        outcome = _payout_outcome(response)
+        if outcome is not None:
+            self.record_outcome(reference, outcome[0], outcome[1], response.message)
+
+    def unresolved(self) -> list[JournalEntry]:
+        """Return the payouts whose intent was recorded without an outcome, oldest first."""
+        entries = list(self._unresolved.values())
+        entries.sort(key=lambda entry: entry.created_at)
+        return entries
+
+    def flush(self) -> None:
+        """Wait until every record submitted so far is durable."""
+        self._submit({"type": "flush"}).result()
+
+    def close(self) -> None:
+        """Commit the pending records and close the journal's storage."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._committer.join()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _entry_from_intent(record: dict) -> JournalEntry:
+    return JournalEntry(
+        reference=record["reference"],
+        client_method=ClientMethod[record["client_method"]],
+        request=record["request"],
+        created_at=record["at"],
+    )
+
+
+class FileJournal(PayoutJournal):
+    """A payout journal in an append-only JSON Lines file, synced with `fsync` on every commit.
+
+    A record torn by a crash in the middle of a write is ignored when the journal is opened.
+    Use `compact` to drop the resolved payouts from the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: The path of the journal file. It is created when it does not exist.
+        """
+        self.path = path
+        self._file = open(path, "ab")
+        super().__init__()
+
+    def _load(self) -> Iterable[JournalEntry]:
+        entries: dict[str, JournalEntry] = {}
+        valid_size = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                valid_size += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record["type"] == "intent":
+                    entries[record["reference"]] = _entry_from_intent(record)
+                elif record["type"] == "outcome" and record["reference"] in entries:
+                    entry = entries[record["reference"]]
+                    entry.outcome = PayoutOutcome(record["outcome"])
+                    entry.status = record["status"]
+                    entry.message = record["message"]
+                    entry.updated_at = record["at"]
+        # Drop a record torn by a crash, so the next record starts on its own line.
+        self._file.truncate(valid_size)
+        return entries.values()
+
+    def _write(self, records: list[dict]) -> None:
+        lines = [
+            json.dumps(record, separators=(",", ":"), default=str).encode("utf8")
+            + b"\n"
+            for record in records
+            if record["type"] != "flush"
+        ]
+        if lines:
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def compact(self) -> None:
+        """Rewrite the journal with the intents of the unresolved payouts only."""
+        self.flush()
+        with self._write_lock:
+            temporary_path = f"{self.path}.compacting"
+            with open(temporary_path, "wb") as file:
+                for entry in self.unresolved():
+                    record = {
+                        "type": "intent",
+                        "reference": entry.reference,
+                        "client_method": entry.client_method.name,
+                        "request": entry.request,
+                        "at": entry.created_at,
+                    }
+                    file.write(
+                        json.dumps(record, separators=(",", ":"), default=str).encode(
+                            "utf8"
+                        )
+                        + b"\n"
+                    )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+            self._file.close()
+            self._file = open(self.path, "ab")
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class SQLiteJournal(PayoutJournal):
+    """A payout journal in an SQLite database, committed with `synchronous=FULL`.
+
+    The journal keeps one row per payout, so resolved payouts can be queried.
+    """
+
+    def __init__(self, path: str, table: str = "korapay_payout_journal"):
+        """
+        Args:
+            path: The path of the database.
+            table: The name of the table the payouts are stored in. It is created when it does
+                not exist.
+
+        Raises:
+            ValueError: When `table` is not a valid identifier.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self._table = table
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (reference TEXT PRIMARY KEY, "
+            "client_method TEXT NOT NULL, request TEXT NOT NULL, created_at REAL NOT NULL, "
+            "outcome TEXT, status TEXT, message TEXT, updated_at REAL)"
+        )
+        super().__init__()
+
+    def _load(self) -> Iterable[JournalEntry]:
+        rows = self._connection.execute(
+            f"SELECT reference, client_method, request, created_at FROM {self._table} "
+            "WHERE outcome IS NULL"
+        )
+        return [
+            JournalEntry(
+                reference=reference,
+                client_method=ClientMethod[client_method],
+                request=json.loads(request),
+                created_at=created_at,
+            )
+            for reference, client_method, request, created_at in rows
+        ]
+
+    def _write(self, records: list[dict]) -> None:
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            for record in records:
+                if record["type"] == "intent":
+                    connection.execute(
+                        f"INSERT OR REPLACE INTO {self._table} "
+                        "(reference, client_method, request, created_at) VALUES (?, ?, ?, ?)",
+                        (
+                            record["reference"],
+                            record["client_method"],
+                            json.dumps(record["request"], default=str),
+                            record["at"],
+                        ),
+                    )
+                elif record["type"] == "outcome":
+                    connection.execute(
+                        f"UPDATE {self._table} SET outcome = ?, status = ?, message = ?, "
+                        "updated_at = ? WHERE reference = ?",
+                        (
+                            record["outcome"],
+                            record["status"],
+                            record["message"],
+                            record["at"],
+                            record["reference"],
+                        ),
+                    )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _close(self) -> None:
+        self._connection.close()
+
+
+def _lookup(client, entry: JournalEntry):
+    if entry.client_method is ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT:
+        return client.get_bulk_transaction(entry.reference)
+    return client.get_payout_transaction(entry.reference)
+
+
+def _resolve(journal: PayoutJournal, entry: JournalEntry, response: "Response") -> bool:
+    outcome = _lookup_outcome(response)
+    if outcome is None:
+        return False
+    journal.record_outcome(entry.reference, outcome[0], outcome[1], response.message)
+    entry.outcome, entry.status, entry.message = (
+        outcome[0],
+        outcome[1],
+        response.message,
+    )
+    return True
+
+
+def recover_payouts(
+    client: "KorapayClient", journal: PayoutJournal
+) -> list[JournalEntry]:
+    """Look up the unresolved payouts of a journal on Korapay and record their outcomes.
+
+    Only call it when no payout recorded in the journal is in flight, e.g., when a worker starts.
+    Payouts whose lookup fails, or is answered with an error other than `404 Not Found`, e.g.,
+    `401 Unauthorized` or `429 Too Many Requests`, stay unresolved for the next recovery.
+
+    Args:
+        client: The client to look the payouts up with.
+        journal: The journal to recover.
+
+    Returns:
+        The payouts resolved by the recovery. Payouts with a `PayoutOutcome.NOT_FOUND` outcome
+        moved no money and can be retried.
+    """
+    resolved = []
+    for entry in journal.unresolved():
+        try:
+            response = _lookup(client, entry)
+        except ClientError:
+            continue
+        if _resolve(journal, entry, response):
+            resolved.append(entry)
+    journal.flush()
+    return resolved
+
+
+async def recover_payouts_async(
+    client: "AsyncKorapayClient", journal: PayoutJournal, concurrency: int = 8
+) -> list[JournalEntry]:
+    """Like `recover_payouts`, looking up to `concurrency` payouts up at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def recover(entry: JournalEntry) -> JournalEntry | None:
+        async with semaphore:
+            try:
+                response = await _lookup(client, entry)
+            except ClientError:
+                return None
+        return entry if _resolve(journal, entry, response) else None
+
+    results = await asyncio.gather(*map(recover, journal.unresolved()))
+    await asyncio.to_thread(journal.flush)
+    return [entry for entry in results if entry is not None]
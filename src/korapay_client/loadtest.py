@@ -0,0 +1,531 @@
+"""
+A load generator driving `AsyncKorapayClient` against a Korapay API stand-in, to size worker
+counts and connection pools before peak traffic.
+
+It runs a weighted mix of client methods either open loop, at a target number of requests per
+second, or closed loop, with a fixed number of concurrent workers. It reports throughput, latency
+percentiles and error rates per client method, and can compare pooled connections with a new
+connection per request. By default it starts a local `korapay_client.testing` fake server in a
+subprocess, so no request reaches Korapay. The load generator and the fake server compete for
+CPU when they share a machine, give each its own cores, or point `--url` at a stand-in on another
+host, so the results reflect the client rather than the stand-in.
+
+Example:
+    ```
+    python -m korapay_client.loadtest --rps 500 --duration 30 --fake-latency lognormal:0.15,0.5
+    python -m korapay_client.loadtest --concurrency 64 --connection-mode both
+    python -m korapay_client.loadtest --url http://127.0.0.1:8000 --mix get_balances=1,payout_to_bank_account=3
+    ```
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from korapay_client.clients.async_client import AsyncKorapayClient
+from korapay_client.enums import ClientMethod, Country, Currency
+from korapay_client.exceptions import ClientError
+
+PERCENTILES = (50, 90, 95, 99)
+
+DEFAULT_MIX: dict[ClientMethod, float] = {
+    ClientMethod.GET_BALANCES: 2,
+    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: 3,
+    ClientMethod.VERIFY_PAYOUT_TRANSACTION: 2,
+    ClientMethod.CHARGE_VIA_BANK_TRANSFER: 2,
+    ClientMethod.CHARGE_VIA_CARD: 1,
+}
+
+_TEST_PUBLIC_KEY = "pk_test_loadtest"
+_TEST_SECRET_KEY = "sk_test_loadtest"
+_TEST_ENCRYPTION_KEY = "0123456789abcdef0123456789abcdef"
+
+
+class _Scenario:
+    """Makes the calls of a load test, with unique references and payouts to verify."""
+
+    def __init__(self, run_id: str):
+        self._run_id = run_id
+        self._sequence = 0
+        self._payout_references: list[str] = []
+        self._charge_references: list[str] = []
+
+    def _reference(self, prefix: str) -> str:
+        self._sequence += 1
+        return f"{prefix}-{self._run_id}-{self._sequence}"
+
+    async def get_balances(self, client: AsyncKorapayClient):
+        return await client.get_balances()
+
+    async def get_banks(self, client: AsyncKorapayClient):
+        return await client.get_banks(Country.NIGERIA)
+
+    async def resolve_bank_account(self, client: AsyncKorapayClient):
+        return await client.resolve_bank_account("033", "0000000000")
+
+    async def payout_to_bank_account(self, client: AsyncKorapayClient):
+        reference = self._reference("payout")
+        response = await client.payout_to_bank_account(
+            reference=reference,
+            amount=100,
+            currency=Currency.NGN,
+            bank_code="033",
+            account_number="0000000000",
+            customer_email="loadtest@example.com",
+        )
+        if response.status:
+            self._payout_references.append(reference)
+        return response
+
+    async def get_payout_transaction(self, client: AsyncKorapayClient):
+        reference = (
+            random.choice(self._payout_references)
+            if self._payout_references
+            else self._reference("payout")
+        )
+        return await client.get_payout_transaction(reference)
+
+    async def charge_via_bank_transfer(self, client: AsyncKorapayClient):
+        reference = self._reference("charge")
+        response = await client.charge_via_bank_transfer(
+            reference=reference,
+            customer_email="loadtest@example.com",
+            amount=1000,
+            currency=Currency.NGN,
+        )
+        if response.status:
+            self._charge_references.append(reference)
+        return response
+
+    async def charge_via_card(self, client: AsyncKorapayClient):
+        return await client.charge_via_card(
+            reference=self._reference("card"),
+            customer_name="Load Test",
+            customer_email="loadtest@example.com",
+            card={
+                "number": "4084127883172787",
+                "cvv": "123",
+                "expiry_month": "09",
+                "expiry_year": "30",
+            },
+            amount=1000,
+            currency=Currency.NGN,
+        )
+
+    async def initiate_charge(self, client: AsyncKorapayClient):
+        reference = self._reference("checkout")
+        response = await client.initiate_charge(
+            reference=reference,
+            amount=1000,
+            currency=Currency.NGN,
+            narration="Load test",
+            notification_url="https://example.com/webhook",
+            customer_email="loadtest@example.com",
+        )
+        if response.status:
+            self._charge_references.append(reference)
+        return response
+
+    async def get_charge(self, client: AsyncKorapayClient):
+        reference = (
+            random.choice(self._charge_references)
+            if self._charge_references
+            else self._reference("charge")
+        )
+        return await client.get_charge(reference)
+
+    def call(
+        self, client_method: ClientMethod
+    ) -> Callable[[AsyncKorapayClient], Awaitable]:
+        return getattr(self, SCENARIO_METHODS[client_method])
+
+
+SCENARIO_METHODS: dict[ClientMethod, str] = {
+    ClientMethod.GET_BALANCES: "get_balances",
+    ClientMethod.GET_BANKS: "get_banks",
+    ClientMethod.RESOLVE_BANK_ACCOUNT: "resolve_bank_account",
+    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: "payout_to_bank_account",
+    ClientMethod.VERIFY_PAYOUT_TRANSACTION: "get_payout_transaction",
+    ClientMethod.CHARGE_VIA_BANK_TRANSFER: "charge_via_bank_transfer",
+    ClientMethod.CHARGE_VIA_CARD: "charge_via_card",
+    ClientMethod.INITIATE_CHARGE: "initiate_charge",
+    ClientMethod.GET_CHARGE: "get_charge",
+}
+"""The client methods a load test can call, and the client method name used to call each."""
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Return the nearest-rank `percent` percentile of `sorted_values`."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(len(sorted_values) * percent / 100 + 0.5), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class EndpointStats:
+    """The outcome of the calls made to a client method during a load test.
+
+    Attributes:
+        latencies: The latency in seconds of every completed call, including failed calls.
+        errors: The number of failed calls by status code or exception name.
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    def summary(self, duration: float) -> dict:
+        latencies = sorted(self.latencies)
+        calls = len(latencies)
+        error_count = sum(self.errors.values())
+        return {
+            "calls": calls,
+            "throughput": calls / duration if duration else 0.0,
+            "error_rate": error_count / calls if calls else 0.0,
+            "errors": dict(self.errors),
+            "latency": {
+                "mean": sum(latencies) / calls if calls else 0.0,
+                **{f"p{p}": percentile(latencies, p) for p in PERCENTILES},
+                "max": latencies[-1] if latencies else 0.0,
+            },
+        }
+
+
+@dataclass
+class LoadTestResult:
+    """The outcome of a load test.
+
+    Attributes:
+        connection_mode: `pooled` or `per-request`.
+        duration: The number of seconds calls were made for, including draining in-flight calls.
+        endpoints: The outcome of the calls to each client method.
+        dropped: The number of calls not made because `max_in_flight` calls were in flight,
+            a sign the client cannot keep up with the target rate.
+    """
+
+    connection_mode: str
+    duration: float
+    endpoints: dict[ClientMethod, EndpointStats]
+    dropped: int = 0
+
+    def summary(self) -> dict:
+        """Return the throughput, error rate and latency percentiles per client method and in
+        total, with latencies in seconds."""
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.latencies.extend(stats.latencies)
+            total.errors.update(stats.errors)
+        summary = total.summary(self.duration)
+        # By Little's law, the mean number of calls in flight is the throughput multiplied by
+        # the mean latency, i.e., the number of workers needed to sustain this throughput.
+        summary["mean_concurrency"] = summary["throughput"] * summary["latency"]["mean"]
+        return {
+            "connection_mode": self.connection_mode,
+            "duration": self.duration,
+            "dropped": self.dropped,
+            "total": summary,
+            "endpoints": {
+                client_method.name: stats.summary(self.duration)
+                for client_method, stats in self.endpoints.items()
+            },
+        }
+
+    def format(self) -> str:
+        """Return the summary as a human-readable table, with latencies in milliseconds."""
+        summary = self.summary()
+        total = summary["total"]
+        lines = [
+            f"connection mode: {self.connection_mode}, duration: {self.duration:.1f}s, "
+            f"throughput: {total['throughput']:.1f}/s, "
+            f"mean concurrency: {total['mean_concurrency']:.1f}, dropped: {self.dropped}",
+        ]
+        header = f"{'client method':<28}{'calls':>8}{'rps':>9}{'errors':>8}" + "".join(
+            f"{f'p{p} ms':>10}" for p in PERCENTILES
+        )
+        lines += [header, "-" * len(header)]
+        for name, endpoint in (*summary["endpoints"].items(), ("TOTAL", total)):
+            latency = endpoint["latency"]
+            lines.append(
+                f"{name:<28}{endpoint['calls']:>8}{endpoint['throughput']:>9.1f}"
+                f"{endpoint['error_rate']:>8.1%}"
+                + "".join(f"{latency[f'p{p}'] * 1000:>10.1f}" for p in PERCENTILES)
+            )
+        errors = Counter()
+        for endpoint in summary["endpoints"].values():
+            errors.update(endpoint["errors"])
+        if errors:
+            lines.append(
+                "errors: "
+                + ", ".join(
+                    f"{error}: {count}" for error, count in errors.most_common()
+                )
+            )
+        return "\n".join(lines)
+
+
+async def run_load_test(
+    client: AsyncKorapayClient,
+    duration: float,
+    rps: float | None = None,
+    concurrency: int | None = None,
+    mix: dict[ClientMethod, float] | None = None,
+    max_in_flight: int = 1000,
+    connection_mode: str = "pooled",
+) -> LoadTestResult:
+    """Call `client` for `duration` seconds and measure the outcome of each call.
+
+    Exactly one of `rps` or `concurrency` must be provided. With `rps`, calls start at a fixed
+    rate regardless of how long earlier calls take (open loop), like traffic from many users.
+    With `concurrency`, that many workers each make one call after another (closed loop), like a
+    fixed pool of workers.
+
+    Args:
+        client: The client to make the calls with.
+        duration: The number of seconds to start calls for.
+        rps: The number of calls to start per second.
+        concurrency: The number of workers making calls.
+        mix: The relative weights of the client methods to call, from `SCENARIO_METHODS`.
+            Defaults to `DEFAULT_MIX`.
+        max_in_flight: The maximum number of calls in flight with `rps`, further calls are
+            dropped.
+        connection_mode: The label of the client's connection mode in the result.
+
+    Returns:
+        The outcome of the calls.
+
+    Raises:
+        ValueError: When neither or both of `rps` and `concurrency` are provided, or `mix`
+            contains an unsupported client method.
+    """
+    if (rps is None) == (concurrency is None):
+        raise ValueError("Provide exactly one of `rps` or `concurrency`")
+    mix = mix or DEFAULT_MIX
+    unsupported = [
+        client_method.name
+        for client_method in mix
+        if client_method not in SCENARIO_METHODS
+    ]
+    if unsupported:
+        raise ValueError(f"Unsupported client methods: {', '.join(unsupported)}")
+
+    scenario = _Scenario(run_id=f"{os.getpid()}-{time.time_ns()}")
+    client_methods = list(mix)
+    weights = [mix[client_method] for client_method in client_methods]
+    endpoints = {client_method: EndpointStats() for client_method in client_methods}
+
+    async def call(client_method: ClientMethod) -> None:
+        stats = endpoints[client_method]
+        started_at = time.perf_counter()
+        try:
+            response = await scenario.call(client_method)(client)
+        except ClientError as error:
+            stats.errors[type(error).__name__] += 1
+        else:
+            if response.status_code >= 400:
+                stats.errors[str(response.status_code)] += 1
+        stats.latencies.append(time.perf_counter() - started_at)
+
+    def pick() -> ClientMethod:
+        return random.choices(client_methods, weights)[0]
+
+    started_at = time.perf_counter()
+    ends_at = started_at + duration
+    dropped = 0
+    if concurrency is not None:
+
+        async def worker() -> None:
+            while time.perf_counter() < ends_at:
+                await call(pick())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        in_flight: set[asyncio.Task] = set()
+        interval = 1 / rps
+        next_call_at = started_at
+        while next_call_at < ends_at:
+            delay = next_call_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                dropped += 1
+            else:
+                task = asyncio.create_task(call(pick()))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            next_call_at += interval
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    return LoadTestResult(
+        connection_mode=connection_mode,
+        duration=time.perf_counter() - started_at,
+        endpoints=endpoints,
+        dropped=dropped,
+    )
+
+
+def connection_limits(connection_mode: str, max_connections: int) -> httpx.Limits:
+    """Return the connection pool limits of a connection mode.
+
+    `pooled` keeps idle connections open for reuse, `per-request` closes every connection once
+    its response is received so each request opens a new connection.
+    """
+    if connection_mode == "pooled":
+        return httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+    if connection_mode == "per-request":
+        return httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=0
+        )
+    raise ValueError(f"Unknown connection mode: {connection_mode}")
+
+
+def parse_mix(spec: str) -> dict[ClientMethod, float]:
+    """Parse a mix of client methods e.g., `get_balances=1,payout_to_bank_account=3`."""
+    methods_by_name = {
+        name: client_method for client_method, name in SCENARIO_METHODS.items()
+    }
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in methods_by_name:
+            raise ValueError(
+                f"Unsupported client method {name!r}, expected one of "
+                f"{', '.join(methods_by_name)}"
+            )
+        mix[methods_by_name[name]] = float(weight or 1)
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_fake_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "korapay_client.testing",
+        "--port",
+        str(port),
+        "--rate-limit-rate",
+        str(args.fake_rate_limit_rate),
+        "--server-error-rate",
+        str(args.fake_server_error_rate),
+    ]
+    if args.fake_latency:
+        command += ["--latency", args.fake_latency]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The fake Korapay server exited on start up")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("The fake Korapay server did not start within 10 seconds")
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> list[LoadTestResult]:
+    modes = (
+        ["pooled", "per-request"]
+        if args.connection_mode == "both"
+        else [args.connection_mode]
+    )
+    results = []
+    for mode in modes:
+        async with AsyncKorapayClient(
+            public_key=args.public_key or _TEST_PUBLIC_KEY,
+            secret_key=args.secret_key or _TEST_SECRET_KEY,
+            encryption_key=args.encryption_key or _TEST_ENCRYPTION_KEY,
+            base_url=base_url,
+            limits=connection_limits(mode, args.max_connections),
+            timeout=args.timeout,
+        ) as client:
+            result = await run_load_test(
+                client,
+                duration=args.duration,
+                rps=args.rps,
+                concurrency=args.concurrency,
+                mix=args.mix,
+                max_in_flight=args.max_in_flight,
+                connection_mode=mode,
+            )
+        results.append(result)
+        print(result.format(), end="\n\n")
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m korapay_client.loadtest",
+        description="Load test AsyncKorapayClient against a Korapay API stand-in.",
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, help="Calls to start per second.")
+    load.add_argument("--concurrency", type=int, help="Workers making calls.")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help="Weighted client methods to call e.g., get_balances=1,payout_to_bank_account=3",
+    )
+    parser.add_argument(
+        "--connection-mode",
+        choices=("pooled", "per-request", "both"),
+        default="pooled",
+    )
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument(
+        "--url",
+        help="The base URL of a Korapay API stand-in. A fake server is started when omitted.",
+    )
+    parser.add_argument(
+        "--fake-latency", help="The latency of the started fake server."
+    )
+    parser.add_argument("--fake-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--fake-server-error-rate", type=float, default=0.0)
+    parser.add_argument("--public-key")
+    parser.add_argument("--secret-key")
+    parser.add_argument("--encryption-key")
+    parser.add_argument("--json", help="Write the summaries to this file.")
+    args = parser.parse_args(argv)
+    if args.rps is None and args.concurrency is None:
+        args.concurrency = 10
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = _start_fake_server(args)
+    try:
+        results = asyncio.run(_run(args, base_url))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump([result.summary() for result in results], file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from korapay_client.enums import ClientMethod, HookEvent
+from korapay_client.hooks import EventHook, RequestEvent
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+class _EndpointMetrics:
+    __slots__ = (
+        "bucket_counts",
+        "latency_sum",
+        "latency_count",
+        "status_codes",
+        "errors",
+        "request_bytes",
+        "response_bytes",
+        "in_flight",
+    )
+
+    def __init__(self, bucket_count: int):
+        # The last bucket counts the latencies above the largest bucket bound i.e., +Inf
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.status_codes: dict[int, int] = defaultdict(int)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.in_flight = 0
+
+
+class MetricsCollector:
+    """Collects per client method metrics of the requests made by one or more clients.
+
+    The collector records latency histograms, response status code counts, error counts, bytes
+    sent and received and the number of requests in flight. It needs no external service, the
+    metrics can be read with `snapshot` or exported in the Prometheus text format with
+    `to_prometheus`.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.metrics import MetricsCollector
+
+        metrics = MetricsCollector()
+        client = KorapayClient(metrics=metrics)
+        client.get_balances()
+        print(metrics.snapshot())
+        print(metrics.to_prometheus())
+        ```
+    """
+
+    def __init__(
+        self,
+        latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        namespace: str = "korapay_client",
+    ):
+        """
+        Args:
+            latency_buckets: The upper bounds in seconds of the latency histogram buckets.
+            namespace: The prefix of the metric names in the Prometheus export.
+        """
+        self._latency_buckets = tuple(sorted(latency_buckets))
+        self._namespace = namespace
+        self._endpoints: dict[ClientMethod, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def event_hooks(self) -> dict[HookEvent, list[EventHook]]:
+        """The event hooks that feed this collector, for use as a client's `event_hooks`."""
+        return {
+            HookEvent.BEFORE_REQUEST: [self.before_request],
+            HookEvent.AFTER_RESPONSE: [self.after_response],
+            HookEvent.ON_ERROR: [self.on_error],
+        }
+
+    def before_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._get_endpoint(event.client_method).in_flight += 1
+
+    def after_response(self, event: RequestEvent) -> None:
+        with self._lock:
+            endpoint = self._finish(event)
+            endpoint.status_codes[event.status_code] += 1
+
+    def on_error(self, event: RequestEvent) -> None:
+        with self._lock:
+            endpoint = self._finish(event)
+            if event.status_code is not None:
+                endpoint.status_codes[event.status_code] += 1
+            endpoint.errors[type(event.error).__name__] += 1
+
+    def reset(self) -> None:
+        """Discard all the recorded metrics, except the numbers of requests in flight, which are
+        still to finish."""
+        with self._lock:
+            endpoints = {}
+            for client_method, endpoint in self._endpoints.items():
+                if endpoint.in_flight:
+                    endpoints[client_method] = _EndpointMetrics(
+                        len(self._latency_buckets)
+                    )
+                    endpoints[client_method].in_flight = endpoint.in_flight
+            self._endpoints = endpoints
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return a copy of the recorded metrics keyed by client method name.
+
+        Returns:
+            A dictionary of client method names to their metrics. E.g.,
+            ```python
+            {
+                "GET_BALANCES": {
+                    "latency": {
+                        "buckets": {0.005: 0, 0.01: 2, ..., float("inf"): 2},
+                        "sum": 0.0161,
+                        "count": 2,
+                    },
+                    "status_codes": {200: 2},
+                    "errors": {},
+                    "request_bytes": 0,
+                    "response_bytes": 1024,
+                    "in_flight": 0,
+                }
+            }
+            ```
+            Bucket counts are cumulative, i.e., each bucket counts the latencies less than or
+            equal to its bound.
+        """
+        with self._lock:
+            return {
+                client_method.name: {
+                    "latency": {
+                        "buckets": dict(
+                            zip(
+                                (*self._latency_buckets, float("inf")),
+                                self._cumulative(endpoint.bucket_counts),
+                            )
+                        ),
+                        "sum": endpoint.latency_sum,
+                        "count": endpoint.latency_count,
+                    },
+                    "status_codes": dict(endpoint.status_codes),
+                    "errors": dict(endpoint.errors),
+                    "request_bytes": endpoint.request_bytes,
+                    "response_bytes": endpoint.response_bytes,
+                    "in_flight": endpoint.in_flight,
+                }
+                for client_method, endpoint in self._endpoints.items()
+            }
+
+    def to_prometheus(self) -> str:
+        """Return the recorded metrics in the Prometheus text exposition format."""
+        prefix = self._namespace
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Latency of requests to Korapay.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for name, metrics in snapshot.items():
+            latency = metrics["latency"]
+            for bound, count in latency["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{client_method="{name}",le="{le}"}} {count}'
+                )
+            lines.append(
+                f'{prefix}_request_duration_seconds_sum{{client_method="{name}"}} {latency["sum"]}'
+            )
+            lines.append(
+                f'{prefix}_request_duration_seconds_count{{client_method="{name}"}} {latency["count"]}'
+            )
+        lines += [
+            f"# HELP {prefix}_responses_total Responses received from Korapay by status code.",
+            f"# TYPE {prefix}_responses_total counter",
+        ]
+        for name, metrics in snapshot.items():
+            for status_code, count in metrics["status_codes"].items():
+                lines.append(
+                    f'{prefix}_responses_total{{client_method="{name}",status_code="{status_code}"}} {count}'
+                )
+        lines += [
+            f"# HELP {prefix}_errors_total Failed requests to Korapay by error type.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for name, metrics in snapshot.items():
+            for error, count in metrics["errors"].items():
+                lines.append(
+                    f'{prefix}_errors_total{{client_method="{name}",error="{error}"}} {count}'
+                )
+        for metric, kind, help_text in (
+            ("request_bytes", "counter", "Bytes sent to Korapay in request bodies."),
+            (
+                "response_bytes",
+                "counter",
+                "Bytes received from Korapay in response bodies.",
+            ),
+            ("in_flight", "gauge", "Requests to Korapay currently in flight."),
+        ):
+            metric_name = (
+                f"{prefix}_requests_in_flight"
+                if metric == "in_flight"
+                else f"{prefix}_{metric}_total"
+            )
+            lines.append(f"# HELP {metric_name} {help_text}")
+            lines.append(f"# TYPE {metric_name} {kind}")
+            for name, metrics in snapshot.items():
+                lines.append(
+                    f'{metric_name}{{client_method="{name}"}} {metrics[metric]}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def _get_endpoint(self, client_method: ClientMethod) -> _EndpointMetrics:
+        endpoint = self._endpoints.get(client_method)
+        if endpoint is None:
+            endpoint = _EndpointMetrics(len(self._latency_buckets))
+            self._endpoints[client_method] = endpoint
+        return endpoint
+
+    def _finish(self, event: RequestEvent) -> _EndpointMetrics:
+        endpoint = self._get_endpoint(event.client_method)
+        endpoint.in_flight -= 1
+        endpoint.request_bytes += event.request_bytes
+        endpoint.response_bytes += event.response_bytes
+        if event.elapsed is not None:
+            endpoint.bucket_counts[
+                bisect_left(self._latency_buckets, event.elapsed)
+            ] += 1
+            endpoint.latency_sum += event.elapsed
+            endpoint.latency_count += 1
+        return endpoint
+
+    @staticmethod
+    def _cumulative(counts: list[int]) -> list[int]:
+        total = 0
+        cumulative = []
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
@@ -17,6 +17,9 @@ Note:
     ```
     You can use this models as you would use `dataclasses` although it can do a lot more. `korapay_client`
     only requires you to use them for data representations
+
+Building a model's validators and serializers is deferred until the model is first used. Call
+`korapay_client.models.warmup()` to build all of them ahead of time, e.g., during process start-up.
 """
 
 # ruff: noqa: F401
@@ -28,4 +31,5 @@ from korapay_client.models.public import (
     Customer,
     PayoutOrder,
 )
+from korapay_client.models.base import warmup
 from korapay_client.models.internal import Card
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
+
+MAX_METADATA_FIELDS = 5
+MAX_METADATA_FIELD_KEY_CHAR = 20
+
+
+class DeferredBuildModel(BaseModel):
+    """Base class for all `korapay_client` models.
+
+    Building the validators and serializers of a model is deferred until the model is first
+    used, so a process only pays for the models of the endpoints it calls. Use `warmup`
+    to build them ahead of time.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+def _iter_model_classes(
+    model_class: type[BaseModel] = DeferredBuildModel,
+):
+    for subclass in model_class.__subclasses__():
+        yield subclass
+        yield from _iter_model_classes(subclass)
+
+
+def warmup() -> None:
+    """Build the validators and serializers of every `korapay_client` model.
+
+    Call this at process start-up to move schema building out of the first request.
+    """
+    for model_class in _iter_model_classes():
+        if not model_class.__pydantic_complete__:
+            model_class.model_rebuild(force=True)
+
+
+class SerializeAmountMixin:
+    @field_serializer("amount")
+    def serialize_amount(
+        self, amount: int | float | Decimal, _info
+    ) -> int | float | str:
+        if isinstance(amount, Decimal):
+            return str(amount)
+        return amount
+
+
+class MetadataValidationMixin:
+    @field_validator("metadata")
+    @classmethod
+    def validate_metadata(cls, value: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not value:
+            return None
+        if len(value.values()) > MAX_METADATA_FIELDS:
+            raise ValueError("A maximum of 5 key/values is allowed")
+        for key in value.keys():
+            if len(key) > MAX_METADATA_FIELD_KEY_CHAR:
+                raise ValueError(
+                    "A metadata field key should not contain characters"
+                    f" greater than {MAX_METADATA_FIELD_KEY_CHAR}"
+                )
+        return value
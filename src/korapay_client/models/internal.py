@@ -1,50 +1,18 @@
 from decimal import Decimal
-from typing import Any
-
-from pydantic import (
-    BaseModel,
-    EmailStr,
-    field_validator,
-    model_serializer,
-    SerializerFunctionWrapHandler,
-    field_serializer,
-    HttpUrl,
-)
+from typing import Any, Literal
+
+from pydantic import EmailStr, field_serializer, HttpUrl
 
 from korapay_client.enums.public import Currency, PaymentChannel, MobileMoneyOperator
+from korapay_client.models.base import (
+    DeferredBuildModel,
+    MetadataValidationMixin,
+    SerializeAmountMixin,
+)
+from korapay_client.models.public import Authorization, PayoutOrder
 
-MAX_METADATA_FIELDS = 5
-MAX_METADATA_FIELD_KEY_CHAR = 20
-
-
-class SerializeAmountMixin:
-    @field_serializer("amount")
-    def serialize_amount(
-        self, amount: int | float | Decimal, _info
-    ) -> int | float | str:
-        if isinstance(amount, Decimal):
-            return str(amount)
-        return amount
-
-
-class MetadataValidationMixin:
-    @field_validator("metadata")
-    @classmethod
-    def validate_metadata(cls, value: dict[str, Any] | None) -> dict[str, Any] | None:
-        if not value:
-            return None
-        if len(value.values()) > MAX_METADATA_FIELDS:
-            raise ValueError("A maximum of 5 key/values is allowed")
-        for key in value.keys():
-            if len(key) > MAX_METADATA_FIELD_KEY_CHAR:
-                raise ValueError(
-                    "A metadata field key should not contain characters"
-                    f" greater than {MAX_METADATA_FIELD_KEY_CHAR}"
-                )
-        return value
-
-
-class Card(BaseModel):
+
+class Card(DeferredBuildModel):
     """A pydantic models for representing debit cards by `korapay_client`.
 
     Attributes:
@@ -72,197 +40,142 @@ class Card(BaseModel):
     pin: str | None = None
 
 
-class ChargeViaCardModel(SerializeAmountMixin, MetadataValidationMixin, BaseModel):
+class CustomerModel(DeferredBuildModel):
+    email: str
+    name: str | None = None
+
+
+class CardChargeCustomerModel(DeferredBuildModel):
+    name: str
+    email: EmailStr
+
+
+class ChargeViaCardModel(
+    SerializeAmountMixin, MetadataValidationMixin, DeferredBuildModel
+):
     reference: str
-    customer_name: str
-    customer_email: EmailStr
+    customer: CardChargeCustomerModel
     card: Card
     amount: int | float | Decimal
     currency: Currency
     redirect_url: HttpUrl | None = None
     metadata: dict[str, Any] | None = None
 
-    @model_serializer(mode="wrap")
-    def serialize_self(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        customer_name = data.pop("customer_name")
-        customer_email = data.pop("customer_email")
-        data["redirect_url"] = str(data["redirect_url"])
-        data["customer"] = {"name": customer_name, "email": customer_email}
-        return data
+    @field_serializer("redirect_url")
+    def serialize_redirect_url(self, redirect_url: HttpUrl | None, _info) -> str | None:
+        return str(redirect_url) if redirect_url is not None else None
+
+
+class AuthorizeCardChargeModel(DeferredBuildModel):
+    transaction_reference: str
+    authorization: Authorization
 
 
 class ChargeViaBankTransferModel(
-    SerializeAmountMixin, MetadataValidationMixin, BaseModel
+    SerializeAmountMixin, MetadataValidationMixin, DeferredBuildModel
 ):
     reference: str
-    customer_email: str
+    customer: CustomerModel
     amount: int | float | Decimal
     currency: Currency
-    customer_name: str | None = None
     account_name: str | None = None
     narration: str | None = None
     notification_url: str | None = None
     merchant_bears_cost: bool = False
     metadata: dict[str, Any] | None = None
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        customer_name = data.pop("customer_name", None)
-        customer_email = data.pop("customer_email", None)
-        if any([customer_name, customer_email]):
-            data["customer"] = {}
-            if customer_name:
-                data["customer"]["name"] = customer_name
-            if customer_email:
-                data["customer"]["email"] = customer_email
-        return data
-
-
-class CreateVirtualBankAccountModel(BaseModel):
+
+class VirtualBankAccountCustomerModel(DeferredBuildModel):
+    name: str
+    email: str | None = None
+
+
+class KYCModel(DeferredBuildModel):
+    bvn: str
+    nin: str | None = None
+
+
+class CreateVirtualBankAccountModel(DeferredBuildModel):
     account_name: str
     account_reference: str
     bank_code: str
-    customer_name: str
-    bvn: str
-    customer_email: str | None = None
-    nin: str | None = None
+    customer: VirtualBankAccountCustomerModel
+    kyc: KYCModel
     permanent: bool = True
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        customer_name = data.pop("customer_name")
-        customer_email = data.pop("customer_email", None)
-        bvn = data.pop("bvn")
-        nin = data.pop("nin", None)
-        data["customer"] = {"name": customer_name}
-        if customer_email:
-            data["customer"]["email"] = customer_email
-        data["kyc"] = {"bvn": bvn}
-        if nin:
-            data["kyc"]["nin"] = nin
-        return data
+
+class MobileMoneyModel(DeferredBuildModel):
+    number: str
 
 
 class ChargeViaMobileMoneyModel(
-    SerializeAmountMixin, MetadataValidationMixin, BaseModel
+    SerializeAmountMixin, MetadataValidationMixin, DeferredBuildModel
 ):
     reference: str
-    customer_email: str
+    customer: CustomerModel
     amount: int | float | Decimal
-    mobile_money_number: str
+    mobile_money: MobileMoneyModel
     currency: Currency
     notification_url: str | None = None
-    customer_name: str | None = None
     redirect_url: str | None = None
     merchant_bears_cost: bool = False
     description: str | None = None
     metadata: dict[str, Any] | None = None
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        mobile_money_number = data.pop("mobile_money_number")
-        customer_email = data.pop("customer_email")
-        customer_name = data.pop("customer_name", None)
-        data["mobile_money"] = {"number": mobile_money_number}
-        data["customer"] = {"email": customer_email}
-        if customer_name:
-            data["customer"]["name"] = customer_name
-        return data
 
-
-class InitiateChargeModel(SerializeAmountMixin, BaseModel):
+class InitiateChargeModel(SerializeAmountMixin, DeferredBuildModel):
     reference: str
     amount: int | float | Decimal
     currency: Currency
     narration: str
     notification_url: str
-    customer_email: str
-    customer_name: str | None = None
+    customer: CustomerModel
     channels: list[PaymentChannel] | None = None
     default_channel: PaymentChannel | None = None
     redirect_url: str | None = None
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        customer_email = data.pop("customer_email")
-        customer_name = data.pop("customer_name", None)
-        data["customer"] = {"email": customer_email}
-        if customer_name:
-            data["customer"]["name"] = customer_name
-        return data
 
+class DestinationBankAccountModel(DeferredBuildModel):
+    bank: str
+    account: str
 
-class PayoutToBankAccountModel(SerializeAmountMixin, BaseModel):
-    reference: str
+
+class BankAccountDestinationModel(SerializeAmountMixin, DeferredBuildModel):
+    type: Literal["bank_account"] = "bank_account"
     amount: int | float | Decimal
     currency: Currency
-    bank_code: str
-    account_number: str
-    customer_email: str
+    bank_account: DestinationBankAccountModel
+    customer: CustomerModel
     narration: str | None = None
-    customer_name: str | None = None
-
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        amount = data.pop("amount")
-        currency = data.pop("currency")
-        bank_code = data.pop("bank_code")
-        account_number = data.pop("account_number")
-        customer_email = data.pop("customer_email")
-        narration = data.pop("narration", None)
-        customer_name = data.pop("customer_name", None)
-        data["destination"] = {
-            "type": "bank_account",
-            "amount": amount,
-            "currency": currency,
-            "bank_account": {"bank": bank_code, "account": account_number},
-            "customer": {"email": customer_email},
-        }
-        if narration:
-            data["destination"]["narration"] = narration
-        if customer_name:
-            data["destination"]["customer"]["name"] = customer_name
-        return data
-
-
-class PayoutToMobileMoneyModel(SerializeAmountMixin, BaseModel):
+
+
+class PayoutToBankAccountModel(DeferredBuildModel):
     reference: str
+    destination: BankAccountDestinationModel
+
+
+class DestinationMobileMoneyModel(DeferredBuildModel):
+    operator: MobileMoneyOperator | str
+    mobile_number: str
+
+
+class MobileMoneyDestinationModel(SerializeAmountMixin, DeferredBuildModel):
+    type: Literal["mobile_money"] = "mobile_money"
     amount: int | float | Decimal
     currency: Currency
-    mobile_money_operator: MobileMoneyOperator | str
-    mobile_number: str
-    customer_email: str
-    customer_name: str | None = None
+    mobile_money: DestinationMobileMoneyModel
+    customer: CustomerModel
     narration: str | None = None
 
-    @model_serializer(mode="wrap")
-    def serialize_model(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
-        data = handler(self)
-        amount = data.pop("amount")
-        currency = data.pop("currency")
-        mobile_money_operator = data.pop("mobile_money_operator")
-        mobile_number = data.pop("mobile_number")
-        customer_email = data.pop("customer_email")
-        customer_name = data.pop("customer_name", None)
-        narration = data.pop("narration", None)
-        data["destination"] = {
-            "type": "mobile_money",
-            "amount": amount,
-            "currency": currency,
-            "mobile_money": {
-                "operator": mobile_money_operator,
-                "mobile_number": mobile_number,
-            },
-            "customer": {"email": customer_email},
-        }
-        if narration:
-            data["destination"]["narration"] = narration
-        if customer_name:
-            data["customer"]["name"] = customer_name
-        return data
+
+class PayoutToMobileMoneyModel(DeferredBuildModel):
+    reference: str
+    destination: MobileMoneyDestinationModel
+
+
+class BulkPayoutToBankAccountModel(DeferredBuildModel):
+    batch_reference: str
+    description: str
+    merchant_bears_cost: bool
+    currency: Currency
+    payouts: list[PayoutOrder]
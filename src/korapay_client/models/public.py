@@ -1,13 +1,12 @@
-from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional, Literal
 
-from pydantic import BaseModel, EmailStr
+from pydantic import EmailStr
 
-from korapay_client.models.internal import SerializeAmountMixin
+from korapay_client.models.base import DeferredBuildModel, SerializeAmountMixin
 
 
-class Response(BaseModel):
+class Response(DeferredBuildModel):
     """A pydantic model for representing the response returned from making a request to Korapay
     by calling any of the client methods.
 
@@ -36,8 +35,7 @@ class Response(BaseModel):
     data: dict | list | None
 
 
-@dataclass
-class AVS(BaseModel):
+class AVS(DeferredBuildModel):
     """A pydantic model for representing the address information of a debit card for
     Address Verification Service.
 
@@ -72,7 +70,7 @@ class AVS(BaseModel):
     zip_code: str
 
 
-class Authorization(BaseModel):
+class Authorization(DeferredBuildModel):
     """A pydantic model for representing additional information required by Korapay for
     authorizing a charge on the card.
 
@@ -96,7 +94,7 @@ class Authorization(BaseModel):
     avs: AVS | None = None
 
 
-class BankAccount(BaseModel):
+class BankAccount(DeferredBuildModel):
     """A pydantic model for representing bank account information.
 
     Attributes:
@@ -114,7 +112,7 @@ class BankAccount(BaseModel):
     account_number: str
 
 
-class Customer(BaseModel):
+class Customer(DeferredBuildModel):
     """A pydantic model for representing customer's information.
 
     Attributes:
@@ -132,7 +130,7 @@ class Customer(BaseModel):
     name: Optional[str] = None
 
 
-class PayoutOrder(SerializeAmountMixin, BaseModel):
+class PayoutOrder(SerializeAmountMixin, DeferredBuildModel):
     """A pydantic model for representing individual transactions in a bulk payout.
 
     Attributes:
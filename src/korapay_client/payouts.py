@@ -0,0 +1,421 @@
+"""
+Payout runs checked against the available balances before any payout is sent.
+
+`PayoutPlanner` and `AsyncPayoutPlanner` retrieve the balances once per run and reserve the amount
+of each payout, plus its estimated fee, from the available balance of its currency as the payout
+is dispatched. A payout exceeding the whole available balance of its currency is rejected, and a
+payout exceeding what is left after the payouts dispatched before it is deferred, instead of being
+sent only for Korapay to reject it for insufficient funds.
+
+Reservations are released when Korapay rejects a payout, and the deferred payouts are checked
+again in their order, so they may still be sent within the run. Payouts whose outcome is unknown,
+because of a server error or a failed request, keep their reservation as they may have been
+debited. Payouts still deferred at the end of the run are returned for a later run.
+
+Example:
+    ```python
+    from korapay_client import Currency, KorapayClient, PlannedPayoutStatus
+    from korapay_client.payouts import PayoutPlanner, PlannedPayout
+
+    payouts = [
+        PlannedPayout.to_bank_account(
+            reference=row.reference,
+            amount=row.amount,
+            currency=Currency.NGN,
+            bank_code=row.bank_code,
+            account_number=row.account_number,
+            customer_email=row.email,
+        )
+        for row in payroll
+    ]
+    results = PayoutPlanner(KorapayClient(), concurrency=16).run(payouts)
+    deferred = [
+        result.payout for result in results if result.status is PlannedPayoutStatus.DEFERRED
+    ]
+    ```
+"""
+
+import asyncio
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from korapay_client.enums import ClientMethod, Currency, PlannedPayoutStatus
+from korapay_client.enums.public import MobileMoneyOperator
+from korapay_client.exceptions import ClientError
+from korapay_client.models import Response
+
+if TYPE_CHECKING:
+    from korapay_client.clients import AsyncKorapayClient, KorapayClient
+
+FeeEstimator = Callable[["PlannedPayout"], int | float | Decimal]
+
+
+def _decimal(value: int | float | Decimal | str) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _currency(currency: Currency | str) -> str:
+    return currency.value if isinstance(currency, Currency) else currency
+
+
+@dataclass(slots=True)
+class PlannedPayout:
+    """A payout to send in a payout run.
+
+    Attributes:
+        client_method: The client method sending the payout, `ClientMethod.PAYOUT_TO_BANK_ACCOUNT`
+            or `ClientMethod.PAYOUT_TO_MOBILE_MONEY`.
+        arguments: The keyword arguments of the client method.
+    """
+
+    client_method: ClientMethod
+    arguments: dict
+
+    @classmethod
+    def to_bank_account(
+        cls,
+        reference: str,
+        amount: int | float | Decimal,
+        currency: Currency,
+        bank_code: str,
+        account_number: str,
+        customer_email: str,
+        narration: str | None = None,
+        customer_name: str | None = None,
+    ) -> "PlannedPayout":
+        """A payout sent with `payout_to_bank_account`, taking the same arguments."""
+        return cls(
+            ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
+            {
+                "reference": reference,
+                "amount": amount,
+                "currency": currency,
+                "bank_code": bank_code,
+                "account_number": account_number,
+                "customer_email": customer_email,
+                "narration": narration,
+                "customer_name": customer_name,
+            },
+        )
+
+    @classmethod
+    def to_mobile_money(
+        cls,
+        reference: str,
+        amount: int | float | Decimal,
+        currency: Currency,
+        mobile_money_operator: MobileMoneyOperator | str,
+        mobile_number: str,
+        customer_email: str,
+        customer_name: str | None = None,
+        narration: str | None = None,
+    ) -> "PlannedPayout":
+        """A payout sent with `payout_to_mobile_money`, taking the same arguments."""
+        return cls(
+            ClientMethod.PAYOUT_TO_MOBILE_MONEY,
+            {
+                "reference": reference,
+                "amount": amount,
+                "currency": currency,
+                "mobile_money_operator": mobile_money_operator,
+                "mobile_number": mobile_number,
+                "customer_email": customer_email,
+                "customer_name": customer_name,
+                "narration": narration,
+            },
+        )
+
+    @property
+    def reference(self) -> str:
+        return self.arguments["reference"]
+
+    @property
+    def amount(self) -> Decimal:
+        return _decimal(self.arguments["amount"])
+
+    @property
+    def currency(self) -> str:
+        return _currency(self.arguments["currency"])
+
+
+@dataclass(slots=True)
+class PlannedPayoutResult:
+    """The result of a payout of a payout run.
+
+    Attributes:
+        payout: The payout.
+        status: What became of the payout.
+        response: The response of Korapay, when the payout was sent.
+        error: The error raised sending the payout, if any.
+    """
+
+    payout: PlannedPayout
+    status: PlannedPayoutStatus
+    response: Response | None = None
+    error: Exception | None = None
+
+
+@dataclass(slots=True)
+class Reservations:
+    """The available balances of a payout run and the amounts reserved from them.
+
+    Attributes:
+        available: The available balance of each currency when the run started.
+        reserved: The amount of each currency reserved by the payouts dispatched.
+    """
+
+    available: dict[str, Decimal]
+    reserved: dict[str, Decimal] = field(default_factory=dict)
+
+    @classmethod
+    def from_response(cls, response: Response) -> "Reservations":
+        """Read the available balances from the response of `get_balances`.
+
+        Raises:
+            ClientError: When the balances were not retrieved.
+        """
+        if not response.status or not isinstance(response.data, dict):
+            raise ClientError(
+                f"Failed to retrieve the balances: {response.status_code} {response.message}"
+            )
+        return cls(
+            {
+                currency: _decimal(balance.get("available_balance") or 0)
+                for currency, balance in response.data.items()
+            }
+        )
+
+    def remaining(self, currency: str) -> Decimal:
+        """The amount of a currency left for payouts."""
+        return self.available.get(currency, Decimal(0)) - self.reserved.get(
+            currency, Decimal(0)
+        )
+
+    def reserve(self, currency: str, amount: Decimal) -> bool:
+        """Reserve an amount of a currency, returning whether enough was left."""
+        if amount > self.remaining(currency):
+            return False
+        self.reserved[currency] = self.reserved.get(currency, Decimal(0)) + amount
+        return True
+
+    def release(self, currency: str, amount: Decimal) -> None:
+        """Return a reserved amount of a currency."""
+        self.reserved[currency] -= amount
+
+
+class _Run:
+    """The bookkeeping of a payout run shared by the planners."""
+
+    def __init__(
+        self,
+        reservations: Reservations,
+        fee_estimator: FeeEstimator | None,
+    ):
+        self.reservations = reservations
+        self.fee_estimator = fee_estimator
+        self.results: dict[int, PlannedPayoutResult] = {}
+        # The payouts waiting for funds to be released, by position in the run.
+        self.deferred: dict[int, PlannedPayout] = {}
+        self.lock = threading.Lock()
+
+    def cost(self, payout: PlannedPayout) -> Decimal:
+        if self.fee_estimator is None:
+            return payout.amount
+        return payout.amount + _decimal(self.fee_estimator(payout))
+
+    def admit(self, index: int, payout: PlannedPayout) -> bool:
+        """Reserve the funds of a payout, returning whether it can be dispatched."""
+        cost = self.cost(payout)
+        with self.lock:
+            if cost > self.reservations.available.get(payout.currency, Decimal(0)):
+                self.results[index] = PlannedPayoutResult(
+                    payout, PlannedPayoutStatus.REJECTED
+                )
+                return False
+            if not self.reservations.reserve(payout.currency, cost):
+                self.deferred[index] = payout
+                return False
+            return True
+
+    def readmit(self) -> list[tuple[int, PlannedPayout]]:
+        """Reserve the funds of the deferred payouts that fit in the released funds."""
+        admitted = []
+        with self.lock:
+            for index, payout in list(self.deferred.items()):
+                if self.reservations.reserve(payout.currency, self.cost(payout)):
+                    del self.deferred[index]
+                    admitted.append((index, payout))
+        return admitted
+
+    def complete(
+        self,
+        index: int,
+        payout: PlannedPayout,
+        response: Response | None,
+        error: Exception | None,
+    ) -> bool:
+        """Record the result of a payout, returning whether its reservation was released."""
+        if response is not None and response.status:
+            status = PlannedPayoutStatus.SENT
+        else:
+            status = PlannedPayoutStatus.FAILED
+        self.results[index] = PlannedPayoutResult(payout, status, response, error)
+        # Only payouts Korapay rejected are known not to be debited.
+        if response is not None and not response.status and response.status_code < 500:
+            with self.lock:
+                self.reservations.release(payout.currency, self.cost(payout))
+            return True
+        return False
+
+    def finish(self) -> list[PlannedPayoutResult]:
+        for index, payout in self.deferred.items():
+            self.results[index] = PlannedPayoutResult(
+                payout, PlannedPayoutStatus.DEFERRED
+            )
+        return [self.results[index] for index in sorted(self.results)]
+
+
+class PayoutPlanner:
+    """Sends payout runs with a `KorapayClient` and a pool of threads, reserving their funds
+    from the available balances."""
+
+    def __init__(
+        self,
+        client: "KorapayClient",
+        concurrency: int = 8,
+        fee_estimator: FeeEstimator | None = None,
+    ):
+        """
+        Args:
+            client: The client to send the payouts with.
+            concurrency: The maximum number of payouts sent at a time.
+            fee_estimator: A callable returning the fee Korapay debits with a payout, reserved
+                with its amount. Fees are not reserved when it is not provided.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.fee_estimator = fee_estimator
+
+    def reservations(self) -> Reservations:
+        """Retrieve the available balances to reserve payouts from.
+
+        Raises:
+            ClientError: When the balances were not retrieved.
+        """
+        return Reservations.from_response(self.client.get_balances(cached=False))
+
+    def _send(self, payout: PlannedPayout) -> tuple[Response | None, Exception | None]:
+        method = getattr(self.client, payout.client_method.value.lower())
+        try:
+            return method(**payout.arguments), None
+        except Exception as error:
+            return None, error
+
+    def run(self, payouts: Iterable[PlannedPayout]) -> list[PlannedPayoutResult]:
+        """Send payouts, in order, up to what the available balances cover.
+
+        Returns:
+            The result of each payout, in the order of `payouts`.
+
+        Raises:
+            ClientError: When the balances were not retrieved. No payout is sent.
+        """
+        run = _Run(self.reservations(), self.fee_estimator)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            in_flight = {}
+
+            def dispatch(index: int, payout: PlannedPayout) -> None:
+                future = executor.submit(self._send, payout)
+                in_flight[future] = (index, payout)
+
+            for index, payout in enumerate(payouts):
+                if run.admit(index, payout):
+                    dispatch(index, payout)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                released = False
+                for future in done:
+                    index, payout = in_flight.pop(future)
+                    released |= run.complete(index, payout, *future.result())
+                if released and run.deferred:
+                    for index, payout in run.readmit():
+                        dispatch(index, payout)
+        return run.finish()
+
+
+class AsyncPayoutPlanner:
+    """Sends payout runs with an `AsyncKorapayClient`, reserving their funds from the available
+    balances."""
+
+    def __init__(
+        self,
+        client: "AsyncKorapayClient",
+        concurrency: int = 8,
+        fee_estimator: FeeEstimator | None = None,
+    ):
+        """
+        Args:
+            client: The client to send the payouts with.
+            concurrency: The maximum number of payouts sent at a time.
+            fee_estimator: A callable returning the fee Korapay debits with a payout, reserved
+                with its amount. Fees are not reserved when it is not provided.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.fee_estimator = fee_estimator
+
+    async def reservations(self) -> Reservations:
+        """Retrieve the available balances to reserve payouts from.
+
+        Raises:
+            ClientError: When the balances were not retrieved.
+        """
+        return Reservations.from_response(await self.client.get_balances(cached=False))
+
+    async def _send(
+        self, semaphore: asyncio.Semaphore, payout: PlannedPayout
+    ) -> tuple[Response | None, Exception | None]:
+        method = getattr(self.client, payout.client_method.value.lower())
+        async with semaphore:
+            try:
+                return await method(**payout.arguments), None
+            except Exception as error:
+                return None, error
+
+    async def run(self, payouts: Iterable[PlannedPayout]) -> list[PlannedPayoutResult]:
+        """Send payouts, in order, up to what the available balances cover.
+
+        Returns:
+            The result of each payout, in the order of `payouts`.
+
+        Raises:
+            ClientError: When the balances were not retrieved. No payout is sent.
+        """
+        run = _Run(await self.reservations(), self.fee_estimator)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        in_flight = {}
+
+        def dispatch(index: int, payout: PlannedPayout) -> None:
+            task = asyncio.ensure_future(self._send(semaphore, payout))
+            in_flight[task] = (index, payout)
+
+        for index, payout in enumerate(payouts):
+            if run.admit(index, payout):
+                dispatch(index, payout)
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=FIRST_COMPLETED)
+                released = False
+                for task in done:
+                    index, payout = in_flight.pop(task)
+                    released |= run.complete(index, payout, *task.result())
+                if released and run.deferred:
+                    for index, payout in run.readmit():
+                        dispatch(index, payout)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return run.finish()
@@ -0,0 +1,239 @@
+"""
+Clients for many Korapay merchant accounts sharing one connection pool.
+
+A platform acting for many merchants needs a client per merchant, as every request is authorized
+with the keys of its merchant. `ClientPool` and `AsyncClientPool` create those clients on demand
+from the merchants' credentials and have them all send their requests through one httpx client,
+so connections to Korapay are reused across merchants instead of each client opening its own.
+Each request is still authorized with the keys of its merchant.
+
+The clients of the merchants used most recently are kept in a least recently used cache of
+`max_clients` clients. Evicting a client is cheap as it holds no connections.
+
+Example:
+    ```python
+    from korapay_client.pool import ClientPool, MerchantCredentials
+
+    def load_credentials(merchant_id: str) -> MerchantCredentials:
+        keys = vault.read(f"korapay/{merchant_id}")
+        return MerchantCredentials(keys["public"], keys["secret"], keys["encryption"])
+
+    with ClientPool(load_credentials, max_clients=500) as pool:
+        pool.get("merchant-42").get_balances()
+    ```
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Mapping, TypeVar
+
+import httpx
+
+from korapay_client.base_clients import DEFAULT_LIMITS, DEFAULT_TIMEOUT
+from korapay_client.clients import AsyncKorapayClient, KorapayClient
+
+C = TypeVar("C", KorapayClient, AsyncKorapayClient)
+
+_MERCHANT_SPECIFIC_OPTIONS = ("balance_cache", "payout_journal")
+
+
+@dataclass(slots=True, frozen=True)
+class MerchantCredentials:
+    """The keys of a Korapay merchant account.
+
+    Attributes:
+        public_key: The public key of the merchant.
+        secret_key: The secret key of the merchant.
+        encryption_key: The encryption key of the merchant.
+    """
+
+    public_key: str
+    secret_key: str = field(repr=False)
+    encryption_key: str = field(repr=False)
+
+
+CredentialsProvider = (
+    Mapping[str, MerchantCredentials] | Callable[[str], MerchantCredentials]
+)
+
+
+class _BaseClientPool(Generic[C]):
+    _client_class: type[C]
+
+    def __init__(
+        self,
+        credentials: CredentialsProvider,
+        max_clients: int,
+        client_options: dict,
+    ):
+        if max_clients <= 0:
+            raise ValueError("max_clients must be positive")
+        for option in _MERCHANT_SPECIFIC_OPTIONS:
+            if option in client_options:
+                raise ValueError(
+                    f"{option} is specific to a merchant and cannot be shared by a pool"
+                )
+        self._credentials = credentials
+        self.max_clients = max_clients
+        self._client_options = client_options
+        self._clients: OrderedDict[str, C] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load_credentials(self, merchant_id: str) -> MerchantCredentials:
+        if isinstance(self._credentials, Mapping):
+            return self._credentials[merchant_id]
+        return self._credentials(merchant_id)
+
+    def get(self, merchant_id: str) -> C:
+        """Return the client of a merchant, creating it when it is not cached.
+
+        Raises:
+            KeyError: When `credentials` is a mapping without the merchant.
+            MissingAPIKeyError: When a key of the merchant is empty.
+        """
+        with self._lock:
+            client = self._clients.get(merchant_id)
+            if client is not None:
+                self._clients.move_to_end(merchant_id)
+                return client
+        # Credentials may be loaded from a slow store, so they are loaded without the lock.
+        credentials = self._load_credentials(merchant_id)
+        client = self._client_class(
+            public_key=credentials.public_key,
+            secret_key=credentials.secret_key,
+            encryption_key=credentials.encryption_key,
+            http_client=self._http_client,
+            **self._client_options,
+        )
+        with self._lock:
+            client = self._clients.setdefault(merchant_id, client)
+            self._clients.move_to_end(merchant_id)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
+
+    __getitem__ = get
+
+    def evict(self, merchant_id: str) -> None:
+        """Discard the client of a merchant, e.g., after it was closed as a merchant of the
+        platform. Rotate the keys of a merchant with the `rotate_keys` of its client instead."""
+        with self._lock:
+            self._clients.pop(merchant_id, None)
+
+    def __contains__(self, merchant_id: str) -> bool:
+        return merchant_id in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+class ClientPool(_BaseClientPool[KorapayClient]):
+    """Creates the `KorapayClient`s of merchants, sharing one `httpx.Client`.
+
+    A pool is thread safe.
+    """
+
+    _client_class = KorapayClient
+
+    def __init__(
+        self,
+        credentials: CredentialsProvider,
+        max_clients: int = 256,
+        limits: httpx.Limits | None = None,
+        transport: httpx.BaseTransport | None = None,
+        http_client: httpx.Client | None = None,
+        **client_options,
+    ):
+        """
+        Args:
+            credentials: A mapping of merchant identifiers to credentials, or a callable
+                returning the credentials of a merchant identifier.
+            max_clients: The maximum number of clients kept.
+            limits: The limits of the shared connection pool.
+            transport: The httpx transport of the shared httpx client.
+            http_client: The httpx client to share instead of one created by the pool. It is
+                not closed by `close`, and `limits` and `transport` do not apply to it.
+            **client_options: The other arguments of the clients, e.g., `timeout`, `metrics` or
+                `event_hooks`, shared by the clients of every merchant.
+
+        Raises:
+            ValueError: When `max_clients` is not positive, or an option specific to a merchant,
+                `balance_cache` or `payout_journal`, is provided.
+        """
+        super().__init__(credentials, max_clients, client_options)
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.Client(
+            limits=limits or DEFAULT_LIMITS,
+            timeout=client_options.get("timeout", DEFAULT_TIMEOUT),
+            transport=transport,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Close the shared connection pool and discard the clients."""
+        with self._lock:
+            self._clients.clear()
+        if self._owns_http_client:
+            self._http_client.close()
+
+
+class AsyncClientPool(_BaseClientPool[AsyncKorapayClient]):
+    """Creates the `AsyncKorapayClient`s of merchants, sharing one `httpx.AsyncClient`.
+
+    Connections are bound to the event loop that opened them, so a pool must be used from a
+    single event loop.
+    """
+
+    _client_class = AsyncKorapayClient
+
+    def __init__(
+        self,
+        credentials: CredentialsProvider,
+        max_clients: int = 256,
+        limits: httpx.Limits | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        **client_options,
+    ):
+        """
+        Args:
+            credentials: A mapping of merchant identifiers to credentials, or a callable
+                returning the credentials of a merchant identifier.
+            max_clients: The maximum number of clients kept.
+            limits: The limits of the shared connection pool.
+            transport: The httpx transport of the shared httpx client.
+            http_client: The httpx client to share instead of one created by the pool. It is
+                not closed by `close`, and `limits` and `transport` do not apply to it.
+            **client_options: The other arguments of the clients, e.g., `timeout`, `metrics` or
+                `event_hooks`, shared by the clients of every merchant.
+
+        Raises:
+            ValueError: When `max_clients` is not positive, or an option specific to a merchant,
+                `balance_cache` or `payout_journal`, is provided.
+        """
+        super().__init__(credentials, max_clients, client_options)
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(
+            limits=limits or DEFAULT_LIMITS,
+            timeout=client_options.get("timeout", DEFAULT_TIMEOUT),
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the shared connection pool and discard the clients."""
+        with self._lock:
+            self._clients.clear()
+        if self._owns_http_client:
+            await self._http_client.aclose()
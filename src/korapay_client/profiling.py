@@ -0,0 +1,257 @@
+"""
+Profiling shows where the client's own overhead goes on each call to Korapay.
+
+`Profiler` is a `Tracer` that accumulates the wall clock and CPU time of every `RequestPhase` of
+the calls made by a client, per `ClientMethod`. Time spent in a call outside of its phases, e.g.,
+in event hooks, is reported as the `other` phase.
+
+CPU time is measured per thread. The CPU time of the phases of an `AsyncKorapayClient` call that
+await, i.e., `network`, also counts the work of the other tasks run by the event loop meanwhile.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.profiling import Profiler
+
+    profiler = Profiler()
+    client = KorapayClient(tracer=profiler)
+    client.get_balances()
+    print(profiler.format_report())
+    ```
+"""
+
+import threading
+import time
+from typing import Any, ContextManager
+
+from korapay_client.enums import RequestPhase
+from korapay_client.tracing import NoopTracer, Span, Tracer
+
+OTHER_PHASE = "other"
+
+_NOOP_TRACER = NoopTracer()
+
+
+class _Timing:
+    __slots__ = ("count", "wall", "cpu")
+
+    def __init__(self):
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def add(self, wall: float, cpu: float) -> None:
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "wall": self.wall, "cpu": self.cpu}
+
+
+class _MethodProfile:
+    __slots__ = ("calls", "errors", "phases")
+
+    def __init__(self):
+        self.calls = _Timing()
+        self.errors = 0
+        self.phases: dict[RequestPhase, _Timing] = {}
+
+
+class _PhaseTimer:
+    __slots__ = ("_span", "_phase", "_inner", "_wall", "_cpu")
+
+    def __init__(self, span: "_ProfiledSpan", phase: RequestPhase, inner):
+        self._span = span
+        self._phase = phase
+        self._inner = inner
+
+    def __enter__(self):
+        self._inner.__enter__()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        self._span.phases.append((self._phase, wall, cpu))
+        return self._inner.__exit__(exc_type, exc, traceback)
+
+
+class _ProfiledSpan(Span):
+    __slots__ = ("_profiler", "_name", "_inner", "_wall", "_cpu", "_failed", "phases")
+
+    def __init__(self, profiler: "Profiler", name: str, inner: Span):
+        self._profiler = profiler
+        self._name = name
+        self._inner = inner
+        self._failed = False
+        self.phases: list[tuple[RequestPhase, float, float]] = []
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def phase(self, phase: RequestPhase) -> ContextManager[None]:
+        return _PhaseTimer(self, phase, self._inner.phase(phase))
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._inner.set_attribute(key, value)
+
+    def record_error(self, error: BaseException) -> None:
+        self._failed = True
+        self._inner.record_error(error)
+
+    def end(self) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        self._profiler._record(self._name, wall, cpu, self.phases, self._failed)
+        self._inner.end()
+
+
+class Profiler(Tracer):
+    """A tracer accumulating the wall clock and CPU time of each phase of the client's calls.
+
+    One profiler can be shared by several clients. Profiling only reads the wall and CPU clocks
+    around each phase, so it is cheap enough to leave enabled in a staging environment.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.profiling import Profiler
+        from korapay_client.tracing import OpenTelemetryTracer
+
+        profiler = Profiler(tracer=OpenTelemetryTracer())
+        client = KorapayClient(tracer=profiler)
+        ```
+    """
+
+    def __init__(self, tracer: Tracer | None = None):
+        """
+        Args:
+            tracer: A tracer to forward the spans to, so calls can be traced and profiled at
+                the same time.
+        """
+        self._tracer = tracer
+        self._methods: dict[str, _MethodProfile] = {}
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Span:
+        inner = (self._tracer or _NOOP_TRACER).start_span(name, attributes)
+        return _ProfiledSpan(self, name, inner)
+
+    def reset(self) -> None:
+        """Discard all the recorded timings."""
+        with self._lock:
+            self._methods = {}
+
+    def report(self) -> dict[str, dict]:
+        """Return the recorded timings keyed by client method name.
+
+        Returns:
+            A dictionary of client method names to their timings in seconds. E.g.,
+            ```python
+            {
+                "CHARGE_VIA_CARD": {
+                    "calls": 2,
+                    "errors": 0,
+                    "wall": 0.5121,
+                    "cpu": 0.0034,
+                    "phases": {
+                        "validation": {"count": 2, "wall": 0.0002, "cpu": 0.0002},
+                        "serialization": {"count": 2, "wall": 0.0001, "cpu": 0.0001},
+                        "encryption": {"count": 2, "wall": 0.0012, "cpu": 0.0011},
+                        "headers": {"count": 2, "wall": 0.00001, "cpu": 0.00001},
+                        "network": {"count": 2, "wall": 0.5101, "cpu": 0.0015},
+                        "deserialization": {"count": 2, "wall": 0.0001, "cpu": 0.0001},
+                        "other": {"count": 2, "wall": 0.0004, "cpu": 0.0004},
+                    },
+                }
+            }
+            ```
+        """
+        with self._lock:
+            report = {}
+            for name, profile in self._methods.items():
+                phases = {
+                    phase.value: timing.to_dict()
+                    for phase, timing in sorted(
+                        profile.phases.items(),
+                        key=lambda item: _PHASE_ORDER[item[0]],
+                    )
+                }
+                phases[OTHER_PHASE] = {
+                    "count": profile.calls.count,
+                    "wall": max(
+                        profile.calls.wall
+                        - sum(timing.wall for timing in profile.phases.values()),
+                        0.0,
+                    ),
+                    "cpu": max(
+                        profile.calls.cpu
+                        - sum(timing.cpu for timing in profile.phases.values()),
+                        0.0,
+                    ),
+                }
+                report[name] = {
+                    "calls": profile.calls.count,
+                    "errors": profile.errors,
+                    "wall": profile.calls.wall,
+                    "cpu": profile.calls.cpu,
+                    "phases": phases,
+                }
+            return report
+
+    def format_report(self) -> str:
+        """Return the recorded timings as a human-readable table.
+
+        Mean times are per call in microseconds, and each phase's share is of its client
+        method's total wall clock time.
+        """
+        header = (
+            f"{'client method':<36} {'phase':<16} {'count':>7} {'wall µs':>12} "
+            f"{'cpu µs':>12} {'wall %':>7}"
+        )
+        lines = [header, "-" * len(header)]
+        for name, method in sorted(self.report().items()):
+            rows = [
+                (
+                    "total",
+                    {key: method[key] for key in ("wall", "cpu")},
+                    method["calls"],
+                )
+            ]
+            rows += [
+                (phase, timing, timing["count"])
+                for phase, timing in method["phases"].items()
+            ]
+            for phase, timing, count in rows:
+                share = timing["wall"] / method["wall"] * 100 if method["wall"] else 0.0
+                lines.append(
+                    f"{name:<36} {phase:<16} {count:>7} "
+                    f"{timing['wall'] / max(count, 1) * 1e6:>12.1f} "
+                    f"{timing['cpu'] / max(count, 1) * 1e6:>12.1f} {share:>7.1f}"
+                )
+        return "\n".join(lines)
+
+    def _record(
+        self,
+        name: str,
+        wall: float,
+        cpu: float,
+        phases: list[tuple[RequestPhase, float, float]],
+        failed: bool,
+    ) -> None:
+        with self._lock:
+            profile = self._methods.get(name)
+            if profile is None:
+                profile = self._methods[name] = _MethodProfile()
+            profile.calls.add(wall, cpu)
+            if failed:
+                profile.errors += 1
+            for phase, phase_wall, phase_cpu in phases:
+                timing = profile.phases.get(phase)
+                if timing is None:
+                    timing = profile.phases[phase] = _Timing()
+                timing.add(phase_wall, phase_cpu)
+
+
+_PHASE_ORDER = {phase: index for index, phase in enumerate(RequestPhase)}
@@ -0,0 +1,431 @@
+"""
+Reconciliation of a local ledger against Korapay.
+
+`Reconciler` and `AsyncReconciler` take a stream of `LedgerRecord`s, look each charge up with
+`get_charge` and each payout with `get_payout_transaction` concurrently, and report the
+`Discrepancy`s between the ledger and Korapay. `diff_records` compares a ledger with transactions
+already retrieved from Korapay, e.g., by `korapay_client.transaction_sync`, without any request.
+
+Records are processed in chunks. The records of a chunk and their Korapay transactions are joined
+through dictionaries keyed by kind and reference, so a chunk is compared in linear time and only
+one chunk of records and transactions is held in memory at a time. The kinds and references of the
+latest `duplicate_window` records are kept to report records duplicated across chunks, so a
+duplicate further apart than the window is not reported.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient, TransactionKind
+    from korapay_client.reconciliation import LedgerRecord, Reconciler
+
+    records = (
+        LedgerRecord(row.reference, TransactionKind.PAYOUT, row.amount, row.status)
+        for row in ledger.payouts_since(yesterday)
+    )
+    report = Reconciler(KorapayClient(), concurrency=16).run(records)
+    for discrepancy in report.discrepancies:
+        print(discrepancy.reference, discrepancy.type, discrepancy.local, discrepancy.remote)
+    ```
+"""
+
+import asyncio
+import itertools
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from korapay_client.enums import DiscrepancyType, TransactionKind
+
+if TYPE_CHECKING:
+    from korapay_client.clients import AsyncKorapayClient, KorapayClient
+    from korapay_client.models import Response
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_DUPLICATE_WINDOW = 1_000_000
+
+_RecordKey = tuple[TransactionKind, str]
+
+
+@dataclass(slots=True)
+class LedgerRecord:
+    """A transaction recorded in your ledger.
+
+    Attributes:
+        reference: The reference of the transaction.
+        kind: Whether the transaction is a charge or a payout.
+        amount: The amount of the transaction. Not compared when `None`.
+        status: The status of the transaction in Korapay's terms e.g., `success`. Not compared
+            when `None`.
+    """
+
+    reference: str
+    kind: TransactionKind
+    amount: Decimal | int | float | str | None = None
+    status: str | None = None
+
+
+@dataclass(slots=True)
+class Discrepancy:
+    """A difference between a ledger record and Korapay.
+
+    Attributes:
+        reference: The reference of the transaction.
+        type: The type of the difference.
+        local: The ledger record of the transaction. `None` for `DiscrepancyType.UNEXPECTED`.
+        remote: The transaction as returned by Korapay. `None` when it was not found or could
+            not be retrieved.
+        message: The error message of a failed lookup.
+    """
+
+    reference: str
+    type: DiscrepancyType
+    local: LedgerRecord | None = None
+    remote: dict | None = None
+    message: str | None = None
+
+
+@dataclass(slots=True)
+class ReconciliationReport:
+    """The result of a reconciliation.
+
+    Attributes:
+        records: The number of ledger records reconciled.
+        matched: The number of ledger records matching Korapay.
+        discrepancies: The differences found.
+    """
+
+    records: int = 0
+    matched: int = 0
+    discrepancies: list[Discrepancy] = field(default_factory=list)
+
+    @property
+    def counts(self) -> Counter:
+        """The number of discrepancies of each type."""
+        return Counter(discrepancy.type for discrepancy in self.discrepancies)
+
+
+def _decimal(value) -> Decimal | None:
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def compare(
+    record: LedgerRecord,
+    remote: dict,
+    status_map: dict[str, str] | None = None,
+) -> Discrepancy | None:
+    """Compare a ledger record with the transaction Korapay returned for it.
+
+    Args:
+        record: The ledger record.
+        remote: The transaction as returned by Korapay.
+        status_map: Translations of Korapay statuses to the statuses of your ledger.
+
+    Returns:
+        The first difference found, the amount before the status, or `None` when they match.
+    """
+    if record.amount is not None:
+        amount = _decimal(remote.get("amount"))
+        if amount is None or amount != _decimal(record.amount):
+            return Discrepancy(
+                record.reference, DiscrepancyType.AMOUNT_MISMATCH, record, remote
+            )
+    if record.status is not None:
+        status = remote.get("status")
+        if status_map:
+            status = status_map.get(status, status)
+        if str(status).lower() != record.status.lower():
+            return Discrepancy(
+                record.reference, DiscrepancyType.STATUS_MISMATCH, record, remote
+            )
+    return None
+
+
+def _chunks(records: Iterable[LedgerRecord], size: int) -> Iterator[list[LedgerRecord]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class _SeenWindow:
+    """The keys of the latest `size` records, forgetting the oldest first."""
+
+    __slots__ = ("_keys", "_order", "size")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._keys: set[_RecordKey] = set()
+        self._order: deque[_RecordKey] = deque()
+
+    def add(self, key: _RecordKey) -> bool:
+        """Add a key, returning `False` when it is already in the window."""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        self._order.append(key)
+        if len(self._order) > self.size:
+            self._keys.discard(self._order.popleft())
+        return True
+
+
+def _key(record: LedgerRecord) -> _RecordKey:
+    # A charge and a payout may share a reference.
+    return record.kind, record.reference
+
+
+def _index(
+    chunk: list[LedgerRecord], seen: _SeenWindow, discrepancies: list[Discrepancy]
+) -> dict[_RecordKey, LedgerRecord]:
+    index: dict[_RecordKey, LedgerRecord] = {}
+    for record in chunk:
+        key = _key(record)
+        if seen.add(key):
+            index[key] = record
+        else:
+            discrepancies.append(
+                Discrepancy(record.reference, DiscrepancyType.DUPLICATE, record)
+            )
+    return index
+
+
+def _join(
+    index: dict[_RecordKey, LedgerRecord],
+    remote: dict[_RecordKey, "Response | Exception"],
+    status_map: dict[str, str] | None,
+    discrepancies: list[Discrepancy],
+) -> int:
+    matched = 0
+    for key, record in index.items():
+        reference = record.reference
+        response = remote[key]
+        if isinstance(response, Exception):
+            discrepancies.append(
+                Discrepancy(
+                    reference,
+                    DiscrepancyType.LOOKUP_FAILED,
+                    record,
+                    message=str(response),
+                )
+            )
+        elif response.status_code == 404:
+            discrepancies.append(
+                Discrepancy(reference, DiscrepancyType.MISSING, record)
+            )
+        elif not response.status or not isinstance(response.data, dict):
+            discrepancies.append(
+                Discrepancy(
+                    reference,
+                    DiscrepancyType.LOOKUP_FAILED,
+                    record,
+                    message=response.message,
+                )
+            )
+        elif discrepancy := compare(record, response.data, status_map):
+            discrepancies.append(discrepancy)
+        else:
+            matched += 1
+    return matched
+
+
+class Reconciler:
+    """Reconciles ledger records with Korapay using a `KorapayClient` and a pool of threads."""
+
+    def __init__(
+        self,
+        client: "KorapayClient",
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        status_map: dict[str, str] | None = None,
+        duplicate_window: int = DEFAULT_DUPLICATE_WINDOW,
+    ):
+        """
+        Args:
+            client: The client to look transactions up with.
+            concurrency: The maximum number of lookups at a time.
+            chunk_size: The number of records processed at a time.
+            status_map: Translations of Korapay statuses to the statuses of your ledger.
+            duplicate_window: The number of latest records a record is checked against for
+                duplicates.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.status_map = status_map
+        self.duplicate_window = duplicate_window
+
+    def _lookup(
+        self, record: LedgerRecord
+    ) -> "tuple[_RecordKey, Response | Exception]":
+        try:
+            if record.kind is TransactionKind.PAYOUT:
+                return _key(record), self.client.get_payout_transaction(
+                    record.reference
+                )
+            return _key(record), self.client.get_charge(record.reference)
+        except Exception as error:
+            return _key(record), error
+
+    def iter_results(
+        self, records: Iterable[LedgerRecord]
+    ) -> Iterator[tuple[int, list[Discrepancy]]]:
+        """Reconcile records a chunk at a time, yielding the number of records matching Korapay
+        and the discrepancies of each chunk."""
+        seen = _SeenWindow(self.duplicate_window)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for chunk in _chunks(records, self.chunk_size):
+                discrepancies: list[Discrepancy] = []
+                index = _index(chunk, seen, discrepancies)
+                remote = dict(executor.map(self._lookup, index.values()))
+                matched = _join(index, remote, self.status_map, discrepancies)
+                yield matched, discrepancies
+
+    def iter_discrepancies(
+        self, records: Iterable[LedgerRecord]
+    ) -> Iterator[Discrepancy]:
+        """Reconcile records, yielding the discrepancies as each chunk is reconciled."""
+        for _, discrepancies in self.iter_results(records):
+            yield from discrepancies
+
+    def run(self, records: Iterable[LedgerRecord]) -> ReconciliationReport:
+        """Reconcile records, collecting the discrepancies in a report."""
+        report = ReconciliationReport()
+        for matched, discrepancies in self.iter_results(records):
+            report.records += matched + len(discrepancies)
+            report.matched += matched
+            report.discrepancies.extend(discrepancies)
+        return report
+
+
+class AsyncReconciler:
+    """Reconciles ledger records with Korapay using an `AsyncKorapayClient`."""
+
+    def __init__(
+        self,
+        client: "AsyncKorapayClient",
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        status_map: dict[str, str] | None = None,
+        duplicate_window: int = DEFAULT_DUPLICATE_WINDOW,
+    ):
+        """
+        Args:
+            client: The client to look transactions up with.
+            concurrency: The maximum number of lookups at a time.
+            chunk_size: The number of records processed at a time.
+            status_map: Translations of Korapay statuses to the statuses of your ledger.
+            duplicate_window: The number of latest records a record is checked against for
+                duplicates.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.status_map = status_map
+        self.duplicate_window = duplicate_window
+
+    async def _lookup(
+        self, semaphore: asyncio.Semaphore, record: LedgerRecord
+    ) -> "tuple[_RecordKey, Response | Exception]":
+        async with semaphore:
+            try:
+                if record.kind is TransactionKind.PAYOUT:
+                    return _key(record), await self.client.get_payout_transaction(
+                        record.reference
+                    )
+                return _key(record), await self.client.get_charge(record.reference)
+            except Exception as error:
+                return _key(record), error
+
+    async def iter_results(
+        self, records: Iterable[LedgerRecord] | AsyncIterable[LedgerRecord]
+    ) -> AsyncIterator[tuple[int, list[Discrepancy]]]:
+        """Reconcile records a chunk at a time, yielding the number of records matching Korapay
+        and the discrepancies of each chunk."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        seen = _SeenWindow(self.duplicate_window)
+        async for chunk in self._chunks(records):
+            discrepancies: list[Discrepancy] = []
+            index = _index(chunk, seen, discrepancies)
+            remote = dict(
+                await asyncio.gather(
+                    *(self._lookup(semaphore, record) for record in index.values())
+                )
+            )
+            matched = _join(index, remote, self.status_map, discrepancies)
+            yield matched, discrepancies
+
+    async def _chunks(
+        self, records: Iterable[LedgerRecord] | AsyncIterable[LedgerRecord]
+    ) -> AsyncIterator[list[LedgerRecord]]:
+        if not isinstance(records, AsyncIterable):
+            for chunk in _chunks(records, self.chunk_size):
+                yield chunk
+            return
+        chunk = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def iter_discrepancies(
+        self, records: Iterable[LedgerRecord] | AsyncIterable[LedgerRecord]
+    ) -> AsyncIterator[Discrepancy]:
+        """Reconcile records, yielding the discrepancies as each chunk is reconciled."""
+        async for _, discrepancies in self.iter_results(records):
+            for discrepancy in discrepancies:
+                yield discrepancy
+
+    async def run(
+        self, records: Iterable[LedgerRecord] | AsyncIterable[LedgerRecord]
+    ) -> ReconciliationReport:
+        """Reconcile records, collecting the discrepancies in a report."""
+        report = ReconciliationReport()
+        async for matched, discrepancies in self.iter_results(records):
+            report.records += matched + len(discrepancies)
+            report.matched += matched
+            report.discrepancies.extend(discrepancies)
+        return report
+
+
+def diff_records(
+    records: Iterable[LedgerRecord],
+    transactions: Iterable[dict],
+    status_map: dict[str, str] | None = None,
+    duplicate_window: int = DEFAULT_DUPLICATE_WINDOW,
+) -> Iterator[Discrepancy]:
+    """Compare ledger records with transactions already retrieved from Korapay.
+
+    The transactions are indexed by reference, then the records are streamed against the index,
+    so memory use is bounded by the number of transactions rather than records. Transactions
+    left unmatched are reported as `DiscrepancyType.UNEXPECTED` once every record is compared.
+
+    Args:
+        records: The ledger records.
+        transactions: The transactions as returned by Korapay, with a `reference`.
+        status_map: Translations of Korapay statuses to the statuses of your ledger.
+        duplicate_window: The number of latest records a record is checked against for
+            duplicates.
+
+    Returns:
+        An iterator of the discrepancies.
+    """
+    remote = {transaction["reference"]: transaction for transaction in transactions}
+    seen = _SeenWindow(duplicate_window)
+    for record in records:
+        if not seen.add(_key(record)):
+            yield Discrepancy(record.reference, DiscrepancyType.DUPLICATE, record)
+            continue
+        transaction = remote.pop(record.reference, None)
+        if transaction is None:
+            yield Discrepancy(record.reference, DiscrepancyType.MISSING, record)
+        elif discrepancy := compare(record, transaction, status_map):
+            yield discrepancy
+    for reference, transaction in remote.items():
+        yield Discrepancy(reference, DiscrepancyType.UNEXPECTED, remote=transaction)
@@ -0,0 +1,169 @@
+"""
+Fast generation of unique, time-ordered references for charges, virtual bank accounts and payouts.
+
+A reference is an optional prefix followed by 19 characters of Crockford's base32: the millisecond
+it was generated at, a random identifier of its generator and a sequence number. References of a
+generator sort in the order they were generated, and references of different generators collide
+only when they share a prefix, a millisecond, a generator identifier and a sequence number.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.enums import ClientMethod
+    from korapay_client.references import ReferenceGenerator
+
+    references = ReferenceGenerator(
+        prefixes={ClientMethod.PAYOUT_TO_BANK_ACCOUNT: "PO-", ClientMethod.CHARGE_VIA_CARD: "CC-"}
+    )
+    client = KorapayClient()
+    client.payout_to_bank_account(
+        reference=references.generate(ClientMethod.PAYOUT_TO_BANK_ACCOUNT), ...
+    )
+    ```
+"""
+
+import itertools
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+
+from korapay_client.enums import ClientMethod
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+"""Crockford's base32 alphabet, in ASCII order so encoded numbers sort like the numbers."""
+
+REFERENCE_LENGTH = 19
+"""The length of a reference without its prefix."""
+
+_TIME_LENGTH = 9
+_NODE_LENGTH = 4
+_SEQUENCE_BITS = 30
+_SEQUENCE_MASK = (1 << _SEQUENCE_BITS) - 1
+_PAIRS = [first + second for first in ALPHABET for second in ALPHABET]
+_PREFIX_PATTERN = re.compile(r"[A-Za-z0-9_\-]*")
+
+
+def _encode(number: int, length: int) -> str:
+    characters = []
+    for _ in range(length):
+        number, digit = divmod(number, 32)
+        characters.append(ALPHABET[digit])
+    return "".join(reversed(characters))
+
+
+def _decode(encoded: str) -> int:
+    number = 0
+    for character in encoded:
+        number = number * 32 + ALPHABET.index(character)
+    return number
+
+
+class ReferenceGenerator:
+    """Generates unique, time-ordered references.
+
+    Generators are thread safe. Use one generator per process, or per thread for the highest
+    throughput.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "",
+        prefixes: dict[ClientMethod, str] | None = None,
+    ):
+        """
+        Args:
+            prefix: The prefix of references generated without a client method, or for a client
+                method without a prefix in `prefixes`.
+            prefixes: The prefixes of the references generated for specific client methods.
+
+        Raises:
+            ValueError: When a prefix has characters other than letters, digits, `-` and `_`.
+        """
+        for value in (prefix, *(prefixes or {}).values()):
+            if not _PREFIX_PATTERN.fullmatch(value):
+                raise ValueError(
+                    f"Invalid reference prefix {value!r}. Prefixes may only contain letters, "
+                    "digits, '-' and '_'"
+                )
+        self.prefix = prefix
+        self.prefixes = dict(prefixes or {})
+        self._node = _encode(secrets.randbits(5 * _NODE_LENGTH), _NODE_LENGTH)
+        self._sequence = itertools.count(secrets.randbits(_SEQUENCE_BITS - 1))
+        # The last millisecond references were generated at, and its encoding with the node.
+        self._last: tuple[int, str] = (0, "")
+
+    def _time_and_node(self) -> str:
+        milliseconds = time.time_ns() // 1_000_000
+        last_milliseconds, encoded = self._last
+        if milliseconds <= last_milliseconds:
+            # Within the same millisecond, or the clock went back: keep the references ordered.
+            return encoded
+        encoded = _encode(milliseconds, _TIME_LENGTH) + self._node
+        self._last = (milliseconds, encoded)
+        return encoded
+
+    def generate(self, client_method: ClientMethod | None = None) -> str:
+        """Return a new reference.
+
+        Args:
+            client_method: The client method the reference is for, selecting its prefix.
+        """
+        sequence = next(self._sequence) & _SEQUENCE_MASK
+        return (
+            self.prefixes.get(client_method, self.prefix)
+            + self._time_and_node()
+            + _PAIRS[sequence >> 20]
+            + _PAIRS[(sequence >> 10) & 1023]
+            + _PAIRS[sequence & 1023]
+        )
+
+    __call__ = generate
+
+    def batch(self, count: int, client_method: ClientMethod | None = None) -> list[str]:
+        """Return `count` new references in order, e.g., for the payouts of a bulk payout.
+
+        Args:
+            count: The number of references to generate.
+            client_method: The client method the references are for, selecting their prefix.
+        """
+        head = self.prefixes.get(client_method, self.prefix) + self._time_and_node()
+        sequence = self._sequence
+        pairs = _PAIRS
+        references = []
+        append = references.append
+        for number in itertools.islice(sequence, count):
+            number &= _SEQUENCE_MASK
+            append(
+                head
+                + pairs[number >> 20]
+                + pairs[(number >> 10) & 1023]
+                + pairs[number & 1023]
+            )
+        return references
+
+    @staticmethod
+    def timestamp(reference: str) -> datetime:
+        """Return when a reference was generated, in UTC.
+
+        Raises:
+            ValueError: When `reference` was not generated by a `ReferenceGenerator`.
+        """
+        encoded = reference[-REFERENCE_LENGTH:][:_TIME_LENGTH]
+        if len(reference) < REFERENCE_LENGTH or any(
+            character not in ALPHABET for character in encoded
+        ):
+            raise ValueError(f"{reference!r} is not a generated reference")
+        return datetime.fromtimestamp(_decode(encoded) / 1000, tz=timezone.utc)
+
+
+_default_generator = ReferenceGenerator()
+
+
+def generate_reference(prefix: str = "") -> str:
+    """Return a new reference from a shared generator.
+
+    Args:
+        prefix: The prefix of the reference. It is not validated, unlike a generator's prefixes.
+    """
+    return prefix + _default_generator.generate()
@@ -0,0 +1,50 @@
+"""
+A local stand-in for the Korapay API, to test and load test code using the clients without
+calling the Korapay sandbox.
+
+`FakeKorapay` implements the endpoints used by the clients in memory. Serve it in-process with
+`FakeKorapayTransport`, over HTTP with `FakeKorapayServer` or any ASGI server with
+`FakeKorapayApp`, or run it as a standalone process with `python -m korapay_client.testing`.
+
+`RecordingTransport` records the interactions of a client with Korapay, or a fake, to a cassette
+and `ReplayTransport` replays them offline.
+"""
+
+from korapay_client.testing.asgi import FakeKorapayApp, create_app
+from korapay_client.testing.fake import FakeKorapay, FakeResponse, FaultInjection
+from korapay_client.testing.latency import (
+    LatencyDistribution,
+    exponential,
+    fixed,
+    lognormal,
+    parse_latency,
+    uniform,
+)
+from korapay_client.testing.recording import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    use_cassette,
+)
+from korapay_client.testing.server import FakeKorapayServer
+from korapay_client.testing.transport import FakeKorapayTransport
+
+__all__ = (
+    "FakeKorapay",
+    "FakeResponse",
+    "FaultInjection",
+    "FakeKorapayTransport",
+    "FakeKorapayServer",
+    "FakeKorapayApp",
+    "create_app",
+    "LatencyDistribution",
+    "fixed",
+    "uniform",
+    "exponential",
+    "lognormal",
+    "parse_latency",
+    "RecordingTransport",
+    "ReplayTransport",
+    "CassetteMissError",
+    "use_cassette",
+)
@@ -0,0 +1,69 @@
+"""Run a fake Korapay API server e.g.,
+
+```
+python -m korapay_client.testing --port 8000 --latency lognormal:0.15,0.5 --rate-limit-rate 0.01
+```
+
+and point the clients at it with `KorapayClient(base_url="http://127.0.0.1:8000")`.
+"""
+
+import argparse
+
+from korapay_client.testing.fake import FakeKorapay, FaultInjection
+from korapay_client.testing.latency import parse_latency
+from korapay_client.testing.server import FakeKorapayServer
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m korapay_client.testing",
+        description="Run a local stand-in for the Korapay API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency",
+        type=parse_latency,
+        help="The distribution of response delays in seconds e.g., fixed:0.1, "
+        "uniform:0.05,0.2, exponential:0.1 or lognormal:0.1,0.5",
+    )
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-delay", type=float, default=30.0)
+    parser.add_argument("--settlement-delay", type=float, default=0.0)
+    parser.add_argument("--public-key")
+    parser.add_argument("--secret-key")
+    parser.add_argument("--encryption-key")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    fake = FakeKorapay(
+        latency=args.latency,
+        faults=FaultInjection(
+            rate_limit_rate=args.rate_limit_rate,
+            server_error_rate=args.server_error_rate,
+            timeout_rate=args.timeout_rate,
+            timeout_delay=args.timeout_delay,
+        ),
+        public_key=args.public_key,
+        secret_key=args.secret_key,
+        encryption_key=args.encryption_key,
+        settlement_delay=args.settlement_delay,
+        seed=args.seed,
+    )
+    server = FakeKorapayServer(
+        fake, host=args.host, port=args.port, verbose=args.verbose
+    )
+    print(f"Serving a fake Korapay API at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import asyncio
+import json
+from urllib.parse import parse_qsl
+
+from korapay_client.testing.fake import FakeKorapay
+
+
+class FakeKorapayApp:
+    """An ASGI application serving requests from a `FakeKorapay`.
+
+    Serve it with any ASGI server to load test a service over real connections, e.g.,
+    `uvicorn --factory korapay_client.testing.asgi:create_app`. An injected timeout hangs the
+    request for the fault's `timeout_delay` and ends it without a response.
+    """
+
+    def __init__(self, fake: FakeKorapay | None = None):
+        """
+        Args:
+            fake: The fake to serve requests from. Defaults to a new `FakeKorapay`.
+        """
+        self.fake = fake or FakeKorapay()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        fake_response = self.fake.handle(
+            method=scope["method"],
+            path=scope["path"],
+            query=dict(parse_qsl(scope["query_string"].decode("latin-1"))),
+            headers={
+                name.decode("latin-1").lower(): value.decode("latin-1")
+                for name, value in scope["headers"]
+            },
+            body=body,
+        )
+        await asyncio.sleep(fake_response.delay)
+        if fake_response.timed_out:
+            return
+        content = json.dumps(fake_response.body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": fake_response.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()),
+                    *(
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in fake_response.headers.items()
+                    ),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+
+def create_app() -> FakeKorapayApp:
+    """Create a `FakeKorapayApp` with a default `FakeKorapay`, for ASGI servers' app factories."""
+    return FakeKorapayApp()
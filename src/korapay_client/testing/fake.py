@@ -0,0 +1,1051 @@
+import json
+import random
+import re
+import string
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Mapping, NamedTuple
+
+from korapay_client.enums import ClientMethod
+from korapay_client.testing.latency import LatencyDistribution
+
+SANDBOX_SUCCESSFUL_BANK_CODES = frozenset({"033", "044", "058"})
+"""Payouts to these banks succeed, as in the Korapay sandbox. Payouts to other banks fail."""
+
+DEFAULT_BALANCES = {
+    "NGN": 10_000_000,
+    "KES": 10_000_000,
+    "GHS": 10_000_000,
+    "USD": 100_000,
+}
+
+BANKS = {
+    "NG": [
+        ("Access Bank", "access-bank", "044"),
+        ("United Bank for Africa", "united-bank-for-africa", "033"),
+        ("Guaranty Trust Bank", "guaranty-trust-bank", "058"),
+        ("Wema Bank", "wema-bank", "035"),
+        ("Zenith Bank", "zenith-bank", "057"),
+        ("First Bank of Nigeria", "first-bank-of-nigeria", "011"),
+    ],
+    "KE": [
+        ("KCB Bank", "kcb-bank", "01"),
+        ("Equity Bank", "equity-bank", "68"),
+    ],
+    "GH": [
+        ("GCB Bank", "gcb-bank", "040100"),
+        ("Ecobank Ghana", "ecobank-ghana", "130100"),
+    ],
+}
+
+MOBILE_MONEY_OPERATORS = {
+    "KE": [
+        ("Safaricom Kenya", "safaricom-ke"),
+        ("Airtel Kenya", "airtel-ke"),
+    ],
+    "GH": [
+        ("MTN Ghana", "mtn-gh"),
+        ("Airtel Tigo Ghana", "airtel-tigo-gh"),
+        ("Vodafone Ghana", "vodafone-gh"),
+    ],
+}
+
+SERVER_ERROR_STATUS_CODES = (500, 502, 503)
+
+
+@dataclass(frozen=True)
+class FaultInjection:
+    """The rates at which a `FakeKorapay` fails requests instead of serving them.
+
+    Rate limited and server error responses are returned without processing the request. Timed
+    out requests are processed, e.g., a payout is made, but the response never arrives, which is
+    the ambiguous outcome a client has to recover from.
+
+    Attributes:
+        rate_limit_rate: The fraction of requests answered with a `429 Too Many Requests`.
+        server_error_rate: The fraction of requests answered with a 500, 502 or 503.
+        timeout_rate: The fraction of requests whose response never arrives.
+        timeout_delay: The number of seconds a timed out request hangs for, unless the client
+            gives up first.
+        retry_after: The `Retry-After` header of rate limited responses, in seconds.
+    """
+
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_delay: float = 30.0
+    retry_after: int = 1
+
+
+class FakeResponse(NamedTuple):
+    """A response of a `FakeKorapay`, to be sent after `delay` seconds.
+
+    When `timed_out` is `True` the response must be dropped after the delay.
+    """
+
+    status_code: int
+    body: dict
+    headers: dict[str, str]
+    delay: float
+    client_method: ClientMethod | None
+    timed_out: bool = False
+
+
+class _Route(NamedTuple):
+    method: str
+    pattern: re.Pattern
+    client_method: ClientMethod | None
+    handler: str
+    use_public_auth: bool = False
+
+
+def _route(
+    method: str,
+    path: str,
+    client_method: ClientMethod | None,
+    handler: str,
+    use_public_auth: bool = False,
+) -> _Route:
+    return _Route(
+        method,
+        re.compile(f"^{path}$"),
+        client_method,
+        handler,
+        use_public_auth,
+    )
+
+
+ROUTES = (
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/card",
+        ClientMethod.CHARGE_VIA_CARD,
+        "_charge_via_card",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/card/authorize",
+        ClientMethod.AUTHORIZE_CARD_CHARGE,
+        "_authorize_card_charge",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/card/resend-otp",
+        ClientMethod.RESEND_CARD_OTP,
+        "_resend_card_otp",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/bank-transfer",
+        ClientMethod.CHARGE_VIA_BANK_TRANSFER,
+        "_charge_via_bank_transfer",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/virtual-bank-account",
+        ClientMethod.CREATE_VIRTUAL_BANK_ACCOUNT,
+        "_create_virtual_bank_account",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/virtual-bank-account/transactions",
+        ClientMethod.GET_VIRTUAL_BANK_ACCOUNT_TRANSACTIONS,
+        "_get_virtual_bank_account_transactions",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/virtual-bank-account/sandbox/credit",
+        ClientMethod.CREDIT_SANDBOX_VIRTUAL_BANK_ACCOUNT,
+        "_credit_sandbox_virtual_bank_account",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/virtual-bank-account/(?P<account_reference>[^/]+)",
+        ClientMethod.GET_VIRTUAL_BANK_ACCOUNT,
+        "_get_virtual_bank_account",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/mobile-money",
+        ClientMethod.CHARGE_VIA_MOBILE_MONEY,
+        "_charge_via_mobile_money",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/mobile-money/authorize",
+        ClientMethod.AUTHORIZE_MOBILE_MONEY_CHARGE,
+        "_authorize_mobile_money_charge",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/mobile-money/resend-otp",
+        ClientMethod.RESEND_MOBILE_MONEY_OTP,
+        "_resend_mobile_money_otp",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/mobile-money/resend-stk",
+        ClientMethod.RESEND_STK,
+        "_resend_stk",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/mobile-money/sandbox/authorize-stk",
+        ClientMethod.AUTHORIZE_STK,
+        "_authorize_stk",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/charges/initialize",
+        ClientMethod.INITIATE_CHARGE,
+        "_initiate_charge",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/charges/(?P<reference>[^/]+)",
+        ClientMethod.GET_CHARGE,
+        "_get_charge",
+    ),
+    _route(
+        "POST",
+        "/merchant/api/v1/misc/banks/resolve",
+        ClientMethod.RESOLVE_BANK_ACCOUNT,
+        "_resolve_bank_account",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/balances",
+        ClientMethod.GET_BALANCES,
+        "_get_balances",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/misc/banks",
+        ClientMethod.GET_BANKS,
+        "_get_banks",
+        use_public_auth=True,
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/misc/mobile-money",
+        ClientMethod.GET_MMO,
+        "_get_mmo",
+        use_public_auth=True,
+    ),
+    # Payouts to bank accounts and mobile money share an endpoint, the client method is
+    # resolved from the payout's destination type.
+    _route(
+        "POST",
+        "/merchant/api/v1/transactions/disburse",
+        None,
+        "_payout",
+    ),
+    _route(
+        "POST",
+        "/api/v1/transactions/disburse/bulk",
+        ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT,
+        "_bulk_payout_to_bank_account",
+    ),
+    _route(
+        "GET",
+        "/api/v1/transactions/bulk/(?P<bulk_reference>[^/]+)/payout",
+        ClientMethod.GET_PAYOUTS,
+        "_get_payouts",
+    ),
+    _route(
+        "GET",
+        "/api/v1/transactions/bulk/(?P<bulk_reference>[^/]+)",
+        ClientMethod.GET_BULK_TRANSACTION,
+        "_get_bulk_transaction",
+    ),
+    _route(
+        "GET",
+        "/merchant/api/v1/transactions/(?P<transaction_reference>[^/]+)",
+        ClientMethod.VERIFY_PAYOUT_TRANSACTION,
+        "_get_payout_transaction",
+    ),
+)
+
+
+class _HandlerError(Exception):
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _amount(value) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except ArithmeticError:
+        raise _HandlerError(400, f"Invalid amount: {value!r}")
+
+
+def _number(amount: Decimal) -> int | float:
+    return int(amount) if amount == amount.to_integral_value() else float(amount)
+
+
+class FakeKorapay:
+    """An in-memory stand-in for the Korapay API.
+
+    It serves every endpoint used by the clients, keeps track of the charges, virtual bank
+    accounts, payouts and balances created through it, delays responses by configurable latency
+    distributions and injects rate limiting, server errors and timeouts. Serve it to the clients
+    with `FakeKorapayTransport`, to any ASGI server with `FakeKorapayApp` or as a standalone
+    process with `python -m korapay_client.testing`.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.testing import FakeKorapay, FakeKorapayTransport, FaultInjection, lognormal
+
+        fake = FakeKorapay(
+            latency=lognormal(median=0.15, sigma=0.5),
+            faults=FaultInjection(rate_limit_rate=0.01, server_error_rate=0.005),
+        )
+        client = KorapayClient(transport=FakeKorapayTransport(fake))
+        client.get_balances()
+        print(fake.requests)
+        ```
+    """
+
+    def __init__(
+        self,
+        latency: LatencyDistribution | None = None,
+        endpoint_latency: dict[ClientMethod, LatencyDistribution] | None = None,
+        faults: FaultInjection | None = None,
+        endpoint_faults: dict[ClientMethod, FaultInjection] | None = None,
+        balances: dict[str, int | float | Decimal] | None = None,
+        public_key: str | None = None,
+        secret_key: str | None = None,
+        encryption_key: str | None = None,
+        settlement_delay: float = 0.0,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            latency: The distribution of the delay of every response. Responses are not delayed
+                by default.
+            endpoint_latency: Latency distributions for specific client methods, overriding
+                `latency`.
+            faults: The rates of the errors injected into every endpoint. No errors are injected
+                by default.
+            endpoint_faults: Error rates for specific client methods, overriding `faults`.
+            balances: The initial available balance of each currency.
+            public_key: The public key requests must be authorized with. Any key is accepted
+                when it is not provided.
+            secret_key: The secret key requests must be authorized with. Any key is accepted
+                when it is not provided.
+            encryption_key: The encryption key of card charges. Card charges are decrypted to
+                track their reference and amount when it is provided.
+            settlement_delay: The number of seconds payouts stay `processing` before they
+                succeed or fail.
+            seed: The seed of the random number generator, for reproducible latencies, errors
+                and references.
+            clock: The monotonic clock payout settlement is timed with.
+        """
+        self._latency = latency
+        self._endpoint_latency = endpoint_latency or {}
+        self._faults = faults or FaultInjection()
+        self._endpoint_faults = endpoint_faults or {}
+        self._initial_balances = {
+            currency: _amount(balance)
+            for currency, balance in (balances or DEFAULT_BALANCES).items()
+        }
+        self._public_key = public_key
+        self._secret_key = secret_key
+        self._encryptor = None
+        if encryption_key:
+            from korapay_client.utils import AES256Encryptor
+
+            self._encryptor = AES256Encryptor(encryption_key)
+        self._settlement_delay = settlement_delay
+        self._seed = seed
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all the state and request counts of the fake."""
+        with self._lock:
+            self._rng = random.Random(self._seed)
+            self.requests: Counter[ClientMethod] = Counter()
+            self.errors: Counter[ClientMethod] = Counter()
+            self.balances = {
+                currency: {"available_balance": balance, "pending_balance": Decimal(0)}
+                for currency, balance in self._initial_balances.items()
+            }
+            self.charges: dict[str, dict] = {}
+            self.virtual_bank_accounts: dict[str, dict] = {}
+            self.payouts: dict[str, dict] = {}
+            self.bulk_payouts: dict[str, dict] = {}
+            self._card_charges_by_transaction_reference: dict[str, dict] = {}
+            self._virtual_bank_accounts_by_number: dict[str, dict] = {}
+            self._payout_settles_at: dict[str, float] = {}
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Mapping[str, str],
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> FakeResponse:
+        """Serve a request to the Korapay API.
+
+        Args:
+            method: The HTTP method of the request e.g., `POST`.
+            path: The path of the request's URL.
+            query: The query parameters of the request's URL.
+            headers: The headers of the request, with lowercase names.
+            body: The raw body of the request.
+
+        Returns:
+            The response to send and the number of seconds to delay it by.
+        """
+        with self._lock:
+            route, path_parameters = self._match(method.upper(), path)
+            if route is None:
+                return self._respond(
+                    None, 404, {"status": False, "message": "Not found"}
+                )
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                return self._respond(
+                    route.client_method,
+                    400,
+                    {"status": False, "message": "Invalid JSON request body"},
+                )
+            if not isinstance(data, dict):
+                return self._respond(
+                    route.client_method,
+                    400,
+                    {"status": False, "message": "Invalid request body"},
+                )
+            client_method = route.client_method or self._payout_client_method(data)
+            self.requests[client_method] += 1
+
+            expected_key = (
+                self._public_key if route.use_public_auth else self._secret_key
+            )
+            authorization = headers.get("authorization", "")
+            if not authorization.startswith("Bearer ") or (
+                expected_key is not None and authorization != f"Bearer {expected_key}"
+            ):
+                return self._respond(
+                    client_method,
+                    401,
+                    {"status": False, "message": "Invalid authorization key"},
+                )
+
+            faults = self._endpoint_faults.get(client_method, self._faults)
+            roll = self._rng.random()
+            if roll < faults.rate_limit_rate:
+                return self._respond(
+                    client_method,
+                    429,
+                    {"status": False, "message": "Too many requests"},
+                    headers={"Retry-After": str(faults.retry_after)},
+                )
+            if roll < faults.rate_limit_rate + faults.server_error_rate:
+                return self._respond(
+                    client_method,
+                    self._rng.choice(SERVER_ERROR_STATUS_CODES),
+                    {"status": False, "message": "Internal server error"},
+                )
+            timed_out = self._rng.random() < faults.timeout_rate
+
+            try:
+                message, response_data = getattr(self, route.handler)(
+                    data, query, **path_parameters
+                )
+            except _HandlerError as error:
+                status_code, response_body = (
+                    error.status_code,
+                    {"status": False, "message": error.message},
+                )
+            else:
+                status_code, response_body = (
+                    200,
+                    {"status": True, "message": message, "data": response_data},
+                )
+            if timed_out:
+                return self._respond(
+                    client_method,
+                    status_code,
+                    response_body,
+                    delay=faults.timeout_delay,
+                    timed_out=True,
+                )
+            return self._respond(client_method, status_code, response_body)
+
+    def _match(self, method: str, path: str) -> tuple[_Route | None, dict[str, str]]:
+        for route in ROUTES:
+            if route.method != method:
+                continue
+            match = route.pattern.match(path)
+            if match:
+                return route, match.groupdict()
+        return None, {}
+
+    def _respond(
+        self,
+        client_method: ClientMethod | None,
+        status_code: int,
+        body: dict,
+        headers: dict[str, str] | None = None,
+        delay: float | None = None,
+        timed_out: bool = False,
+    ) -> FakeResponse:
+        if client_method is not None and (status_code >= 400 or timed_out):
+            self.errors[client_method] += 1
+        if delay is None:
+            latency = self._endpoint_latency.get(client_method, self._latency)
+            delay = max(latency(self._rng), 0.0) if latency else 0.0
+        return FakeResponse(
+            status_code=status_code,
+            body=body,
+            headers=headers or {},
+            delay=delay,
+            client_method=client_method,
+            timed_out=timed_out,
+        )
+
+    @staticmethod
+    def _payout_client_method(data: dict) -> ClientMethod:
+        destination = data.get("destination")
+        if isinstance(destination, dict) and destination.get("type") == "mobile_money":
+            return ClientMethod.PAYOUT_TO_MOBILE_MONEY
+        return ClientMethod.PAYOUT_TO_BANK_ACCOUNT
+
+    def _identifier(self, prefix: str) -> str:
+        suffix = "".join(
+            self._rng.choices(string.ascii_uppercase + string.digits, k=12)
+        )
+        return f"{prefix}-{suffix}"
+
+    def _account_number(self) -> str:
+        return "".join(self._rng.choices(string.digits, k=10))
+
+    @staticmethod
+    def _require(data: dict, *fields: str) -> None:
+        missing = [field for field in fields if data.get(field) in (None, "")]
+        if missing:
+            raise _HandlerError(400, f"{', '.join(missing)} is required")
+
+    @staticmethod
+    def _require_objects(data: dict, *fields: str) -> None:
+        invalid = [
+            field
+            for field in fields
+            if data.get(field) is not None and not isinstance(data[field], dict)
+        ]
+        if invalid:
+            raise _HandlerError(400, f"{', '.join(invalid)} must be an object")
+
+    def _new_charge(self, reference: str, channel: str, data: dict, **fields) -> dict:
+        if reference in self.charges:
+            raise _HandlerError(400, "Duplicate payment reference")
+        charge = {
+            "reference": reference,
+            "status": "processing",
+            "channel": channel,
+            "amount": _number(_amount(data.get("amount", 0))),
+            "fee": 0,
+            "currency": data.get("currency"),
+            "description": data.get("narration") or data.get("description"),
+            "customer": data.get("customer"),
+            "metadata": data.get("metadata"),
+            "created_at": _now(),
+            **fields,
+        }
+        self.charges[reference] = charge
+        return charge
+
+    def _get_charge_or_404(self, reference: str) -> dict:
+        charge = self.charges.get(reference)
+        if charge is None:
+            raise _HandlerError(404, "Charge not found")
+        return charge
+
+    def _charge_via_card(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "charge_data")
+        payload = {}
+        if self._encryptor is not None:
+            try:
+                payload = self._encryptor.decrypt(data["charge_data"])
+            except ValueError:
+                raise _HandlerError(400, "Unable to decrypt charge data")
+            if not isinstance(payload, dict):
+                raise _HandlerError(400, "Invalid charge data")
+            self._require_objects(payload, "card", "customer")
+        card = payload.get("card") or {}
+        charge = self._new_charge(
+            payload.get("reference") or self._identifier("ref"),
+            "card",
+            payload,
+            transaction_reference=self._identifier("KPY-CA"),
+            auth_model="OTP" if card.get("pin") else "PIN",
+        )
+        self._card_charges_by_transaction_reference[charge["transaction_reference"]] = (
+            charge
+        )
+        return "Charge in progress", {
+            "transaction_reference": charge["transaction_reference"],
+            "payment_reference": charge["reference"],
+            "status": charge["status"],
+            "amount": charge["amount"],
+            "amount_charged": charge["amount"],
+            "currency": charge["currency"],
+            "authorization": {"mode": charge["auth_model"]},
+        }
+
+    def _get_card_charge_or_404(self, transaction_reference: str) -> dict:
+        charge = self._card_charges_by_transaction_reference.get(transaction_reference)
+        if charge is None:
+            raise _HandlerError(404, "Transaction not found")
+        return charge
+
+    def _authorize_card_charge(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "transaction_reference", "authorization")
+        self._require_objects(data, "authorization")
+        charge = self._get_card_charge_or_404(data["transaction_reference"])
+        authorization = data["authorization"]
+        if charge["auth_model"] == "PIN" and authorization.get("pin"):
+            charge["auth_model"] = "OTP"
+        else:
+            charge["status"] = "success"
+        response = {
+            "transaction_reference": charge["transaction_reference"],
+            "payment_reference": charge["reference"],
+            "status": charge["status"],
+            "amount": charge["amount"],
+            "amount_charged": charge["amount"],
+            "currency": charge["currency"],
+        }
+        if charge["status"] != "success":
+            response["authorization"] = {"mode": charge["auth_model"]}
+        return "Charge in progress", response
+
+    def _resend_card_otp(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "transaction_reference")
+        charge = self._get_card_charge_or_404(data["transaction_reference"])
+        return "OTP resent", {
+            "transaction_reference": charge["transaction_reference"],
+            "authorization": {"mode": "OTP"},
+        }
+
+    def _charge_via_bank_transfer(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "reference", "amount", "currency", "customer")
+        self._require_objects(data, "customer")
+        charge = self._new_charge(
+            data["reference"],
+            "bank_transfer",
+            data,
+            bank_account={
+                "account_name": data.get("account_name")
+                or (data["customer"].get("name") or "Korapay Checkout"),
+                "account_number": self._account_number(),
+                "bank_name": "Wema Bank",
+                "bank_code": "035",
+            },
+        )
+        return "Bank transfer initiated successfully", {
+            "currency": charge["currency"],
+            "amount": charge["amount"],
+            "amount_expected": charge["amount"],
+            "fee": charge["fee"],
+            "vat": 0,
+            "reference": self._identifier("KPY-C"),
+            "payment_reference": charge["reference"],
+            "status": charge["status"],
+            "narration": charge["description"],
+            "bank_account": charge["bank_account"],
+            "customer": charge["customer"],
+        }
+
+    def _create_virtual_bank_account(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "account_name", "account_reference", "bank_code", "kyc")
+        self._require_objects(data, "customer", "kyc")
+        self._require(data["kyc"], "bvn")
+        if data["account_reference"] in self.virtual_bank_accounts:
+            raise _HandlerError(400, "Account reference has already been used")
+        account = {
+            "account_name": data["account_name"],
+            "account_number": self._account_number(),
+            "bank_code": data["bank_code"],
+            "bank_name": "Wema Bank",
+            "account_reference": data["account_reference"],
+            "unique_id": self._identifier("KPY-VA"),
+            "account_status": "active",
+            "created_at": _now(),
+            "currency": "NGN",
+            "customer": data.get("customer"),
+        }
+        self.virtual_bank_accounts[account["account_reference"]] = account
+        self._virtual_bank_accounts_by_number[account["account_number"]] = {
+            "account": account,
+            "transactions": [],
+        }
+        return "Virtual bank account created successfully", account
+
+    def _get_virtual_bank_account(
+        self, data: dict, query, account_reference: str
+    ) -> tuple[str, dict]:
+        account = self.virtual_bank_accounts.get(account_reference)
+        if account is None:
+            raise _HandlerError(404, "Virtual bank account not found")
+        return "Virtual bank account retrieved successfully", account
+
+    def _get_virtual_bank_account_by_number(self, account_number: str | None) -> dict:
+        entry = self._virtual_bank_accounts_by_number.get(account_number)
+        if entry is None:
+            raise _HandlerError(404, "Virtual bank account not found")
+        return entry
+
+    def _get_virtual_bank_account_transactions(
+        self, data: dict, query
+    ) -> tuple[str, dict]:
+        entry = self._get_virtual_bank_account_by_number(query.get("account_number"))
+        start_date, end_date = query.get("start_date"), query.get("end_date")
+        transactions = [
+            transaction
+            for transaction in entry["transactions"]
+            if (start_date is None or transaction["date"][:10] >= start_date)
+            and (end_date is None or transaction["date"][:10] <= end_date)
+        ]
+        data = {
+            "total_amount_received": _number(
+                sum((_amount(item["amount"]) for item in transactions), Decimal(0))
+            ),
+            "account_number": entry["account"]["account_number"],
+            "currency": entry["account"]["currency"],
+        }
+        if "page" in query or "limit" in query:
+            try:
+                page = int(query.get("page", 1))
+                limit = int(query.get("limit", 20))
+            except ValueError:
+                raise _HandlerError(400, "page and limit must be integers")
+            if page < 1 or limit < 1:
+                raise _HandlerError(400, "page and limit must be positive")
+            data["pagination"] = {
+                "page": page,
+                "limit": limit,
+                "total_items": len(transactions),
+                "total_pages": max(1, -(-len(transactions) // limit)),
+            }
+            transactions = transactions[(page - 1) * limit : page * limit]
+        data["transactions"] = transactions
+        return "Virtual bank account transactions retrieved successfully", data
+
+    def _credit_sandbox_virtual_bank_account(
+        self, data: dict, query
+    ) -> tuple[str, dict]:
+        self._require(data, "account_number", "amount", "currency")
+        entry = self._get_virtual_bank_account_by_number(data["account_number"])
+        transaction = {
+            "reference": self._identifier("KPY-PAY"),
+            "status": "success",
+            "amount": _number(_amount(data["amount"])),
+            "fee": 0,
+            "currency": data["currency"],
+            "description": "Sandbox credit",
+            "date": _now(),
+        }
+        entry["transactions"].append(transaction)
+        return "Virtual bank account credited successfully", transaction
+
+    def _charge_via_mobile_money(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "reference", "amount", "currency", "mobile_money")
+        self._require_objects(data, "mobile_money", "customer")
+        charge = self._new_charge(
+            data["reference"],
+            "mobile_money",
+            data,
+            auth_model="OTP",
+            mobile_number=data["mobile_money"].get("number"),
+        )
+        return "Charge in progress", {
+            "amount": charge["amount"],
+            "amount_expected": charge["amount"],
+            "auth_model": charge["auth_model"],
+            "currency": charge["currency"],
+            "fee": charge["fee"],
+            "reference": charge["reference"],
+            "status": charge["status"],
+        }
+
+    def _get_mobile_money_charge_or_404(self, reference: str | None) -> dict:
+        charge = self.charges.get(reference)
+        if charge is None or charge["channel"] != "mobile_money":
+            raise _HandlerError(404, "Transaction not found")
+        return charge
+
+    def _authorize_mobile_money_charge(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "reference", "token")
+        charge = self._get_mobile_money_charge_or_404(data["reference"])
+        charge["auth_model"] = "STK_PROMPT"
+        return "Charge in progress", {
+            "amount": charge["amount"],
+            "auth_model": charge["auth_model"],
+            "currency": charge["currency"],
+            "reference": charge["reference"],
+            "status": charge["status"],
+        }
+
+    def _resend_mobile_money_otp(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "transaction_reference")
+        charge = self._get_mobile_money_charge_or_404(data["transaction_reference"])
+        return "OTP resent", {"reference": charge["reference"], "auth_model": "OTP"}
+
+    def _resend_stk(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "transaction_reference")
+        charge = self._get_mobile_money_charge_or_404(data["transaction_reference"])
+        return "STK prompt resent", {
+            "reference": charge["reference"],
+            "auth_model": "STK_PROMPT",
+        }
+
+    def _authorize_stk(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "reference", "pin")
+        charge = self._get_mobile_money_charge_or_404(data["reference"])
+        charge["status"] = "success"
+        return "Charge successful", {
+            "amount": charge["amount"],
+            "currency": charge["currency"],
+            "reference": charge["reference"],
+            "status": charge["status"],
+        }
+
+    def _initiate_charge(self, data: dict, query) -> tuple[str, dict]:
+        self._require(
+            data, "reference", "amount", "currency", "notification_url", "customer"
+        )
+        self._require_objects(data, "customer")
+        charge = self._new_charge(data["reference"], "checkout", data)
+        charge["status"] = "pending"
+        return "Charge created successfully", {
+            "reference": charge["reference"],
+            "checkout_url": f"https://checkout.korapay.com/{charge['reference']}/pay",
+        }
+
+    def _get_charge(self, data: dict, query, reference: str) -> tuple[str, dict]:
+        charge = self._get_charge_or_404(reference)
+        return "Charge retrieved successfully", {
+            "reference": charge["reference"],
+            "status": charge["status"],
+            "amount": charge["amount"],
+            "amount_paid": charge["amount"] if charge["status"] == "success" else 0,
+            "fee": charge["fee"],
+            "currency": charge["currency"],
+            "description": charge["description"],
+            "customer": charge["customer"],
+            "metadata": charge["metadata"],
+        }
+
+    def _resolve_bank_account(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "bank", "account")
+        for country_banks in BANKS.values():
+            for name, _, code in country_banks:
+                if code == data["bank"]:
+                    return "Request completed", {
+                        "bank_name": name,
+                        "bank_code": code,
+                        "account_number": data["account"],
+                        "account_name": "John Doe",
+                    }
+        raise _HandlerError(400, "Invalid bank code")
+
+    def _get_balances(self, data: dict, query) -> tuple[str, dict]:
+        return "Successful", {
+            currency: {
+                "pending_balance": _number(balance["pending_balance"]),
+                "available_balance": _number(balance["available_balance"]),
+            }
+            for currency, balance in self.balances.items()
+        }
+
+    def _get_banks(self, data: dict, query) -> tuple[str, list]:
+        country = query.get("countryCode", "")
+        return "Successful", [
+            {"name": name, "slug": slug, "code": code, "country": country}
+            for name, slug, code in BANKS.get(country, [])
+        ]
+
+    def _get_mmo(self, data: dict, query) -> tuple[str, list]:
+        country = query.get("countryCode", "")
+        return "Successful", [
+            {"name": name, "code": code, "country": country}
+            for name, code in MOBILE_MONEY_OPERATORS.get(country, [])
+        ]
+
+    def _debit(self, currency: str | None, amount: Decimal) -> None:
+        balance = self.balances.get(currency)
+        if balance is None:
+            raise _HandlerError(400, f"Invalid currency: {currency}")
+        if balance["available_balance"] < amount:
+            raise _HandlerError(400, "Insufficient funds in disbursement wallet")
+        balance["available_balance"] -= amount
+
+    def _new_payout(
+        self,
+        reference: str,
+        destination: dict,
+        currency: str,
+        bulk_reference: str | None = None,
+    ) -> dict:
+        if reference in self.payouts:
+            raise _HandlerError(400, "Duplicate payout reference")
+        if destination.get("type") == "mobile_money":
+            succeeds = True
+        else:
+            bank_account = destination.get("bank_account") or {}
+            bank_code = bank_account.get("bank") or bank_account.get("bank_code")
+            succeeds = bank_code in SANDBOX_SUCCESSFUL_BANK_CODES
+        payout = {
+            "reference": reference,
+            "status": "processing",
+            "amount": _number(_amount(destination.get("amount", 0))),
+            "fee": 0,
+            "currency": currency,
+            "narration": destination.get("narration"),
+            "customer": destination.get("customer"),
+            "bulk_reference": bulk_reference,
+            "created_at": _now(),
+            "_succeeds": succeeds,
+        }
+        self.payouts[reference] = payout
+        self._payout_settles_at[reference] = self._clock() + self._settlement_delay
+        return payout
+
+    def _settle(self, payout: dict) -> dict:
+        if payout["status"] == "processing" and (
+            self._clock() >= self._payout_settles_at[payout["reference"]]
+        ):
+            if payout["_succeeds"]:
+                payout["status"] = "success"
+            else:
+                payout["status"] = "failed"
+                self.balances[payout["currency"]]["available_balance"] += _amount(
+                    payout["amount"]
+                )
+        return {key: value for key, value in payout.items() if key[0] != "_"}
+
+    def _payout(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "reference", "destination")
+        self._require_objects(data, "destination")
+        destination = data["destination"]
+        self._require(destination, "amount", "currency")
+        self._require_objects(destination, "bank_account", "mobile_money", "customer")
+        if data["reference"] in self.payouts:
+            raise _HandlerError(400, "Duplicate payout reference")
+        self._debit(destination["currency"], _amount(destination["amount"]))
+        payout = self._new_payout(
+            data["reference"], destination, destination["currency"]
+        )
+        return "Transfer initiated successfully", {
+            key: payout[key]
+            for key in (
+                "amount",
+                "fee",
+                "currency",
+                "status",
+                "reference",
+                "narration",
+                "customer",
+            )
+        }
+
+    def _bulk_payout_to_bank_account(self, data: dict, query) -> tuple[str, dict]:
+        self._require(data, "batch_reference", "currency", "payouts")
+        if not isinstance(data["payouts"], list) or not all(
+            isinstance(payout, dict) for payout in data["payouts"]
+        ):
+            raise _HandlerError(400, "payouts must be a list of objects")
+        for payout in data["payouts"]:
+            self._require_objects(payout, "bank_account", "customer")
+        if data["batch_reference"] in self.bulk_payouts:
+            raise _HandlerError(400, "Duplicate batch reference")
+        references = [payout.get("reference") for payout in data["payouts"]]
+        if len(set(references)) != len(references) or any(
+            reference in self.payouts for reference in references
+        ):
+            raise _HandlerError(400, "Duplicate payout reference")
+        total = sum(
+            (_amount(payout.get("amount", 0)) for payout in data["payouts"]),
+            Decimal(0),
+        )
+        self._debit(data["currency"], total)
+        for payout in data["payouts"]:
+            self._new_payout(
+                payout["reference"],
+                payout,
+                data["currency"],
+                bulk_reference=data["batch_reference"],
+            )
+        bulk_payout = {
+            "reference": data["batch_reference"],
+            "description": data.get("description"),
+            "merchant_bears_cost": data.get("merchant_bears_cost", False),
+            "currency": data["currency"],
+            "total_chargeable_amount": _number(total),
+            "references": references,
+            "created_at": _now(),
+        }
+        self.bulk_payouts[bulk_payout["reference"]] = bulk_payout
+        return "Bulk transfer initiated successfully", {
+            "status": "pending",
+            "total_chargeable_amount": bulk_payout["total_chargeable_amount"],
+            "merchant_bears_cost": bulk_payout["merchant_bears_cost"],
+            "reference": bulk_payout["reference"],
+            "currency": bulk_payout["currency"],
+        }
+
+    def _get_bulk_payout_or_404(self, bulk_reference: str) -> dict:
+        bulk_payout = self.bulk_payouts.get(bulk_reference)
+        if bulk_payout is None:
+            raise _HandlerError(404, "Bulk transaction not found")
+        return bulk_payout
+
+    def _get_payouts(self, data: dict, query, bulk_reference: str) -> tuple[str, list]:
+        bulk_payout = self._get_bulk_payout_or_404(bulk_reference)
+        return "Payouts retrieved successfully", [
+            self._settle(self.payouts[reference])
+            for reference in bulk_payout["references"]
+        ]
+
+    def _get_bulk_transaction(
+        self, data: dict, query, bulk_reference: str
+    ) -> tuple[str, dict]:
+        bulk_payout = self._get_bulk_payout_or_404(bulk_reference)
+        statuses = [
+            self._settle(self.payouts[reference])["status"]
+            for reference in bulk_payout["references"]
+        ]
+        return "Bulk transaction retrieved successfully", {
+            "reference": bulk_payout["reference"],
+            "status": "pending" if "processing" in statuses else "complete",
+            "total_chargeable_amount": bulk_payout["total_chargeable_amount"],
+            "merchant_bears_cost": bulk_payout["merchant_bears_cost"],
+            "description": bulk_payout["description"],
+            "currency": bulk_payout["currency"],
+            "created_at": bulk_payout["created_at"],
+        }
+
+    def _get_payout_transaction(
+        self, data: dict, query, transaction_reference: str
+    ) -> tuple[str, dict]:
+        payout = self.payouts.get(transaction_reference)
+        if payout is None:
+            raise _HandlerError(404, "Transaction not found")
+        return "Transaction retrieved successfully", self._settle(payout)
@@ -0,0 +1,61 @@
+import math
+import random
+from typing import Callable
+
+LatencyDistribution = Callable[[random.Random], float]
+"""A callable returning a latency in seconds, drawn with the given random number generator."""
+
+
+def fixed(seconds: float) -> LatencyDistribution:
+    """Every response is delayed by `seconds`."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    """Responses are delayed by between `low` and `high` seconds, uniformly distributed."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential(mean: float) -> LatencyDistribution:
+    """Response delays are exponentially distributed with the given mean in seconds."""
+    return lambda rng: rng.expovariate(1 / mean) if mean > 0 else 0.0
+
+
+def lognormal(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Response delays are log-normally distributed, the usual shape of API latencies.
+
+    Args:
+        median: The median delay in seconds.
+        sigma: The standard deviation of the delay's natural logarithm. Larger values give a
+            longer tail e.g., with `sigma=0.5` the 99th percentile is about 3.2 times the median.
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_latency(spec: str) -> LatencyDistribution:
+    """Parse a latency distribution from the command line e.g., `fixed:0.1`, `uniform:0.05,0.2`,
+    `exponential:0.1` or `lognormal:0.1,0.5`.
+
+    Raises:
+        ValueError: When `spec` is not a valid latency distribution.
+    """
+    distributions = {
+        "fixed": fixed,
+        "uniform": uniform,
+        "exponential": exponential,
+        "lognormal": lognormal,
+    }
+    name, _, arguments = spec.partition(":")
+    if name not in distributions:
+        raise ValueError(
+            f"Unknown latency distribution {name!r}, expected one of {', '.join(distributions)}"
+        )
+    try:
+        return distributions[name](
+            *(float(argument) for argument in arguments.split(",") if argument)
+        )
+    except TypeError as error:
+        raise ValueError(
+            f"Invalid arguments for {name} latency: {arguments!r}"
+        ) from error
@@ -0,0 +1,272 @@
+import gzip
+import json
+import threading
+from collections import defaultdict, deque
+from typing import IO, Iterable
+
+import httpx
+
+CASSETTE_VERSION = 1
+SCRUBBED = "<scrubbed>"
+
+DEFAULT_SCRUBBED_FIELDS = frozenset(
+    {"charge_data", "bvn", "nin", "pin", "otp", "cvv", "token"}
+)
+"""Request and response body fields whose values are never written to cassettes."""
+
+RECORDED_RESPONSE_HEADERS = frozenset({"content-type", "retry-after"})
+
+
+class CassetteMissError(LookupError):
+    """Raised by a `ReplayTransport` for a request that was not recorded in its cassette."""
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf8")
+    return open(path, mode, encoding="utf8")
+
+
+class _Scrubber:
+    def __init__(self, fields: Iterable[str], secrets: Iterable[str]):
+        self._fields = frozenset(fields)
+        self._secrets = [secret for secret in secrets if secret]
+
+    def scrub(self, value):
+        if isinstance(value, dict):
+            return {
+                key: SCRUBBED if key in self._fields else self.scrub(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.scrub(item) for item in value]
+        if isinstance(value, str):
+            for secret in self._secrets:
+                value = value.replace(secret, SCRUBBED)
+        return value
+
+    def scrub_body(self, content: bytes):
+        if not content:
+            return None
+        try:
+            return self.scrub(json.loads(content))
+        except ValueError:
+            return self.scrub(content.decode("utf8", errors="replace"))
+
+    def scrub_url(self, url: httpx.URL) -> str:
+        target = url.raw_path.decode("ascii")
+        return self.scrub(target)
+
+
+def _request_key(method: str, target: str, body) -> str:
+    return json.dumps([method, target, body], sort_keys=True, separators=(",", ":"))
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An httpx transport recording the requests sent through it and their responses to a
+    cassette file, for replay with `ReplayTransport`.
+
+    Only the method, path, query and body of requests, and the status code, body and
+    `Content-Type` and `Retry-After` headers of responses are recorded, so the authorization
+    header is never written. Values of the `scrub_fields` of request and response bodies and any
+    occurrence of the `secrets` are replaced with `<scrubbed>`.
+
+    Cassettes are JSON Lines files with one interaction per line, gzip compressed when the path
+    ends with `.gz`. The cassette is written when the transport is closed, i.e., when the client
+    using it is closed.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.testing import RecordingTransport
+
+        with KorapayClient(transport=RecordingTransport("tests/cassettes/balances.jsonl.gz")) as client:
+            client.get_balances()
+        ```
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        scrub_fields: Iterable[str] = DEFAULT_SCRUBBED_FIELDS,
+        secrets: Iterable[str] = (),
+    ):
+        """
+        Args:
+            path: The path of the cassette to write.
+            transport: The transport to send requests with. Defaults to the httpx network
+                transports.
+            scrub_fields: The body fields whose values are scrubbed.
+            secrets: Strings scrubbed wherever they appear, e.g., account numbers.
+        """
+        self.path = path
+        self._transport = transport
+        self._scrubber = _Scrubber(scrub_fields, secrets)
+        self._interactions: list[dict] = []
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        response = self._transport.handle_request(request)
+        response.read()
+        self._record(request, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        self._record(request, response)
+        return response
+
+    def _record(self, request: httpx.Request, response: httpx.Response) -> None:
+        interaction = {
+            "method": request.method,
+            "target": self._scrubber.scrub_url(request.url),
+            "request": self._scrubber.scrub_body(request.content),
+            "status_code": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() in RECORDED_RESPONSE_HEADERS
+            },
+            "response": self._scrubber.scrub_body(response.content),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette."""
+        with self._lock:
+            interactions = list(self._interactions)
+        with _open(self.path, "w") as file:
+            file.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for interaction in interactions:
+                file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self.save()
+        if isinstance(self._transport, httpx.BaseTransport):
+            self._transport.close()
+
+    async def aclose(self) -> None:
+        self.save()
+        if isinstance(self._transport, httpx.AsyncBaseTransport):
+            await self._transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An httpx transport answering requests with the responses recorded in a cassette by
+    `RecordingTransport`, without any network access or delay.
+
+    Requests are matched by method, path, query and scrubbed body. Identical requests are
+    answered with their recorded responses in the order they were recorded.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.testing import ReplayTransport
+
+        client = KorapayClient(transport=ReplayTransport("tests/cassettes/balances.jsonl.gz"))
+        client.get_balances()
+        ```
+    """
+
+    def __init__(
+        self,
+        path: str,
+        scrub_fields: Iterable[str] = DEFAULT_SCRUBBED_FIELDS,
+        secrets: Iterable[str] = (),
+        repeat: bool = False,
+    ):
+        """
+        Args:
+            path: The path of the cassette to replay.
+            scrub_fields: The body fields scrubbed when the cassette was recorded.
+            secrets: The strings scrubbed when the cassette was recorded.
+            repeat: Whether to keep replaying the last recorded response of a request once its
+                recorded responses are used up, e.g., to replay a cassette in a benchmark loop.
+
+        Raises:
+            ValueError: When the cassette's version is not supported.
+        """
+        self.path = path
+        self._scrubber = _Scrubber(scrub_fields, secrets)
+        self._repeat = repeat
+        self._responses: dict[str, deque[dict]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        with _open(path, "r") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(
+                    f"Unsupported cassette version {header.get('version')!r} in {path}"
+                )
+            for line in file:
+                interaction = json.loads(line)
+                key = _request_key(
+                    interaction["method"], interaction["target"], interaction["request"]
+                )
+                self._responses[key].append(interaction)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._replay(request, request.read())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return self._replay(request, await request.aread())
+
+    def _replay(self, request: httpx.Request, content: bytes) -> httpx.Response:
+        target = self._scrubber.scrub_url(request.url)
+        key = _request_key(request.method, target, self._scrubber.scrub_body(content))
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise CassetteMissError(
+                    f"No recorded response for {request.method} {target} in {self.path}"
+                )
+            interaction = (
+                responses[0]
+                if self._repeat and len(responses) == 1
+                else responses.popleft()
+            )
+        body = interaction["response"]
+        if body is None:
+            content = b""
+        elif isinstance(body, str):
+            content = body.encode("utf8")
+        else:
+            content = json.dumps(body).encode("utf8")
+        return httpx.Response(
+            interaction["status_code"],
+            headers=interaction["headers"],
+            content=content,
+            request=request,
+        )
+
+
+def use_cassette(
+    path: str,
+    transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+    scrub_fields: Iterable[str] = DEFAULT_SCRUBBED_FIELDS,
+    secrets: Iterable[str] = (),
+) -> RecordingTransport | ReplayTransport:
+    """Return a transport replaying the cassette at `path` when it exists, or recording it.
+
+    Example:
+        ```python
+        from korapay_client import Country, KorapayClient
+        from korapay_client.testing import use_cassette
+
+        # Records on the first run with real credentials, replays offline afterwards.
+        with KorapayClient(transport=use_cassette("tests/cassettes/banks.jsonl.gz")) as client:
+            client.get_banks(Country.NIGERIA)
+        ```
+    """
+    try:
+        return ReplayTransport(path, scrub_fields=scrub_fields, secrets=secrets)
+    except FileNotFoundError:
+        return RecordingTransport(
+            path, transport=transport, scrub_fields=scrub_fields, secrets=secrets
+        )
@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from korapay_client.testing.fake import FakeKorapay
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        url = urlsplit(self.path)
+        content_length = int(self.headers.get("Content-Length") or 0)
+        fake_response = self.server.fake.handle(
+            method=self.command,
+            path=url.path,
+            query=dict(parse_qsl(url.query)),
+            headers={name.lower(): value for name, value in self.headers.items()},
+            body=self.rfile.read(content_length),
+        )
+        time.sleep(fake_response.delay)
+        if fake_response.timed_out:
+            self.close_connection = True
+            return
+        content = json.dumps(fake_response.body).encode()
+        self.send_response(fake_response.status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in fake_response.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def do_HEAD(self) -> None:
+        # Clients warm up their connections with HEAD requests to the base URL.
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], fake: FakeKorapay, verbose: bool):
+        super().__init__(address, _RequestHandler)
+        self.fake = fake
+        self.verbose = verbose
+
+
+class FakeKorapayServer:
+    """A local HTTP server serving requests from a `FakeKorapay`, without any dependency.
+
+    Use it as a context manager to run the server in a background thread, or call
+    `serve_forever` to run it in the foreground as `python -m korapay_client.testing` does.
+
+    Example:
+        ```python
+        from korapay_client import KorapayClient
+        from korapay_client.testing import FakeKorapay, FakeKorapayServer
+
+        with FakeKorapayServer(FakeKorapay()) as server:
+            client = KorapayClient(base_url=server.url)
+            client.get_balances()
+        ```
+    """
+
+    def __init__(
+        self,
+        fake: FakeKorapay | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            fake: The fake to serve requests from. Defaults to a new `FakeKorapay`.
+            host: The host to listen on.
+            port: The port to listen on. A free port is picked when it is `0`.
+            verbose: Whether to log every request to stderr.
+        """
+        self.fake = fake or FakeKorapay()
+        self._server = _HTTPServer((host, port), self.fake, verbose)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """The base URL to instantiate clients with."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests and close the server."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeKorapayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
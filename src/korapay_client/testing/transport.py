@@ -0,0 +1,74 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from korapay_client.testing.fake import FakeKorapay, FakeResponse
+
+
+class FakeKorapayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An httpx transport serving requests from a `FakeKorapay` in-process.
+
+    It works with both `KorapayClient` and `AsyncKorapayClient`. Responses are delayed with
+    `time.sleep` or `asyncio.sleep` respectively, and injected timeouts raise
+    `httpx.ReadTimeout` once the request's read timeout or the fault's `timeout_delay` elapses,
+    whichever is sooner.
+
+    Example:
+        ```python
+        from korapay_client import AsyncKorapayClient
+        from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+        client = AsyncKorapayClient(transport=FakeKorapayTransport(FakeKorapay()))
+        ```
+    """
+
+    def __init__(self, fake: FakeKorapay | None = None):
+        """
+        Args:
+            fake: The fake to serve requests from. Defaults to a new `FakeKorapay`.
+        """
+        self.fake = fake or FakeKorapay()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        fake_response = self._handle(request)
+        time.sleep(self._delay(request, fake_response))
+        return self._to_response(request, fake_response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        fake_response = self._handle(request)
+        await asyncio.sleep(self._delay(request, fake_response))
+        return self._to_response(request, fake_response)
+
+    def _handle(self, request: httpx.Request) -> FakeResponse:
+        return self.fake.handle(
+            method=request.method,
+            path=request.url.path,
+            query=dict(request.url.params),
+            headers={name.lower(): value for name, value in request.headers.items()},
+            body=request.read(),
+        )
+
+    @staticmethod
+    def _delay(request: httpx.Request, fake_response: FakeResponse) -> float:
+        if not fake_response.timed_out:
+            return fake_response.delay
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        if read_timeout is None:
+            return fake_response.delay
+        return min(fake_response.delay, read_timeout)
+
+    @staticmethod
+    def _to_response(
+        request: httpx.Request, fake_response: FakeResponse
+    ) -> httpx.Response:
+        if fake_response.timed_out:
+            raise httpx.ReadTimeout("The fake Korapay API timed out", request=request)
+        return httpx.Response(
+            fake_response.status_code,
+            headers={"Content-Type": "application/json", **fake_response.headers},
+            content=json.dumps(fake_response.body).encode(),
+            request=request,
+        )
@@ -0,0 +1,161 @@
+"""
+Tracing gives visibility into the time spent on each call to Korapay from within your distributed traces.
+
+Clients open a span named after the `ClientMethod` of every call, e.g., `PAYOUT_TO_BANK_ACCOUNT`, and
+time each `RequestPhase` of the call separately. The default `NoopTracer` does nothing, implement
+`Tracer` and `Span` to report spans to any tracing system or use `OpenTelemetryTracer`.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.tracing import OpenTelemetryTracer
+
+    client = KorapayClient(tracer=OpenTelemetryTracer())
+    ```
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, ContextManager
+
+from korapay_client.enums import RequestPhase
+
+
+class _NoopContextManager:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return None
+
+
+_NOOP_CONTEXT_MANAGER = _NoopContextManager()
+
+
+class Span(ABC):
+    """A span covering a single call to Korapay.
+
+    Spans are used as context managers by the clients. An exception raised within the span is
+    passed to `record_error` before the span is ended.
+    """
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+
+    @abstractmethod
+    def phase(self, phase: RequestPhase) -> ContextManager[None]:
+        """Return a context manager timing `phase` of the call."""
+        ...
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        ...
+
+    def record_error(self, error: BaseException) -> None:
+        """Record an error raised within the span."""
+        ...
+
+    def end(self) -> None:
+        """End the span."""
+        ...
+
+
+class Tracer(ABC):
+    """Creates the spans of the calls made by a client."""
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Span:
+        """Start a span for a call to Korapay.
+
+        Args:
+            name: The name of the `ClientMethod` making the call, e.g., `GET_BALANCES`.
+            attributes: The attributes of the call i.e., `korapay.client_method`,
+                `http.request.method` and `korapay.endpoint`.
+        """
+        ...
+
+
+class NoopSpan(Span):
+    __slots__ = ()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+    def phase(self, phase: RequestPhase) -> ContextManager[None]:
+        return _NOOP_CONTEXT_MANAGER
+
+
+_NOOP_SPAN = NoopSpan()
+
+
+class NoopTracer(Tracer):
+    """The default tracer of the clients. It records nothing."""
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Span:
+        return _NOOP_SPAN
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, tracer, span, name: str):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = tracer
+        self._span = span
+        self._name = name
+        self._context = trace.set_span_in_context(span)
+
+    def phase(self, phase: RequestPhase) -> ContextManager[None]:
+        return self._tracer.start_as_current_span(
+            f"{self._name} {phase.value}", context=self._context
+        )
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def record_error(self, error: BaseException) -> None:
+        self._span.record_exception(error)
+        self._span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+
+    def end(self) -> None:
+        self._span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """A tracer reporting calls to Korapay as OpenTelemetry spans.
+
+    Each call is a client span with a child span per phase. This tracer requires the
+    `opentelemetry-api` package.
+    """
+
+    def __init__(self, tracer_provider=None):
+        """
+        Args:
+            tracer_provider: The OpenTelemetry tracer provider to create spans with. Defaults
+                to the globally configured tracer provider.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as error:
+            raise ImportError(
+                "`OpenTelemetryTracer` requires the `opentelemetry-api` package. "
+                "Install it with `pip install opentelemetry-api`"
+            ) from error
+        from korapay_client._metadata import __title__, __version__
+
+        self._trace = trace
+        self._tracer = trace.get_tracer(
+            __title__, __version__, tracer_provider=tracer_provider
+        )
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Span:
+        span = self._tracer.start_span(
+            name, kind=self._trace.SpanKind.CLIENT, attributes=attributes
+        )
+        return _OpenTelemetrySpan(self._tracer, span, name)
@@ -0,0 +1,400 @@
+"""
+Incremental synchronization of the transactions of virtual bank accounts.
+
+`TransactionSync` and `AsyncTransactionSync` keep a checkpoint per account, the date of the latest
+transaction seen and the references of the transactions made at that date, and only fetch the
+transactions made since the checkpoint's day. Transactions already seen are filtered out before
+they are passed to the handler, and many accounts are synchronized concurrently with bounded
+parallelism.
+
+A checkpoint is saved once all the new transactions of its account were handled, so a
+synchronization interrupted by a crash hands the same transactions over again on the next run.
+Handlers should be idempotent, e.g., by keying ledger entries on the transaction reference.
+
+Transactions returned without a date cannot be placed before or after the checkpoint, so they are
+always considered and only filtered out by reference, the checkpoint keeping every such reference.
+
+Example:
+    ```python
+    from korapay_client import KorapayClient
+    from korapay_client.transaction_sync import SQLiteCheckpointStore, TransactionSync
+
+    def record(account_number, transactions):
+        for transaction in transactions:
+            ledger.upsert(transaction["reference"], account_number, transaction["amount"])
+
+    sync = TransactionSync(KorapayClient(), SQLiteCheckpointStore("checkpoints.sqlite3"), record)
+    results = sync.run(account_numbers)
+    ```
+"""
+
+import asyncio
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+if TYPE_CHECKING:
+    from korapay_client.clients import AsyncKorapayClient, KorapayClient
+
+TransactionHandler = Callable[[str, list[dict]], Any | Awaitable[Any]]
+
+
+@dataclass(slots=True, frozen=True)
+class Checkpoint:
+    """How far the transactions of a virtual bank account were synchronized.
+
+    Attributes:
+        account_number: The account number of the virtual bank account.
+        last_date: The date of the latest transaction seen, as returned by Korapay.
+        references: The references of the transactions seen made at `last_date`.
+        updated_at: The UNIX time the checkpoint was saved.
+        undated_references: The references of the transactions seen returned without a date.
+    """
+
+    account_number: str
+    last_date: str
+    references: frozenset[str]
+    updated_at: float
+    undated_references: frozenset[str] = frozenset()
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """The result of synchronizing the transactions of a virtual bank account.
+
+    Attributes:
+        account_number: The account number of the virtual bank account.
+        new_transactions: The number of new transactions passed to the handler.
+        checkpoint: The checkpoint of the account after the synchronization.
+        error: The error that interrupted the synchronization, if any. The checkpoint is not
+            advanced when the synchronization fails.
+    """
+
+    account_number: str
+    new_transactions: int = 0
+    checkpoint: Checkpoint | None = None
+    error: Exception | None = None
+
+
+class CheckpointStore(ABC):
+    """Stores the checkpoints of virtual bank accounts."""
+
+    @abstractmethod
+    def get(self, account_number: str) -> Checkpoint | None:
+        """Return the checkpoint of an account, or `None` when it was never synchronized."""
+        ...
+
+    @abstractmethod
+    def set(self, checkpoint: Checkpoint) -> None:
+        """Save the checkpoint of an account."""
+        ...
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+        ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """A checkpoint store for a single process, losing the checkpoints when it exits."""
+
+    def __init__(self):
+        self._checkpoints: dict[str, Checkpoint] = {}
+
+    def get(self, account_number: str) -> Checkpoint | None:
+        return self._checkpoints.get(account_number)
+
+    def set(self, checkpoint: Checkpoint) -> None:
+        self._checkpoints[checkpoint.account_number] = checkpoint
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """A checkpoint store persisted in an SQLite database."""
+
+    def __init__(self, path: str, table: str = "korapay_transaction_checkpoints"):
+        """
+        Args:
+            path: The path of the database, or `:memory:`.
+            table: The name of the table the checkpoints are stored in. It is created when it
+                does not exist.
+
+        Raises:
+            ValueError: When `table` is not a valid identifier.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (account_number TEXT PRIMARY KEY, "
+            "last_date TEXT NOT NULL, refs TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "undated_refs TEXT NOT NULL)"
+        )
+
+    def get(self, account_number: str) -> Checkpoint | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT last_date, refs, updated_at, undated_refs FROM {self._table} "
+                "WHERE account_number = ?",
+                (account_number,),
+            ).fetchone()
+        if row is None:
+            return None
+        last_date, references, updated_at, undated_references = row
+        return Checkpoint(
+            account_number,
+            last_date,
+            frozenset(json.loads(references)),
+            updated_at,
+            frozenset(json.loads(undated_references)),
+        )
+
+    def set(self, checkpoint: Checkpoint) -> None:
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self._table} "
+                "(account_number, last_date, refs, updated_at, undated_refs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    checkpoint.account_number,
+                    checkpoint.last_date,
+                    json.dumps(sorted(checkpoint.references)),
+                    checkpoint.updated_at,
+                    json.dumps(sorted(checkpoint.undated_references)),
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class _AccountSync:
+    """Filters the transactions of an account against its checkpoint and tracks the next one."""
+
+    __slots__ = (
+        "account_number",
+        "checkpoint",
+        "last_date",
+        "references",
+        "undated_references",
+        "changed",
+    )
+
+    def __init__(self, account_number: str, checkpoint: Checkpoint | None):
+        self.account_number = account_number
+        self.checkpoint = checkpoint
+        self.last_date = checkpoint.last_date if checkpoint else ""
+        self.references = set(checkpoint.references) if checkpoint else set()
+        self.undated_references = (
+            set(checkpoint.undated_references) if checkpoint else set()
+        )
+        self.changed = False
+
+    @property
+    def start_date(self) -> str | None:
+        # Korapay filters by day, so the day of the checkpoint is fetched again and filtered.
+        if self.checkpoint is None or not self.checkpoint.last_date:
+            return None
+        return self.checkpoint.last_date[:10]
+
+    def new_transactions(self, transactions: Iterable[dict]) -> list[dict]:
+        checkpoint = self.checkpoint
+        new = []
+        for transaction in transactions:
+            transaction_date = transaction.get("date") or ""
+            reference = transaction.get("reference")
+            if not transaction_date:
+                # An undated transaction may be older or newer than the checkpoint.
+                if reference not in self.undated_references:
+                    new.append(transaction)
+                    self.undated_references.add(reference)
+                    self.changed = True
+                continue
+            if checkpoint is not None and (
+                transaction_date < checkpoint.last_date
+                or (
+                    transaction_date == checkpoint.last_date
+                    and reference in checkpoint.references
+                )
+            ):
+                continue
+            new.append(transaction)
+            self.changed = True
+            if transaction_date > self.last_date:
+                self.last_date = transaction_date
+                self.references = {reference}
+            elif transaction_date == self.last_date:
+                self.references.add(reference)
+        return new
+
+    def next_checkpoint(self) -> Checkpoint | None:
+        if not self.changed:
+            return self.checkpoint
+        return Checkpoint(
+            self.account_number,
+            self.last_date,
+            frozenset(self.references),
+            time.time(),
+            frozenset(self.undated_references),
+        )
+
+
+class TransactionSync:
+    """Synchronizes the transactions of virtual bank accounts with a `KorapayClient`, using a
+    pool of threads."""
+
+    def __init__(
+        self,
+        client: "KorapayClient",
+        store: CheckpointStore,
+        handler: TransactionHandler,
+        concurrency: int = 8,
+        page_size: int = 100,
+    ):
+        """
+        Args:
+            client: The client to retrieve transactions with.
+            store: The store of the accounts' checkpoints.
+            handler: The callable called with the account number and new transactions of each
+                page of transactions with new transactions.
+            concurrency: The maximum number of accounts synchronized at a time.
+            page_size: The number of transactions retrieved per request.
+        """
+        self.client = client
+        self.store = store
+        self.handler = handler
+        self.concurrency = concurrency
+        self.page_size = page_size
+
+    def sync_account(self, account_number: str) -> SyncResult:
+        """Synchronize the transactions of an account, returning failures in the result."""
+        account = _AccountSync(account_number, self.store.get(account_number))
+        result = SyncResult(account_number, checkpoint=account.checkpoint)
+        try:
+            page = []
+            for transaction in self.client.iter_virtual_bank_account_transactions(
+                account_number, start_date=account.start_date, page_size=self.page_size
+            ):
+                page.append(transaction)
+                if len(page) == self.page_size:
+                    result.new_transactions += self._handle(account, page)
+                    page = []
+            result.new_transactions += self._handle(account, page)
+        except Exception as error:
+            result.error = error
+            return result
+        result.checkpoint = account.next_checkpoint()
+        if result.checkpoint is not account.checkpoint:
+            self.store.set(result.checkpoint)
+        return result
+
+    def _handle(self, account: _AccountSync, page: list[dict]) -> int:
+        new = account.new_transactions(page)
+        if new:
+            self.handler(account.account_number, new)
+        return len(new)
+
+    def run(self, account_numbers: Iterable[str]) -> dict[str, SyncResult]:
+        """Synchronize the transactions of accounts, up to `concurrency` accounts at a time.
+
+        Returns:
+            The result of each account by account number.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return {
+                result.account_number: result
+                for result in executor.map(self.sync_account, account_numbers)
+            }
+
+
+class AsyncTransactionSync:
+    """Synchronizes the transactions of virtual bank accounts with an `AsyncKorapayClient`.
+
+    Coroutine function handlers are awaited, and the checkpoint store is called in threads.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncKorapayClient",
+        store: CheckpointStore,
+        handler: TransactionHandler,
+        concurrency: int = 8,
+        page_size: int = 100,
+    ):
+        """
+        Args:
+            client: The client to retrieve transactions with.
+            store: The store of the accounts' checkpoints.
+            handler: The callable called with the account number and new transactions of each
+                page of transactions with new transactions.
+            concurrency: The maximum number of accounts synchronized at a time.
+            page_size: The number of transactions retrieved per request.
+        """
+        self.client = client
+        self.store = store
+        self.handler = handler
+        self.concurrency = concurrency
+        self.page_size = page_size
+
+    async def sync_account(self, account_number: str) -> SyncResult:
+        """Synchronize the transactions of an account, returning failures in the result."""
+        checkpoint = await asyncio.to_thread(self.store.get, account_number)
+        account = _AccountSync(account_number, checkpoint)
+        result = SyncResult(account_number, checkpoint=account.checkpoint)
+        try:
+            page = []
+            async for transaction in self.client.iter_virtual_bank_account_transactions(
+                account_number, start_date=account.start_date, page_size=self.page_size
+            ):
+                page.append(transaction)
+                if len(page) == self.page_size:
+                    result.new_transactions += await self._handle(account, page)
+                    page = []
+            result.new_transactions += await self._handle(account, page)
+        except Exception as error:
+            result.error = error
+            return result
+        result.checkpoint = account.next_checkpoint()
+        if result.checkpoint is not account.checkpoint:
+            await asyncio.to_thread(self.store.set, result.checkpoint)
+        return result
+
+    async def _handle(self, account: _AccountSync, page: list[dict]) -> int:
+        new = account.new_transactions(page)
+        if new:
+            handled = self.handler(account.account_number, new)
+            if inspect.isawaitable(handled):
+                await handled
+        return len(new)
+
+    async def run(self, account_numbers: Iterable[str]) -> dict[str, SyncResult]:
+        """Synchronize the transactions of accounts, up to `concurrency` accounts at a time.
+
+        Returns:
+            The result of each account by account number.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync_account(account_number: str) -> SyncResult:
+            async with semaphore:
+                return await self.sync_account(account_number)
+
+        results = await asyncio.gather(*map(sync_account, account_numbers))
+        return {result.account_number: result for result in results}
@@ -1,34 +1,60 @@
 import json
 
-from Crypto.Cipher import AES
-from Crypto import Random
-from binascii import hexlify
+from binascii import hexlify, unhexlify
 
 IV_LENGTH = 16
 MAX_METADATA_FIELDS = 5
 MAX_METADATA_FIELD_KEY_CHAR = 20
 
 
-def encrypt_aes256(encryption_key: str, data: dict) -> str:
-    if not encryption_key:
-        raise ValueError(
-            "An encryption key is required. please provide the encryption key in your account"
+class AES256Encryptor:
+    """Encrypts request payloads with AES-256-GCM using a merchant's encryption key.
+
+    Instantiating the encryptor imports `pycryptodome` and checks the key, so a client can
+    build it once and reuse it for every card charge.
+    """
+
+    def __init__(self, encryption_key: str):
+        if not encryption_key:
+            raise ValueError(
+                "An encryption key is required. please provide the encryption key in your account"
+            )
+        # pycryptodome is only needed for card charges, so it is imported on first use.
+        from Crypto.Cipher import AES
+        from Crypto import Random
+
+        self._key = encryption_key.encode("utf8")
+        if len(self._key) not in AES.key_size:
+            raise ValueError(
+                "Invalid encryption key. please provide the encryption key in your account. "
+                f"Incorrect AES key length ({len(self._key)} bytes)"
+            )
+        self._aes = AES
+        self._random = Random
+
+    def encrypt(self, data: dict) -> str:
+        iv = self._random.get_random_bytes(IV_LENGTH)
+        encrypter = self._aes.new(self._key, self._aes.MODE_GCM, iv)
+        cipher_text, auth_tag = encrypter.encrypt_and_digest(
+            json.dumps(data).encode("utf8")
         )
-    try:
-        iv = Random.get_random_bytes(IV_LENGTH)
-        encrypter = AES.new(encryption_key.encode("utf8"), AES.MODE_GCM, iv)
-        data = json.dumps(data)
-        cipher_text, auth_tag = encrypter.encrypt_and_digest(data.encode("utf8"))
-        iv_as_hex = hexlify(iv).decode()
-        cipher_text_as_hex = hexlify(cipher_text).decode()
-        auth_tag_as_hex = hexlify(auth_tag).decode()
-        encryption = iv_as_hex + ":" + cipher_text_as_hex + ":" + auth_tag_as_hex
-        return encryption
-    except ValueError as error:
-        raise ValueError(
-            f"Invalid encryption key. please provide the encryption key in your account. {error}"
+        return (
+            hexlify(iv).decode()
+            + ":"
+            + hexlify(cipher_text).decode()
+            + ":"
+            + hexlify(auth_tag).decode()
         )
 
+    def decrypt(self, data: str) -> dict:
+        iv, cipher_text, auth_tag = (unhexlify(part) for part in data.split(":"))
+        decrypter = self._aes.new(self._key, self._aes.MODE_GCM, iv)
+        return json.loads(decrypter.decrypt_and_verify(cipher_text, auth_tag))
+
+
+def encrypt_aes256(encryption_key: str, data: dict) -> str:
+    return AES256Encryptor(encryption_key).encrypt(data)
+
 
 def validate_metadata(value: dict):
     if len(value.values()) > MAX_METADATA_FIELDS:
@@ -0,0 +1,55 @@
+"""
+Verification and parsing of webhook notifications from Korapay.
+
+Korapay signs the `data` object of every notification with your secret key and sends the signature
+in the `x-korapay-signature` header. `WebhookVerifier` checks it in constant time straight from the
+raw request body and parses the notification into a typed event model.
+
+Korapay redelivers notifications until they are acknowledged. A `DeduplicationStore` rejects the
+redeliveries of a notification before they reach expensive processing.
+
+`WebhookReceiver` is an ASGI application putting it together, acknowledging notifications
+immediately and processing them from a bounded queue with a pool of workers.
+"""
+
+from korapay_client.webhooks.deduplication import (
+    DeduplicationStore,
+    InMemoryDeduplicationStore,
+    SQLiteDeduplicationStore,
+    deduplication_key,
+)
+from korapay_client.webhooks.models import (
+    ChargeEvent,
+    ChargeEventData,
+    RefundEvent,
+    RefundEventData,
+    TransferEvent,
+    TransferEventData,
+    WebhookEvent,
+    WebhookEventData,
+)
+from korapay_client.webhooks.receiver import WebhookReceiver
+from korapay_client.webhooks.verification import (
+    SIGNATURE_HEADER,
+    WebhookVerifier,
+    parse_event,
+)
+
+__all__ = (
+    "WebhookReceiver",
+    "WebhookVerifier",
+    "SIGNATURE_HEADER",
+    "parse_event",
+    "WebhookEvent",
+    "WebhookEventData",
+    "ChargeEvent",
+    "ChargeEventData",
+    "TransferEvent",
+    "TransferEventData",
+    "RefundEvent",
+    "RefundEventData",
+    "DeduplicationStore",
+    "InMemoryDeduplicationStore",
+    "SQLiteDeduplicationStore",
+    "deduplication_key",
+)
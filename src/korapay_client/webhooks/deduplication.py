@@ -0,0 +1,222 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable
+
+from korapay_client.webhooks.models import WebhookEvent
+
+DEFAULT_TTL = 72 * 60 * 60
+"""How long notifications are remembered by default, in seconds."""
+
+DEFAULT_MAX_SIZE = 100_000
+
+
+def deduplication_key(event: WebhookEvent | dict) -> str:
+    """Return the key identifying the deliveries of a notification, i.e., its event type and the
+    reference of its data e.g., `charge.success:KPY-C-1234`.
+
+    Raises:
+        KeyError: When a decoded notification has no event type or reference.
+    """
+    if isinstance(event, WebhookEvent):
+        return f"{event.event}:{event.data.reference}"
+    return f"{event['event']}:{event['data']['reference']}"
+
+
+class DeduplicationStore(ABC):
+    """Remembers the notifications that were received, to reject their redeliveries.
+
+    `add` claims a key atomically, so a notification is processed once even when its deliveries
+    are handled concurrently. `discard` a key whose processing failed for a redelivery to be
+    processed again.
+
+    Example:
+        ```python
+        from korapay_client.webhooks import InMemoryDeduplicationStore, deduplication_key
+
+        store = InMemoryDeduplicationStore()
+
+        def handle_event(event):
+            key = deduplication_key(event)
+            if not store.add(key):
+                return  # a duplicate delivery
+            try:
+                fulfil_order(event.data.reference)
+            except Exception:
+                store.discard(key)
+                raise
+        ```
+    """
+
+    @abstractmethod
+    def add(self, key: str) -> bool:
+        """Remember `key` and return `True`, or return `False` when it is already remembered."""
+        ...
+
+    @abstractmethod
+    def discard(self, key: str) -> None:
+        """Forget `key`, if it is remembered."""
+        ...
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool: ...
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+        ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class InMemoryDeduplicationStore(DeduplicationStore):
+    """A bounded deduplication store for a single process.
+
+    Keys are remembered for `ttl` seconds, and the least recently seen keys are forgotten first
+    once `max_size` keys are remembered. Every operation is O(1).
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: The maximum number of keys remembered.
+            ttl: How long keys are remembered, in seconds.
+            clock: The clock expiring keys.
+
+        Raises:
+            ValueError: When `max_size` or `ttl` is not positive.
+        """
+        if max_size <= 0 or ttl <= 0:
+            raise ValueError("max_size and ttl must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._expiries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            expiry = self._expiries.get(key)
+            if expiry is not None and expiry > now:
+                self._expiries.move_to_end(key)
+                return False
+            self._expiries[key] = now + self.ttl
+            self._expiries.move_to_end(key)
+            self._evict(now)
+            return True
+
+    def _evict(self, now: float) -> None:
+        expiries = self._expiries
+        while len(expiries) > self.max_size:
+            expiries.popitem(last=False)
+        # Keys are mostly in expiry order, so expired keys are dropped from the front.
+        while expiries:
+            key, expiry = next(iter(expiries.items()))
+            if expiry > now:
+                break
+            del expiries[key]
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._expiries.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expiry = self._expiries.get(key)
+        return expiry is not None and expiry > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+
+class SQLiteDeduplicationStore(DeduplicationStore):
+    """A deduplication store persisted in an SQLite database, shared by the processes of a host
+    and kept across restarts.
+
+    Keys are remembered for `ttl` seconds of wall clock time. Expired keys are deleted every
+    `prune_interval` additions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        prune_interval: int = 1000,
+        table: str = "korapay_webhook_events",
+    ):
+        """
+        Args:
+            path: The path of the database, or `:memory:`.
+            ttl: How long keys are remembered, in seconds.
+            prune_interval: The number of additions between deletions of expired keys.
+            table: The name of the table the keys are stored in. It is created when it does
+                not exist.
+
+        Raises:
+            ValueError: When `ttl` is not positive or `table` is not a valid identifier.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self.ttl = ttl
+        self._prune_interval = prune_interval
+        self._additions = 0
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def add(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            # Inserts the key, or takes over an expired one, in a single atomic statement.
+            cursor = self._connection.execute(
+                f"INSERT INTO {self._table} (key, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET expires_at = excluded.expires_at "
+                f"WHERE {self._table}.expires_at <= ?",
+                (key, now + self.ttl, now),
+            )
+            added = cursor.rowcount == 1
+            self._additions += 1
+            if self._additions >= self._prune_interval:
+                self._additions = 0
+                self._connection.execute(
+                    f"DELETE FROM {self._table} WHERE expires_at <= ?", (now,)
+                )
+        return added
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT 1 FROM {self._table} WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
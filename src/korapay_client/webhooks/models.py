@@ -0,0 +1,120 @@
+from decimal import Decimal
+from typing import Any
+
+from pydantic import ConfigDict
+
+from korapay_client.enums import WebhookEventType
+from korapay_client.models.base import DeferredBuildModel
+
+
+class WebhookEventData(DeferredBuildModel):
+    """The data of a webhook notification.
+
+    Fields Korapay adds to the data that are not declared by a model are kept and can be read as
+    attributes or from `model_extra`.
+
+    Attributes:
+        reference: The reference of the transaction the event is about.
+        status: The status of the transaction e.g., `success`.
+        currency: The currency of the transaction.
+        amount: The amount of the transaction.
+        fee: The fee charged for the transaction.
+    """
+
+    model_config = ConfigDict(defer_build=True, extra="allow")
+
+    reference: str
+    status: str | None = None
+    currency: str | None = None
+    amount: Decimal | None = None
+    fee: Decimal | None = None
+
+
+class ChargeEventData(WebhookEventData):
+    """The data of a `charge.success` or `charge.failed` notification.
+
+    Attributes:
+        payment_reference: Your reference of the charge.
+        payment_method: The channel the customer paid with e.g., `card` or `bank_transfer`.
+        transaction_date: When the charge was made.
+        virtual_bank_account_details: The payer and virtual bank account of bank transfers to
+            virtual bank accounts.
+        metadata: The metadata of the charge.
+    """
+
+    payment_reference: str | None = None
+    payment_method: str | None = None
+    transaction_date: str | None = None
+    virtual_bank_account_details: dict[str, Any] | None = None
+    metadata: dict[str, Any] | None = None
+
+
+class TransferEventData(WebhookEventData):
+    """The data of a `transfer.success` or `transfer.failed` notification.
+
+    Attributes:
+        transaction_date: When the payout was made.
+        narration: The narration of the payout.
+    """
+
+    transaction_date: str | None = None
+    narration: str | None = None
+
+
+class RefundEventData(WebhookEventData):
+    """The data of a `refund.success` or `refund.failed` notification.
+
+    Attributes:
+        payment_reference: The reference of the refunded charge.
+        completion_time: When the refund was completed.
+    """
+
+    payment_reference: str | None = None
+    completion_time: str | None = None
+
+
+class WebhookEvent(DeferredBuildModel):
+    """A webhook notification from Korapay.
+
+    Attributes:
+        event: The type of the event. Events unknown to this version of `korapay_client` are
+            kept as strings.
+        data: The data of the event.
+
+    Example:
+        ```python
+        from korapay_client import WebhookEventType
+        from korapay_client.webhooks import WebhookVerifier
+
+        event = WebhookVerifier().parse(raw_body, signature)
+        if event.event == WebhookEventType.TRANSFER_SUCCESS:
+            print(event.data.reference, event.data.amount)
+        ```
+    """
+
+    event: WebhookEventType | str
+    data: WebhookEventData
+
+
+class ChargeEvent(WebhookEvent):
+    data: ChargeEventData
+
+
+class TransferEvent(WebhookEvent):
+    data: TransferEventData
+
+
+class RefundEvent(WebhookEvent):
+    data: RefundEventData
+
+
+EVENT_CLASSES: dict[str, type[WebhookEvent]] = {
+    "charge": ChargeEvent,
+    "transfer": TransferEvent,
+    "refund": RefundEvent,
+}
+"""The model of each family of events, keyed by the prefix of their event type."""
+
+
+def get_event_class(event: str) -> type[WebhookEvent]:
+    return EVENT_CLASSES.get(event.partition(".")[0], WebhookEvent)
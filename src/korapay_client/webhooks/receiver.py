@@ -0,0 +1,330 @@
+import asyncio
+import inspect
+import json
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from korapay_client.exceptions import (
+    InvalidWebhookPayloadError,
+    InvalidWebhookSignatureError,
+)
+from korapay_client.webhooks.deduplication import (
+    DeduplicationStore,
+    deduplication_key,
+)
+from korapay_client.webhooks.models import WebhookEvent
+from korapay_client.webhooks.verification import SIGNATURE_HEADER, WebhookVerifier
+
+logger = logging.getLogger(__name__)
+
+_SIGNATURE_HEADER = SIGNATURE_HEADER.encode("latin-1")
+
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+WebhookHandler = Callable[[WebhookEvent], Any | Awaitable[Any]]
+ErrorHandler = Callable[[WebhookEvent, Exception], Any | Awaitable[Any]]
+
+
+class WebhookReceiver:
+    """An ASGI application receiving webhook notifications from Korapay.
+
+    Each notification is verified, checked against the `deduplication_store` and put on a bounded
+    queue, and Korapay is acknowledged right away. A pool of `workers` tasks takes the events off
+    the queue and passes them to `handler`, so a slow handler never delays the acknowledgements.
+
+    When the queue is full the notification is answered with `503 Service Unavailable` and a
+    `Retry-After` header, leaving Korapay to redeliver it once the workers have caught up, instead
+    of the receiver buffering without bound. Notifications with invalid signatures are answered
+    with `401 Unauthorized` and malformed ones with `400 Bad Request`.
+
+    Coroutine function handlers run on the event loop, other handlers run in threads. Errors
+    raised by the handler are passed to `on_error`, or logged, and the event's deduplication key
+    is discarded so a manual redelivery of the event is processed. The keys of the events still
+    queued or being processed when the receiver is stopped are discarded too.
+
+    The workers are started on the ASGI lifespan startup, or by the first notification when the
+    server does not support lifespan events, and the queue is drained on shutdown. Notifications
+    passed to `receive` or `receive_async` while the receiver is not started are answered with `503`.
+
+    Example:
+        ```python
+        from korapay_client.webhooks import InMemoryDeduplicationStore, WebhookReceiver
+
+        async def handle_event(event):
+            if event.event == "charge.success":
+                await fulfil_order(event.data.payment_reference)
+
+        app = WebhookReceiver(
+            handle_event, workers=8, deduplication_store=InMemoryDeduplicationStore()
+        )
+        # uvicorn my_service:app
+        ```
+    """
+
+    def __init__(
+        self,
+        handler: WebhookHandler,
+        secret_key: str | None = None,
+        verifier: WebhookVerifier | None = None,
+        deduplication_store: DeduplicationStore | None = None,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        retry_after: int = 30,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+        drain_timeout: float = 30.0,
+        on_error: ErrorHandler | None = None,
+    ):
+        """
+        Args:
+            handler: The callable processing each event.
+            secret_key: The secret key verifying notifications. Read from the `KORAPAY_SECRET_KEY`
+                environmental variable when neither it nor `verifier` is provided.
+            verifier: The verifier of notifications.
+            deduplication_store: The store rejecting redelivered notifications. Every delivery is
+                processed when it is not provided.
+            workers: The number of events processed concurrently.
+            max_queue_size: The maximum number of events waiting to be processed.
+            retry_after: The seconds Korapay is asked to wait before redelivering a notification
+                rejected because the queue is full.
+            max_body_size: The maximum size of a notification in bytes.
+            drain_timeout: The maximum number of seconds waited on shutdown for the queued events
+                to be processed.
+            on_error: The callable called with an event and the error raised processing it.
+
+        Raises:
+            MissingAPIKeyError: When no verifier or secret key is provided or found.
+            ValueError: When `workers` or `max_queue_size` is not positive.
+        """
+        if workers <= 0 or max_queue_size <= 0:
+            raise ValueError("workers and max_queue_size must be positive")
+        self.handler = handler
+        self.verifier = verifier or WebhookVerifier(secret_key)
+        self.deduplication_store = deduplication_store
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.retry_after = retry_after
+        self.max_body_size = max_body_size
+        self.drain_timeout = drain_timeout
+        self.on_error = on_error
+        self.stats: Counter[str] = Counter()
+        """Counts of `received`, `accepted`, `duplicate`, `rejected`, `invalid`, `processed`,
+        `failed` and `dropped` notifications."""
+        self._run_in_thread = not inspect.iscoroutinefunction(handler)
+        self._queue: asyncio.Queue[WebhookEvent] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queue_size(self) -> int:
+        """The number of events waiting to be processed."""
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self) -> None:
+        """Start the workers. Called on the ASGI lifespan startup."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"korapay-webhook-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def join(self) -> None:
+        """Wait until every queued event is processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Wait up to `drain_timeout` seconds for the queued events to be processed and stop the
+        workers. Called on the ASGI lifespan shutdown."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping the webhook receiver with %d unprocessed events",
+                self.queue_size,
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._queue.empty():
+            self._drop(self._queue.get_nowait())
+        self._tasks = []
+        self._queue = None
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                await self._process(event)
+            except asyncio.CancelledError:
+                self._drop(event)
+                raise
+            finally:
+                queue.task_done()
+
+    def _drop(self, event: WebhookEvent) -> None:
+        self.stats["dropped"] += 1
+        self._release(event)
+
+    def _release(self, event: WebhookEvent) -> None:
+        # The event was not processed, so its redelivery must not be rejected as a duplicate.
+        if self.deduplication_store is not None:
+            self.deduplication_store.discard(deduplication_key(event))
+
+    async def _process(self, event: WebhookEvent) -> None:
+        try:
+            if self._run_in_thread:
+                result = await asyncio.to_thread(self.handler, event)
+            else:
+                result = self.handler(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as error:
+            self.stats["failed"] += 1
+            await asyncio.to_thread(self._release, event)
+            if self.on_error is None:
+                logger.exception(
+                    "Processing the webhook event %s failed", deduplication_key(event)
+                )
+                return
+            try:
+                result = self.on_error(event, error)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("The webhook error handler failed")
+        else:
+            self.stats["processed"] += 1
+
+    def receive(self, raw_body: bytes, signature: str | None) -> tuple[int, dict]:
+        """Verify a notification and queue its event.
+
+        The verifier and the deduplication store are called on the calling thread, so coroutines
+        should use `receive_async` instead.
+
+        Returns:
+            The status code and body of the response to Korapay, `503` when the receiver is not
+            started.
+        """
+        self.stats["received"] += 1
+        if self._queue is None:
+            self.stats["rejected"] += 1
+            return 503, {"status": False, "message": "Not started"}
+        result = self._admit(raw_body, signature)
+        if not isinstance(result, WebhookEvent):
+            return self._reject(*result)
+        if not self._enqueue(result):
+            self._release(result)
+            return self._reject("rejected", 503, "Busy")
+        return 200, {"status": True, "message": "Accepted"}
+
+    async def receive_async(
+        self, raw_body: bytes, signature: str | None
+    ) -> tuple[int, dict]:
+        """Verify a notification and queue its event, calling the verifier and the deduplication
+        store in a thread so a store backed by a database or Redis does not block the event loop.
+
+        Returns:
+            The status code and body of the response to Korapay, `503` when the receiver is not
+            started.
+        """
+        self.stats["received"] += 1
+        if self._queue is None:
+            self.stats["rejected"] += 1
+            return 503, {"status": False, "message": "Not started"}
+        result = await asyncio.to_thread(self._admit, raw_body, signature)
+        if not isinstance(result, WebhookEvent):
+            return self._reject(*result)
+        if not self._enqueue(result):
+            await asyncio.to_thread(self._release, result)
+            return self._reject("rejected", 503, "Busy")
+        return 200, {"status": True, "message": "Accepted"}
+
+    def _admit(
+        self, raw_body: bytes, signature: str | None
+    ) -> WebhookEvent | tuple[str, int, str]:
+        # Returns the event, or the statistic, status code and message rejecting it.
+        try:
+            event = self.verifier.parse(raw_body, signature)
+        except InvalidWebhookSignatureError:
+            return "invalid", 401, "Invalid signature"
+        except InvalidWebhookPayloadError:
+            return "invalid", 400, "Invalid notification"
+        if self.deduplication_store is not None and not self.deduplication_store.add(
+            deduplication_key(event)
+        ):
+            return "duplicate", 200, "Duplicate"
+        return event
+
+    def _reject(
+        self, statistic: str, status_code: int, message: str
+    ) -> tuple[int, dict]:
+        self.stats[statistic] += 1
+        return status_code, {"status": status_code == 200, "message": message}
+
+    def _enqueue(self, event: WebhookEvent) -> bool:
+        # The receiver may have been stopped while the event was verified in a thread.
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        self.stats["accepted"] += 1
+        return True
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await self.start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self.stop()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "POST":
+            await self._respond(send, 405, {"status": False, "message": "Use POST"})
+            return
+        if not self._tasks:
+            await self.start()
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(body) > self.max_body_size:
+                await self._respond(
+                    send, 413, {"status": False, "message": "Too large"}
+                )
+                return
+
+        signature = None
+        for name, value in scope["headers"]:
+            if name.lower() == _SIGNATURE_HEADER:
+                signature = value.decode("latin-1")
+                break
+        status_code, content = await self.receive_async(body, signature)
+        await self._respond(send, status_code, content)
+
+    async def _respond(self, send, status_code: int, content: dict) -> None:
+        body = json.dumps(content).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if status_code == 503:
+            headers.append((b"retry-after", str(self.retry_after).encode()))
+        await send(
+            {"type": "http.response.start", "status": status_code, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,215 @@
+import hashlib
+import hmac
+import json
+import os
+import re
+
+from pydantic import ValidationError
+
+from korapay_client.exceptions import (
+    InvalidWebhookPayloadError,
+    InvalidWebhookSignatureError,
+    MissingAPIKeyError,
+)
+from korapay_client.webhooks.models import WebhookEvent, get_event_class
+
+SIGNATURE_HEADER = "x-korapay-signature"
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _split_top_level(text: str) -> tuple[dict, dict[str, tuple[int, int]]]:
+    """Decode a JSON object and return its values with the span of each value in `text`.
+
+    The values are decoded by the C accelerated `json` scanner, so this costs about as much as
+    `json.loads`, and the span of the `data` value is its exact signed text.
+    """
+    index = _WHITESPACE.match(text, 0).end()
+    if text[index : index + 1] != "{":
+        raise ValueError("Expected a JSON object")
+    values = {}
+    spans = {}
+    index = _WHITESPACE.match(text, index + 1).end()
+    if text[index : index + 1] == "}":
+        return values, spans
+    while True:
+        key, index = _DECODER.raw_decode(text, index)
+        if not isinstance(key, str):
+            raise ValueError("Expected a string key")
+        index = _WHITESPACE.match(text, index).end()
+        if text[index : index + 1] != ":":
+            raise ValueError("Expected ':'")
+        start = _WHITESPACE.match(text, index + 1).end()
+        values[key], index = _DECODER.raw_decode(text, start)
+        spans[key] = (start, index)
+        index = _WHITESPACE.match(text, index).end()
+        delimiter = text[index : index + 1]
+        if delimiter == "}":
+            return values, spans
+        if delimiter != ",":
+            raise ValueError("Expected ',' or '}'")
+        index = _WHITESPACE.match(text, index + 1).end()
+
+
+def _serialize_data(data) -> bytes:
+    # The compact form Korapay signs, i.e., JavaScript's `JSON.stringify(data)`.
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf8")
+
+
+class WebhookVerifier:
+    """Verifies and parses webhook notifications from Korapay.
+
+    Korapay signs the `data` object of each notification with an HMAC-SHA256 of your secret key
+    and sends the hex digest in the `x-korapay-signature` header. Signatures are compared in
+    constant time.
+
+    `verify` and `parse` work on the raw request body and hash the signed `data` bytes in place,
+    without re-serializing the decoded data, falling back to the compact serialization when the
+    body was reformatted in transit. Use `verify_data` when only the decoded body is available.
+
+    Example:
+        ```python
+        from korapay_client import InvalidWebhookSignatureError
+        from korapay_client.webhooks import SIGNATURE_HEADER, WebhookVerifier
+
+        verifier = WebhookVerifier()  # assumes the secret key is in the environmental variables
+
+        def handle_webhook(request):
+            try:
+                event = verifier.parse(request.body, request.headers.get(SIGNATURE_HEADER))
+            except InvalidWebhookSignatureError:
+                return 401
+            print(event.event, event.data.reference)
+            return 200
+        ```
+    """
+
+    KORAPAY_ENV_SECRET_KEY_NAME = "KORAPAY_SECRET_KEY"
+
+    def __init__(self, secret_key: str | None = None):
+        """
+        Args:
+            secret_key: Your Korapay secret key. Read from the `KORAPAY_SECRET_KEY` environmental
+                variable when it is not provided.
+
+        Raises:
+            MissingAPIKeyError: When no secret key is provided or found.
+        """
+        secret_key = secret_key or os.getenv(self.KORAPAY_ENV_SECRET_KEY_NAME)
+        if not secret_key:
+            raise MissingAPIKeyError(
+                "Webhook verifier could not find any secret key. Please provide a secret key on "
+                "instantiation of this verifier or provide it in your environmental variables as "
+                f"{self.KORAPAY_ENV_SECRET_KEY_NAME}"
+            )
+        # The keyed HMAC state is computed once and copied for every notification.
+        self._hmac = hmac.new(secret_key.encode("utf8"), digestmod=hashlib.sha256)
+
+    def sign(self, data: bytes | dict) -> str:
+        """Return the signature of a notification's `data`, as serialized bytes or decoded."""
+        if not isinstance(data, bytes):
+            data = _serialize_data(data)
+        mac = self._hmac.copy()
+        mac.update(data)
+        return mac.hexdigest()
+
+    def _matches(self, data: bytes | dict, signature: str) -> bool:
+        # Compared as bytes, as `compare_digest` rejects strings with non-ASCII characters.
+        return hmac.compare_digest(
+            self.sign(data).encode("ascii"),
+            signature.strip().lower().encode("utf8", "replace"),
+        )
+
+    def _decode(self, raw_body: bytes | str) -> tuple[dict, bytes]:
+        try:
+            text = raw_body.decode("utf8") if isinstance(raw_body, bytes) else raw_body
+            values, spans = _split_top_level(text)
+        except ValueError as error:
+            raise InvalidWebhookPayloadError(
+                f"The webhook notification is not a JSON object. Error: {error}"
+            ) from error
+        if "data" not in spans:
+            raise InvalidWebhookPayloadError(
+                "The webhook notification has no `data` to verify"
+            )
+        start, end = spans["data"]
+        if isinstance(raw_body, bytes) and raw_body.isascii():
+            signed = raw_body[start:end]
+        else:
+            signed = text[start:end].encode("utf8")
+        return values, signed
+
+    def verify(self, raw_body: bytes | str, signature: str | None) -> bool:
+        """Return whether `signature` is the signature of the raw body of a notification.
+
+        Args:
+            raw_body: The body of the notification request as received.
+            signature: The value of the `x-korapay-signature` header.
+
+        Raises:
+            InvalidWebhookPayloadError: When the body is not a JSON object with `data`.
+        """
+        if not signature:
+            return False
+        values, signed = self._decode(raw_body)
+        return self._verify_decoded(values, signed, signature)
+
+    def _verify_decoded(self, values: dict, signed: bytes, signature: str) -> bool:
+        return self._matches(signed, signature) or self._matches(
+            values["data"], signature
+        )
+
+    def verify_data(self, data: dict, signature: str | None) -> bool:
+        """Return whether `signature` is the signature of a notification's decoded `data`.
+
+        Args:
+            data: The `data` object of the notification.
+            signature: The value of the `x-korapay-signature` header.
+        """
+        if not signature:
+            return False
+        return self._matches(data, signature)
+
+    def parse(self, raw_body: bytes | str, signature: str | None) -> WebhookEvent:
+        """Verify a notification and parse it into an event model.
+
+        Args:
+            raw_body: The body of the notification request as received.
+            signature: The value of the `x-korapay-signature` header.
+
+        Returns:
+            A `ChargeEvent`, `TransferEvent` or `RefundEvent` depending on the event type, or a
+            `WebhookEvent` for other events.
+
+        Raises:
+            InvalidWebhookSignatureError: When the signature is missing or does not match.
+            InvalidWebhookPayloadError: When the body is not a valid Korapay event.
+        """
+        if not signature:
+            raise InvalidWebhookSignatureError(
+                f"The webhook notification has no {SIGNATURE_HEADER} header"
+            )
+        values, signed = self._decode(raw_body)
+        if not self._verify_decoded(values, signed, signature):
+            raise InvalidWebhookSignatureError(
+                "The signature of the webhook notification does not match its data"
+            )
+        return parse_event(values)
+
+
+def parse_event(payload: dict) -> WebhookEvent:
+    """Parse a decoded notification into an event model, without verifying it.
+
+    Raises:
+        InvalidWebhookPayloadError: When the payload is not a valid Korapay event.
+    """
+    event = payload.get("event") if isinstance(payload, dict) else None
+    if not isinstance(event, str):
+        raise InvalidWebhookPayloadError("The webhook notification has no `event` type")
+    try:
+        return get_event_class(event).model_validate(payload)
+    except ValidationError as error:
+        raise InvalidWebhookPayloadError(
+            f"The webhook notification is not a valid {event} event. Error: {error}"
+        ) from error
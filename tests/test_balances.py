@@ -0,0 +1,152 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import AsyncKorapayClient, Currency, KorapayClient
+from korapay_client.balances import BalanceCache
+from korapay_client.enums import ClientMethod
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+PAYOUT = {
+    "reference": "payout-1",
+    "amount": 1_000,
+    "currency": Currency.NGN,
+    "bank_code": "033",
+    "account_number": "0000000000",
+    "customer_email": "johndoe@example.com",
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class BalanceCacheTestCase(TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = BalanceCache(max_age=5, max_staleness=60, clock=self.clock)
+        self.fake = FakeKorapay(balances={"NGN": 10_000})
+
+    def available_balance(self, response) -> float:
+        return response.data["NGN"]["available_balance"]
+
+    def wait_for_refresh(self):
+        for thread in threading.enumerate():
+            if thread.name == "korapay-balance-refresh":
+                thread.join()
+
+    def test_balances_are_served_stale_while_refreshing(self):
+        client = KorapayClient(
+            **CLIENT_KEYS,
+            transport=FakeKorapayTransport(self.fake),
+            balance_cache=self.cache,
+        )
+        client.get_balances()
+        client.get_balances()
+        self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 1)
+
+        self.clock.now = 10
+        self.fake.balances["NGN"]["available_balance"] -= 500
+        self.assertEqual(self.available_balance(client.get_balances()), 10_000)
+        self.wait_for_refresh()
+        self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 2)
+        self.assertEqual(self.available_balance(client.get_balances()), 9_500)
+
+        self.clock.now = 100
+        self.fake.balances["NGN"]["available_balance"] -= 500
+        self.assertEqual(self.available_balance(client.get_balances()), 9_000)
+        self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 3)
+
+    def test_payouts_invalidate_the_balances(self):
+        client = KorapayClient(
+            **CLIENT_KEYS,
+            transport=FakeKorapayTransport(self.fake),
+            balance_cache=self.cache,
+        )
+        client.get_balances()
+        client.payout_to_bank_account(**PAYOUT)
+        self.assertIsNone(self.cache.snapshot)
+        self.assertEqual(self.available_balance(client.get_balances()), 9_000)
+
+        client.payout_to_bank_account(**PAYOUT)  # Rejected as a duplicate.
+        self.assertIsNotNone(self.cache.snapshot)
+
+    def test_refreshes_started_before_an_invalidation_are_not_cached(self):
+        def fetch():
+            self.cache.invalidate()
+            return client.get_balances(cached=False)
+
+        client = KorapayClient(**CLIENT_KEYS, transport=FakeKorapayTransport(self.fake))
+        self.cache.get(fetch)
+        self.assertIsNone(self.cache.snapshot)
+
+    def test_async_balances_are_served_stale_while_refreshing(self):
+        async def get_balances():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS,
+                transport=FakeKorapayTransport(self.fake),
+                balance_cache=self.cache,
+            ) as client:
+                await asyncio.gather(*(client.get_balances() for _ in range(10)))
+                self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 1)
+                self.clock.now = 10
+                await client.get_balances()
+                await asyncio.gather(*self.cache._tasks)
+                self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 2)
+                await client.payout_to_bank_account(**PAYOUT)
+                self.assertIsNone(self.cache.snapshot)
+
+        asyncio.run(get_balances())
+
+    def test_failed_refreshes_are_not_cached(self):
+        def handler(request):
+            return httpx.Response(500, json={"status": False, "message": "Down"})
+
+        client = KorapayClient(
+            **CLIENT_KEYS,
+            transport=httpx.MockTransport(handler),
+            balance_cache=self.cache,
+        )
+        self.assertFalse(client.get_balances().status)
+        self.assertIsNone(self.cache.snapshot)
+
+    def test_cancelled_refreshes_are_retried_by_their_waiters(self):
+        async def get_balances():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            ) as client:
+                release = asyncio.Event()
+
+                async def fetch():
+                    await release.wait()
+                    return await client.get_balances()
+
+                owner = asyncio.ensure_future(self.cache.get_async(fetch))
+                waiters = [
+                    asyncio.ensure_future(self.cache.get_async(fetch)) for _ in range(2)
+                ]
+                await asyncio.sleep(0)
+                owner.cancel()
+                waiters[0].cancel()
+                await asyncio.sleep(0)
+                release.set()
+                with self.assertRaises(asyncio.CancelledError):
+                    await owner
+                with self.assertRaises(asyncio.CancelledError):
+                    await waiters[0]
+                return await waiters[1]
+
+        self.assertEqual(self.available_balance(asyncio.run(get_balances())), 10_000)
+        self.assertEqual(self.fake.requests[ClientMethod.GET_BALANCES], 1)
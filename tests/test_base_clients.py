@@ -0,0 +1,490 @@
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import (
+    AsyncKorapayClient,
+    ClientError,
+    Country,
+    Currency,
+    DuplicateReferenceError,
+    DuplicateReferencePolicy,
+    KorapayClient,
+    RequestTimeoutError,
+)
+from korapay_client.enums import ClientMethod
+from korapay_client.journal import FileJournal
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+VALID_ENCRYPTION_KEY = "a" * 32
+
+
+class BaseClientTestCase(TestCase):
+    def test_warmup_rejects_invalid_connection_counts(self):
+        client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            limits=httpx.Limits(max_connections=2),
+        )
+        with self.assertRaises(ValueError):
+            client.warmup(connections=0)
+        with self.assertRaises(ValueError):
+            client.warmup(connections=3)
+
+    def test_warmup_rejects_invalid_encryption_key(self):
+        client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key="test-encryption-key",
+        )
+        with self.assertRaises(ValueError):
+            client.warmup()
+
+    def test_timeouts_resolve_from_call_then_endpoint_then_client(self):
+        client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            timeout=5.0,
+            endpoint_timeouts={ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT: 30.0},
+            deadline=60.0,
+        )
+        self.assertEqual(
+            client._resolve_timeout(ClientMethod.GET_BALANCES),
+            (httpx.Timeout(5.0), 60.0),
+        )
+        self.assertEqual(
+            client._resolve_timeout(ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT),
+            (httpx.Timeout(30.0), 60.0),
+        )
+        with client.timeout_override(timeout=1.0, deadline=2.0):
+            self.assertEqual(
+                client._resolve_timeout(ClientMethod.BULK_PAYOUT_TO_BANK_ACCOUNT),
+                (httpx.Timeout(1.0), 2.0),
+            )
+        self.assertEqual(
+            client._resolve_timeout(ClientMethod.GET_BALANCES),
+            (httpx.Timeout(5.0), 60.0),
+        )
+
+    def test_deadline_caps_every_timeout(self):
+        timeout = KorapayClient._bound_timeout(httpx.Timeout(5.0, read=None), 2.0)
+        self.assertEqual(timeout, httpx.Timeout(2.0))
+        with self.assertRaises(RequestTimeoutError):
+            KorapayClient._bound_timeout(httpx.Timeout(5.0), 0)
+
+    def test_timeout_overrides_apply_to_their_client(self):
+        clients = [
+            KorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+            )
+            for _ in range(2)
+        ]
+        with clients[0].timeout_override(deadline=1.0):
+            self.assertEqual(
+                clients[0]._resolve_timeout(ClientMethod.GET_BALANCES)[1], 1.0
+            )
+            self.assertIsNone(clients[1]._resolve_timeout(ClientMethod.GET_BALANCES)[1])
+
+    def test_async_deadline_bounds_the_whole_request(self):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(10)
+
+        async def get_balances():
+            async with AsyncKorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+                deadline=0.05,
+                transport=httpx.MockTransport(slow_handler),
+            ) as client:
+                await client.get_balances()
+
+        with self.assertRaises(RequestTimeoutError):
+            asyncio.run(get_balances())
+
+    def test_intents_past_their_deadline_are_not_journaled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with FileJournal(os.path.join(directory, "journal.jsonl")) as journal:
+                client = KorapayClient(
+                    public_key="test-public-key",
+                    secret_key="test-secret-key",
+                    encryption_key=VALID_ENCRYPTION_KEY,
+                    payout_journal=journal,
+                    transport=FakeKorapayTransport(FakeKorapay()),
+                )
+                with client.timeout_override(deadline=0.0):
+                    with self.assertRaises(RequestTimeoutError):
+                        client.payout_to_bank_account(
+                            reference="payout-1",
+                            amount=1_000,
+                            currency=Currency.NGN,
+                            bank_code="033",
+                            account_number="0000000000",
+                            customer_email="johndoe@example.com",
+                        )
+                self.assertEqual(journal.unresolved(), [])
+
+
+class TransportTestCase(TestCase):
+    @staticmethod
+    def handle_request(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "status": True,
+                "message": "ok",
+                "data": {"authorization": request.headers["Authorization"]},
+            },
+        )
+
+    def test_sync_client_sends_requests_through_transport(self):
+        with KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(self.handle_request),
+        ) as client:
+            response = client.get_balances()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"authorization": "Bearer test-secret-key"})
+
+    def test_async_client_sends_requests_through_transport(self):
+        async def get_balances():
+            async with AsyncKorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+                transport=httpx.MockTransport(self.handle_request),
+            ) as client:
+                return await client.get_balances()
+
+        response = asyncio.run(get_balances())
+        self.assertEqual(response.data, {"authorization": "Bearer test-secret-key"})
+
+    def test_country_codes_are_sent_as_query_parameters(self):
+        urls = []
+
+        def handle_request(request: httpx.Request) -> httpx.Response:
+            urls.append(request.url)
+            return self.handle_request(request)
+
+        with KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(handle_request),
+        ) as client:
+            client.get_banks(Country.NIGERIA)
+            client.get_mmo(Country.KENYA)
+        self.assertEqual(
+            [(url.path, dict(url.params)) for url in urls],
+            [
+                ("/merchant/api/v1/misc/banks", {"countryCode": "NG"}),
+                ("/merchant/api/v1/misc/mobile-money", {"countryCode": "KE"}),
+            ],
+        )
+
+    def test_async_client_closes_the_connection_pools_of_every_event_loop(self):
+        client = AsyncKorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(self.handle_request),
+        )
+
+        async def get_http_client():
+            await client.get_balances()
+            return client._get_http_client()
+
+        closed_loop_http_client = asyncio.run(get_http_client())
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        try:
+            other_loop_http_client = asyncio.run_coroutine_threadsafe(
+                get_http_client(), other_loop
+            ).result()
+
+            async def close():
+                http_client = await get_http_client()
+                self.assertIsNot(http_client, other_loop_http_client)
+                self.assertNotIn(closed_loop_http_client, client._http_clients.values())
+                await client.close()
+                return http_client
+
+            self.assertTrue(asyncio.run(close()).is_closed)
+            self.assertTrue(other_loop_http_client.is_closed)
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+
+
+class KeyRotationTestCase(TestCase):
+    def setUp(self):
+        self.client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(TransportTestCase.handle_request),
+        )
+        self.addCleanup(self.client.close)
+
+    def test_rotated_keys_authorize_requests_on_the_same_connection_pool(self):
+        http_client = self.client._get_http_client()
+        encryptor = self.client._get_encryptor()
+        self.client.rotate_keys(secret_key="new-secret-key")
+        self.assertEqual(
+            self.client.get_balances().data,
+            {"authorization": "Bearer new-secret-key"},
+        )
+        self.assertEqual(self.client._public_key, "test-public-key")
+        self.assertIs(self.client._get_http_client(), http_client)
+        self.assertIs(self.client._get_encryptor(), encryptor)
+
+        self.client.rotate_keys(encryption_key="b" * 32)
+        self.assertEqual(self.client._encryption_key, "b" * 32)
+        self.assertIsNot(self.client._get_encryptor(), encryptor)
+
+    def test_invalid_rotations_keep_the_keys(self):
+        with self.assertRaises(ValueError):
+            self.client.rotate_keys()
+        with self.assertRaises(ValueError):
+            self.client.rotate_keys(
+                secret_key="new-secret-key", encryption_key="invalid-key"
+            )
+        self.assertEqual(self.client._secret_key, "test-secret-key")
+        self.assertEqual(self.client._encryption_key, VALID_ENCRYPTION_KEY)
+
+    def test_keys_rotate_under_concurrent_requests(self):
+        keys = [f"secret-key-{index}" for index in range(20)]
+
+        def rotate():
+            for key in keys:
+                self.client.rotate_keys(secret_key=key)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            rotation = executor.submit(rotate)
+            responses = [executor.submit(self.client.get_balances) for _ in range(100)]
+            rotation.result()
+        authorizations = {future.result().data["authorization"] for future in responses}
+        self.assertLessEqual(
+            authorizations,
+            {"Bearer test-secret-key", *(f"Bearer {key}" for key in keys)},
+        )
+        self.assertEqual(
+            self.client.get_balances().data, {"authorization": "Bearer secret-key-19"}
+        )
+
+
+class DuplicateReferenceTestCase(TestCase):
+    PAYOUT = {
+        "reference": "payout-1",
+        "amount": 1_000,
+        "currency": Currency.NGN,
+        "bank_code": "033",
+        "account_number": "0000000000",
+        "customer_email": "johndoe@example.com",
+    }
+
+    def setUp(self):
+        self.sent = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.sent += 1
+        self.entered.set()
+        self.release.wait(5)
+        return httpx.Response(200, json={"status": True, "message": "ok"})
+
+    def make_client(self, policy):
+        return KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(self.handle_request),
+            duplicate_reference_policy=policy,
+        )
+
+    def test_duplicates_in_flight_are_rejected(self):
+        client = self.make_client(DuplicateReferencePolicy.REJECT)
+        with ThreadPoolExecutor() as executor:
+            first = executor.submit(client.payout_to_bank_account, **self.PAYOUT)
+            self.entered.wait(5)
+            with self.assertRaises(DuplicateReferenceError):
+                client.payout_to_bank_account(**self.PAYOUT)
+            self.release.set()
+            self.assertEqual(first.result().status_code, 200)
+        client.payout_to_bank_account(**self.PAYOUT)
+        self.assertEqual(self.sent, 2)
+
+    def test_duplicates_in_flight_join_the_request(self):
+        client = self.make_client("join")
+        with ThreadPoolExecutor() as executor:
+            first = executor.submit(client.payout_to_bank_account, **self.PAYOUT)
+            self.entered.wait(5)
+            duplicate = executor.submit(client.payout_to_bank_account, **self.PAYOUT)
+            other = executor.submit(
+                client.payout_to_bank_account,
+                **{**self.PAYOUT, "reference": "payout-2"},
+            )
+            self.release.set()
+            self.assertIs(duplicate.result(), first.result())
+            other.result()
+        self.assertEqual(self.sent, 2)
+
+    def test_async_duplicates_join_the_request(self):
+        async def handle_request(request: httpx.Request) -> httpx.Response:
+            self.sent += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"status": True, "message": "ok"})
+
+        async def pay_out():
+            async with AsyncKorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+                transport=httpx.MockTransport(handle_request),
+                duplicate_reference_policy=DuplicateReferencePolicy.JOIN,
+            ) as client:
+                return await asyncio.gather(
+                    *(client.payout_to_bank_account(**self.PAYOUT) for _ in range(3))
+                )
+
+        responses = asyncio.run(pay_out())
+        self.assertIs(responses[0], responses[2])
+        self.assertEqual(self.sent, 1)
+
+    def test_async_duplicates_retry_when_the_request_joined_is_cancelled(self):
+        async def handle_request(request: httpx.Request) -> httpx.Response:
+            self.sent += 1
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"status": True, "message": "ok"})
+
+        async def pay_out():
+            async with AsyncKorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+                transport=httpx.MockTransport(handle_request),
+                duplicate_reference_policy=DuplicateReferencePolicy.JOIN,
+            ) as client:
+                first = asyncio.ensure_future(
+                    client.payout_to_bank_account(**self.PAYOUT)
+                )
+                await asyncio.sleep(0.01)
+                duplicate = asyncio.ensure_future(
+                    client.payout_to_bank_account(**self.PAYOUT)
+                )
+                await asyncio.sleep(0.01)
+                first.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await first
+                return await duplicate
+
+        self.assertEqual(asyncio.run(pay_out()).status_code, 200)
+        self.assertEqual(self.sent, 2)
+
+
+class VirtualBankAccountTransactionsTestCase(TestCase):
+    def setUp(self):
+        self.fake = FakeKorapay()
+        self.client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=FakeKorapayTransport(self.fake),
+        )
+        account = self.client.create_virtual_bank_account(
+            account_name="John Doe",
+            account_reference="vba-1",
+            bank_code="000",
+            customer_name="John Doe",
+            bvn="12345678901",
+            customer_email="johndoe@example.com",
+        )
+        self.account_number = account.data["account_number"]
+        for amount in range(1, 26):
+            self.client.credit_sandbox_virtual_bank_account(
+                self.account_number, amount, Currency.NGN
+            )
+
+    def test_transactions_are_filtered_and_paginated(self):
+        response = self.client.get_virtual_bank_account_transactions(
+            self.account_number, start_date=date.today(), page=3, limit=10
+        )
+        self.assertEqual(len(response.data["transactions"]), 5)
+        self.assertEqual(response.data["pagination"]["total_pages"], 3)
+        response = self.client.get_virtual_bank_account_transactions(
+            self.account_number, end_date=date.today() - timedelta(days=1)
+        )
+        self.assertEqual(response.data["transactions"], [])
+
+    def test_transactions_are_iterated_page_by_page(self):
+        for prefetch in (True, False):
+            amounts = [
+                transaction["amount"]
+                for transaction in self.client.iter_virtual_bank_account_transactions(
+                    self.account_number, page_size=10, prefetch=prefetch
+                )
+            ]
+            self.assertEqual(amounts, list(range(1, 26)))
+        self.assertEqual(
+            self.fake.requests[ClientMethod.GET_VIRTUAL_BANK_ACCOUNT_TRANSACTIONS], 6
+        )
+
+    def test_prefetched_pages_keep_the_timeout_override(self):
+        transport = FakeKorapayTransport(self.fake)
+        read_timeouts = []
+
+        def handle_request(request: httpx.Request) -> httpx.Response:
+            read_timeouts.append(request.extensions["timeout"]["read"])
+            return transport.handle_request(request)
+
+        client = KorapayClient(
+            public_key="test-public-key",
+            secret_key="test-secret-key",
+            encryption_key=VALID_ENCRYPTION_KEY,
+            transport=httpx.MockTransport(handle_request),
+        )
+        with client.timeout_override(timeout=1.5):
+            transactions = list(
+                client.iter_virtual_bank_account_transactions(
+                    self.account_number, page_size=10, prefetch=True
+                )
+            )
+        self.assertEqual(len(transactions), 25)
+        self.assertEqual(read_timeouts, [1.5, 1.5, 1.5])
+
+    def test_async_transactions_are_iterated_page_by_page(self):
+        async def iterate(prefetch):
+            async with AsyncKorapayClient(
+                public_key="test-public-key",
+                secret_key="test-secret-key",
+                encryption_key=VALID_ENCRYPTION_KEY,
+                transport=FakeKorapayTransport(self.fake),
+            ) as client:
+                return [
+                    transaction["amount"]
+                    async for transaction in client.iter_virtual_bank_account_transactions(
+                        self.account_number, page_size=7, prefetch=prefetch
+                    )
+                ]
+
+        for prefetch in (True, False):
+            self.assertEqual(asyncio.run(iterate(prefetch)), list(range(1, 26)))
+
+    def test_iteration_fails_on_errors(self):
+        with self.assertRaises(ClientError):
+            list(self.client.iter_virtual_bank_account_transactions("9999999999"))
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import AsyncKorapayClient, Currency, KorapayClient, PayoutOutcome
+from korapay_client.enums import ClientMethod
+from korapay_client.journal import (
+    FileJournal,
+    SQLiteJournal,
+    recover_payouts,
+    recover_payouts_async,
+)
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+def payout(reference: str) -> dict:
+    return {
+        "reference": reference,
+        "amount": 1_000,
+        "currency": Currency.NGN,
+        "bank_code": "033",
+        "account_number": "0000000000",
+        "customer_email": "johndoe@example.com",
+    }
+
+
+class CrashingTransport(httpx.BaseTransport):
+    """Sends requests to a fake and fails as if the process died before the response arrived."""
+
+    def __init__(self, fake: FakeKorapay):
+        self._transport = FakeKorapayTransport(fake)
+
+    def handle_request(self, request):
+        self._transport.handle_request(request)
+        raise httpx.ReadError("connection lost")
+
+
+class PayoutJournalTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.fake = FakeKorapay(balances={"NGN": 10_000})
+
+    def check_recovery(self, open_journal):
+        with open_journal() as journal:
+            client = KorapayClient(
+                **CLIENT_KEYS,
+                transport=FakeKorapayTransport(self.fake),
+                payout_journal=journal,
+            )
+            client.payout_to_bank_account(**payout("payout-sent"))
+            self.assertEqual(journal.unresolved(), [])
+            # The retry is rejected as a duplicate, which leaves its outcome to a lookup.
+            client.payout_to_bank_account(**payout("payout-sent"))
+
+            crashing_client = KorapayClient(
+                **CLIENT_KEYS,
+                transport=CrashingTransport(self.fake),
+                payout_journal=journal,
+            )
+            with self.assertRaises(Exception):
+                crashing_client.payout_to_bank_account(**payout("payout-in-flight"))
+            journal.record_intent(
+                ClientMethod.PAYOUT_TO_BANK_ACCOUNT,
+                {"reference": "payout-never-sent"},
+            )
+
+        with open_journal() as journal:
+            self.assertEqual(
+                [entry.reference for entry in journal.unresolved()],
+                ["payout-sent", "payout-in-flight", "payout-never-sent"],
+            )
+            client = KorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            )
+            resolved = recover_payouts(client, journal)
+            self.assertEqual(
+                {entry.reference: entry.outcome for entry in resolved},
+                {
+                    "payout-sent": PayoutOutcome.SENT,
+                    "payout-in-flight": PayoutOutcome.SENT,
+                    "payout-never-sent": PayoutOutcome.NOT_FOUND,
+                },
+            )
+
+        with open_journal() as journal:
+            self.assertEqual(journal.unresolved(), [])
+
+    def test_file_journal_recovers_payouts_in_flight(self):
+        path = os.path.join(self.directory, "payouts.journal")
+        self.check_recovery(lambda: FileJournal(path))
+
+    def test_sqlite_journal_recovers_payouts_in_flight(self):
+        path = os.path.join(self.directory, "payouts.sqlite3")
+        self.check_recovery(lambda: SQLiteJournal(path))
+
+    def test_unauthorized_and_rate_limited_lookups_leave_payouts_unresolved(self):
+        for status_code in (401, 429):
+            path = os.path.join(self.directory, f"payouts-{status_code}.journal")
+            with FileJournal(path) as journal:
+                journal.record_intent(
+                    ClientMethod.PAYOUT_TO_BANK_ACCOUNT, {"reference": "payout-1"}
+                )
+                client = KorapayClient(
+                    **CLIENT_KEYS,
+                    transport=httpx.MockTransport(
+                        lambda request, status_code=status_code: httpx.Response(
+                            status_code, json={"status": False, "message": "Denied"}
+                        )
+                    ),
+                )
+                self.assertEqual(recover_payouts(client, journal), [])
+                self.assertEqual(len(journal.unresolved()), 1)
+
+    def test_failed_payouts_are_resolved_as_rejected(self):
+        path = os.path.join(self.directory, "payouts.journal")
+        with FileJournal(path) as journal:
+            journal.record_intent(
+                ClientMethod.PAYOUT_TO_BANK_ACCOUNT, {"reference": "payout-1"}
+            )
+            client = KorapayClient(
+                **CLIENT_KEYS,
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(
+                        200,
+                        json={
+                            "status": True,
+                            "message": "Transaction retrieved",
+                            "data": {"reference": "payout-1", "status": "failed"},
+                        },
+                    )
+                ),
+            )
+            (entry,) = recover_payouts(client, journal)
+            self.assertEqual(entry.outcome, PayoutOutcome.REJECTED)
+
+    def test_file_journal_ignores_torn_records(self):
+        path = os.path.join(self.directory, "payouts.journal")
+        with FileJournal(path) as journal:
+            journal.record_intent(
+                ClientMethod.PAYOUT_TO_BANK_ACCOUNT, {"reference": "payout-1"}
+            )
+        with open(path, "ab") as file:
+            file.write(b'{"type":"outcome","refer')
+        with FileJournal(path) as journal:
+            self.assertEqual(len(journal.unresolved()), 1)
+            journal.record_outcome("payout-1", PayoutOutcome.SENT)
+            journal.compact()
+        with FileJournal(path) as journal:
+            self.assertEqual(journal.unresolved(), [])
+        self.assertEqual(os.path.getsize(path), 0)
+
+    def test_async_clients_journal_payouts(self):
+        path = os.path.join(self.directory, "payouts.journal")
+
+        async def pay_out(journal):
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS,
+                transport=FakeKorapayTransport(self.fake),
+                payout_journal=journal,
+            ) as client:
+                await asyncio.gather(
+                    *(
+                        client.payout_to_bank_account(**payout(f"payout-{index}"))
+                        for index in range(5)
+                    )
+                )
+                journal.record_intent(
+                    ClientMethod.PAYOUT_TO_BANK_ACCOUNT, {"reference": "payout-1"}
+                )
+                return await recover_payouts_async(client, journal)
+
+        with FileJournal(path) as journal:
+            resolved = asyncio.run(pay_out(journal))
+        self.assertEqual([entry.reference for entry in resolved], ["payout-1"])
+        self.assertEqual(resolved[0].outcome, PayoutOutcome.SENT)
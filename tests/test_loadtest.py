@@ -0,0 +1,62 @@
+import asyncio
+from unittest import TestCase
+
+from korapay_client import AsyncKorapayClient
+from korapay_client.enums import ClientMethod
+from korapay_client.loadtest import percentile, run_load_test
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+VALID_ENCRYPTION_KEY = "a" * 32
+
+
+def make_client(fake: FakeKorapay) -> AsyncKorapayClient:
+    return AsyncKorapayClient(
+        public_key="test-public-key",
+        secret_key="test-secret-key",
+        encryption_key=VALID_ENCRYPTION_KEY,
+        transport=FakeKorapayTransport(fake),
+    )
+
+
+class LoadTestTestCase(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_closed_loop_load_test_reports_each_client_method(self):
+        fake = FakeKorapay()
+        result = asyncio.run(
+            run_load_test(
+                make_client(fake),
+                duration=0.2,
+                concurrency=4,
+                mix={
+                    ClientMethod.GET_BALANCES: 1,
+                    ClientMethod.PAYOUT_TO_BANK_ACCOUNT: 1,
+                },
+            )
+        )
+        summary = result.summary()
+        self.assertEqual(
+            set(summary["endpoints"]), {"GET_BALANCES", "PAYOUT_TO_BANK_ACCOUNT"}
+        )
+        self.assertEqual(summary["total"]["calls"], sum(fake.requests.values()))
+        self.assertEqual(summary["total"]["error_rate"], 0.0)
+        self.assertIn("TOTAL", result.format())
+
+    def test_open_loop_load_test_starts_calls_at_the_target_rate(self):
+        result = asyncio.run(
+            run_load_test(
+                make_client(FakeKorapay()),
+                duration=0.5,
+                rps=40,
+                mix={ClientMethod.GET_BALANCES: 1},
+            )
+        )
+        self.assertEqual(result.summary()["total"]["calls"], 20)
+
+    def test_load_test_requires_exactly_one_load_shape(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(run_load_test(make_client(FakeKorapay()), duration=1))
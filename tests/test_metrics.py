@@ -0,0 +1,202 @@
+import asyncio
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import (
+    AsyncKorapayClient,
+    ClientError,
+    HookEvent,
+    KorapayClient,
+    RequestTimeoutError,
+)
+from korapay_client.enums import ClientMethod, HTTPMethod
+from korapay_client.hooks import RequestEvent, merge_event_hooks
+from korapay_client.metrics import MetricsCollector
+
+
+class MetricsCollectorTestCase(TestCase):
+    def _make_event(
+        self, elapsed: float, status_code: int | None = 200
+    ) -> RequestEvent:
+        return RequestEvent(
+            client_method=ClientMethod.GET_BALANCES,
+            method=HTTPMethod.GET,
+            url="https://api.korapay.com/merchant/api/v1/balances",
+            started_at=0.0,
+            elapsed=elapsed,
+            status_code=status_code,
+            request_bytes=10,
+            response_bytes=100,
+        )
+
+    def test_collector_records_latency_status_codes_and_bytes(self):
+        collector = MetricsCollector(latency_buckets=(0.1, 1.0))
+        for elapsed in (0.05, 0.1, 0.5, 2.0):
+            event = self._make_event(elapsed)
+            collector.before_request(event)
+            collector.after_response(event)
+
+        metrics = collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(
+            metrics["latency"]["buckets"], {0.1: 2, 1.0: 3, float("inf"): 4}
+        )
+        self.assertEqual(metrics["latency"]["count"], 4)
+        self.assertAlmostEqual(metrics["latency"]["sum"], 2.65)
+        self.assertEqual(metrics["status_codes"], {200: 4})
+        self.assertEqual(metrics["request_bytes"], 40)
+        self.assertEqual(metrics["response_bytes"], 400)
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_collector_records_errors_and_in_flight_requests(self):
+        collector = MetricsCollector()
+        in_flight_event = self._make_event(elapsed=0.1)
+        collector.before_request(in_flight_event)
+        failed_event = self._make_event(elapsed=0.1, status_code=None)
+        failed_event.error = ClientError("connection reset")
+        collector.before_request(failed_event)
+        collector.on_error(failed_event)
+
+        metrics = collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["errors"], {"ClientError": 1})
+        self.assertEqual(metrics["status_codes"], {})
+        self.assertEqual(metrics["in_flight"], 1)
+
+    def test_reset_keeps_requests_in_flight(self):
+        collector = MetricsCollector()
+        finished_event = self._make_event(elapsed=0.1)
+        collector.before_request(finished_event)
+        collector.after_response(finished_event)
+        in_flight_event = self._make_event(elapsed=0.1)
+        collector.before_request(in_flight_event)
+        collector.reset()
+        self.assertEqual(collector.snapshot()["GET_BALANCES"]["in_flight"], 1)
+
+        collector.after_response(in_flight_event)
+        metrics = collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(metrics["status_codes"], {200: 1})
+        collector.reset()
+        self.assertEqual(collector.snapshot(), {})
+
+    def test_prometheus_export(self):
+        collector = MetricsCollector(latency_buckets=(0.1,))
+        event = self._make_event(elapsed=0.05)
+        collector.before_request(event)
+        collector.after_response(event)
+
+        exported = collector.to_prometheus()
+        self.assertIn(
+            'korapay_client_request_duration_seconds_bucket{client_method="GET_BALANCES",le="0.1"} 1',
+            exported,
+        )
+        self.assertIn(
+            'korapay_client_request_duration_seconds_bucket{client_method="GET_BALANCES",le="+Inf"} 1',
+            exported,
+        )
+        self.assertIn(
+            'korapay_client_responses_total{client_method="GET_BALANCES",status_code="200"} 1',
+            exported,
+        )
+        self.assertIn(
+            'korapay_client_requests_in_flight{client_method="GET_BALANCES"} 0',
+            exported,
+        )
+
+
+class EventHooksTestCase(TestCase):
+    def test_merge_event_hooks_keeps_order(self):
+        def first(event): ...
+
+        def second(event): ...
+
+        merged = merge_event_hooks(
+            {HookEvent.AFTER_RESPONSE: [first]}, None, {"after_response": [second]}
+        )
+        self.assertEqual(merged, {HookEvent.AFTER_RESPONSE: [first, second]})
+
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, json={"status": True, "message": "Successful", "data": []}
+    )
+
+
+class ClientMetricsTestCase(TestCase):
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.events = []
+        self.event_hooks = {
+            hook_event: [
+                lambda event, hook_event=hook_event: self.events.append(hook_event)
+            ]
+            for hook_event in HookEvent
+        }
+
+    def make_client(self, client_class, handler):
+        return client_class(
+            **CLIENT_KEYS,
+            metrics=self.collector,
+            event_hooks=self.event_hooks,
+            transport=httpx.MockTransport(handler),
+        )
+
+    def test_successful_requests_are_recorded(self):
+        with self.make_client(KorapayClient, handler) as client:
+            client.get_balances()
+
+        metrics = self.collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["status_codes"], {200: 1})
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(
+            self.events, [HookEvent.BEFORE_REQUEST, HookEvent.AFTER_RESPONSE]
+        )
+
+    def test_reset_during_a_request_keeps_it_in_flight(self):
+        def resetting_handler(request: httpx.Request) -> httpx.Response:
+            self.collector.reset()
+            return handler(request)
+
+        with self.make_client(KorapayClient, resetting_handler) as client:
+            client.get_balances()
+
+        metrics = self.collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(metrics["status_codes"], {200: 1})
+
+    def test_requests_failing_before_they_are_sent_are_recorded(self):
+        with self.make_client(KorapayClient, handler) as client:
+            with client.timeout_override(deadline=0.0):
+                with self.assertRaises(RequestTimeoutError):
+                    client.get_balances()
+
+        metrics = self.collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["errors"], {"RequestTimeoutError": 1})
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(self.events, [HookEvent.BEFORE_REQUEST, HookEvent.ON_ERROR])
+
+    def test_cancelled_requests_are_recorded(self):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(10)
+            return handler(request)
+
+        async def cancel_request():
+            async with self.make_client(AsyncKorapayClient, slow_handler) as client:
+                task = asyncio.ensure_future(client.get_balances())
+                await asyncio.sleep(0.01)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(cancel_request())
+        metrics = self.collector.snapshot()["GET_BALANCES"]
+        self.assertEqual(metrics["errors"], {"CancelledError": 1})
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(self.events, [HookEvent.BEFORE_REQUEST, HookEvent.ON_ERROR])
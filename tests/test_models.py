@@ -0,0 +1,130 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from korapay_client.enums import Currency, MobileMoneyOperator
+from korapay_client.models.internal import (
+    ChargeViaCardModel,
+    CreateVirtualBankAccountModel,
+    ChargeViaMobileMoneyModel,
+    PayoutToBankAccountModel,
+    PayoutToMobileMoneyModel,
+)
+from korapay_client.models.base import _iter_model_classes, warmup
+
+
+class InternalModelsTestCase(TestCase):
+    def test_charge_via_card_model_dumps_wire_payload(self):
+        model = ChargeViaCardModel.model_validate(
+            {
+                "reference": "ref-0000000001",
+                "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+                "card": {
+                    "number": "4084127883172787",
+                    "cvv": "123",
+                    "expiry_month": "09",
+                    "expiry_year": "30",
+                },
+                "amount": Decimal("1000.50"),
+                "currency": Currency.NGN,
+                "redirect_url": None,
+                "metadata": None,
+            }
+        )
+        payload = model.model_dump(exclude_none=True)
+        self.assertEqual(
+            payload["customer"], {"name": "John Doe", "email": "johndoe@example.com"}
+        )
+        self.assertEqual(payload["amount"], "1000.50")
+        self.assertNotIn("redirect_url", payload)
+        self.assertNotIn("metadata", payload)
+
+    def test_create_virtual_bank_account_model_dumps_wire_payload(self):
+        model = CreateVirtualBankAccountModel.model_validate(
+            {
+                "account_name": "John Doe",
+                "account_reference": "ref-0000000003",
+                "bank_code": "000",
+                "customer": {"name": "John Doe", "email": None},
+                "kyc": {"bvn": "12345678901", "nin": None},
+            }
+        )
+        self.assertEqual(
+            model.model_dump(exclude_none=True),
+            {
+                "account_name": "John Doe",
+                "account_reference": "ref-0000000003",
+                "bank_code": "000",
+                "customer": {"name": "John Doe"},
+                "kyc": {"bvn": "12345678901"},
+                "permanent": True,
+            },
+        )
+
+    def test_charge_via_mobile_money_model_dumps_wire_payload(self):
+        model = ChargeViaMobileMoneyModel.model_validate(
+            {
+                "reference": "ref-0000000004",
+                "customer": {"name": None, "email": "johndoe@example.com"},
+                "amount": 1000,
+                "mobile_money": {"number": "254700000000"},
+                "currency": Currency.KES,
+            }
+        )
+        payload = model.model_dump(exclude_none=True)
+        self.assertEqual(payload["customer"], {"email": "johndoe@example.com"})
+        self.assertEqual(payload["mobile_money"], {"number": "254700000000"})
+
+    def test_payout_to_bank_account_model_dumps_wire_payload(self):
+        model = PayoutToBankAccountModel.model_validate(
+            {
+                "reference": "ref-0000000006",
+                "destination": {
+                    "amount": 1000,
+                    "currency": Currency.NGN,
+                    "narration": None,
+                    "bank_account": {"bank": "033", "account": "0000000000"},
+                    "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+                },
+            }
+        )
+        self.assertEqual(
+            model.model_dump(exclude_none=True),
+            {
+                "reference": "ref-0000000006",
+                "destination": {
+                    "type": "bank_account",
+                    "amount": 1000,
+                    "currency": Currency.NGN,
+                    "bank_account": {"bank": "033", "account": "0000000000"},
+                    "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+                },
+            },
+        )
+
+    def test_payout_to_mobile_money_model_nests_customer_name_in_destination(self):
+        model = PayoutToMobileMoneyModel.model_validate(
+            {
+                "reference": "ref-0000000007",
+                "destination": {
+                    "amount": 1000,
+                    "currency": Currency.KES,
+                    "narration": "Test payout",
+                    "mobile_money": {
+                        "operator": MobileMoneyOperator.SAFARICOM_KENYA,
+                        "mobile_number": "254700000000",
+                    },
+                    "customer": {"name": "John Doe", "email": "johndoe@example.com"},
+                },
+            }
+        )
+        destination = model.model_dump(exclude_none=True)["destination"]
+        self.assertEqual(destination["type"], "mobile_money")
+        self.assertEqual(destination["narration"], "Test payout")
+        self.assertEqual(destination["customer"]["name"], "John Doe")
+
+
+class ModelSchemaBuildTestCase(TestCase):
+    def test_warmup_builds_every_model(self):
+        warmup()
+        for model_class in _iter_model_classes():
+            self.assertTrue(model_class.__pydantic_complete__, model_class.__name__)
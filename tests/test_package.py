@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import korapay_client
+
+
+class PackageTestCase(TestCase):
+    def test_lazy_attributes_resolve(self):
+        from korapay_client.clients.async_client import AsyncKorapayClient
+        from korapay_client.clients.sync_client import KorapayClient
+        from korapay_client.models import Card
+
+        self.assertIs(korapay_client.KorapayClient, KorapayClient)
+        self.assertIs(korapay_client.AsyncKorapayClient, AsyncKorapayClient)
+        self.assertIs(korapay_client.Card, Card)
+        self.assertIn("KorapayClient", dir(korapay_client))
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            korapay_client.NotAnAttribute  # noqa: B018
+
+    def test_importing_package_defers_heavy_dependencies(self):
+        code = (
+            "import sys, korapay_client; "
+            "print(','.join(m for m in ('httpx', 'pydantic', 'Crypto') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(output.stdout.strip(), "")
+
+    def test_importing_clients_defers_optional_features(self):
+        code = (
+            "import sys; from korapay_client import KorapayClient, AsyncKorapayClient; "
+            "print(','.join(m for m in ('sqlite3', 'korapay_client.journal', "
+            "'korapay_client.balances') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(output.stdout.strip(), "")
+
+    def test_lazy_attributes_are_exported(self):
+        self.assertLessEqual(
+            set(korapay_client._LAZY_ATTRIBUTES), set(korapay_client.__all__)
+        )
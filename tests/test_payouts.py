@@ -0,0 +1,95 @@
+import asyncio
+from unittest import TestCase
+
+from korapay_client import (
+    AsyncKorapayClient,
+    ClientError,
+    Currency,
+    KorapayClient,
+    PlannedPayoutStatus,
+)
+from korapay_client.enums import ClientMethod
+from korapay_client.payouts import AsyncPayoutPlanner, PayoutPlanner, PlannedPayout
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+def payout(reference: str, amount: int) -> PlannedPayout:
+    return PlannedPayout.to_bank_account(
+        reference=reference,
+        amount=amount,
+        currency=Currency.NGN,
+        bank_code="033",
+        account_number="0000000000",
+        customer_email="johndoe@example.com",
+    )
+
+
+class PayoutPlannerTestCase(TestCase):
+    def setUp(self):
+        self.fake = FakeKorapay(balances={"NGN": 10_000})
+        # The duplicate is rejected by Korapay, releasing the funds reserved for it to `payout-c`.
+        self.payouts = [
+            payout("payout-a", 3_000),
+            payout("payout-a", 3_000),
+            payout("payout-b", 3_000),
+            payout("payout-c", 3_000),
+            payout("payout-d", 3_000),
+            payout("payout-e", 20_000),
+        ]
+
+    def check_results(self, results):
+        self.assertEqual(
+            [result.payout.reference for result in results],
+            [payout.reference for payout in self.payouts],
+        )
+        self.assertEqual(
+            sorted(result.status for result in results[:2]),
+            [PlannedPayoutStatus.FAILED, PlannedPayoutStatus.SENT],
+        )
+        self.assertEqual(
+            [result.status for result in results[2:]],
+            [
+                PlannedPayoutStatus.SENT,
+                PlannedPayoutStatus.SENT,
+                PlannedPayoutStatus.DEFERRED,
+                PlannedPayoutStatus.REJECTED,
+            ],
+        )
+        self.assertEqual(self.fake.requests[ClientMethod.PAYOUT_TO_BANK_ACCOUNT], 4)
+        self.assertEqual(self.fake.balances["NGN"]["available_balance"], 1_000)
+
+    def test_payouts_are_sent_up_to_the_available_balance(self):
+        client = KorapayClient(**CLIENT_KEYS, transport=FakeKorapayTransport(self.fake))
+        self.check_results(PayoutPlanner(client, concurrency=2).run(self.payouts))
+
+    def test_async_payouts_are_sent_up_to_the_available_balance(self):
+        async def run():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            ) as client:
+                return await AsyncPayoutPlanner(client, concurrency=2).run(self.payouts)
+
+        self.check_results(asyncio.run(run()))
+
+    def test_fees_are_reserved(self):
+        client = KorapayClient(**CLIENT_KEYS, transport=FakeKorapayTransport(self.fake))
+        planner = PayoutPlanner(client, fee_estimator=lambda payout: 1_000)
+        results = planner.run([payout(f"payout-{index}", 2_000) for index in range(4)])
+        self.assertEqual(
+            [result.status for result in results],
+            [PlannedPayoutStatus.SENT] * 3 + [PlannedPayoutStatus.DEFERRED],
+        )
+
+    def test_no_payout_is_sent_without_balances(self):
+        client = KorapayClient(
+            **CLIENT_KEYS,
+            transport=FakeKorapayTransport(FakeKorapay(secret_key="another-key")),
+        )
+        with self.assertRaises(ClientError):
+            PayoutPlanner(client).run(self.payouts)
@@ -0,0 +1,83 @@
+import asyncio
+from unittest import TestCase
+
+import httpx
+
+from korapay_client.balances import BalanceCache
+from korapay_client.pool import AsyncClientPool, ClientPool, MerchantCredentials
+
+CREDENTIALS = {
+    f"merchant-{index}": MerchantCredentials(
+        f"public-key-{index}", f"secret-key-{index}", "a" * 32
+    )
+    for index in range(3)
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "status": True,
+            "message": "Successful",
+            "data": {"authorization": request.headers["Authorization"]},
+        },
+    )
+
+
+class ClientPoolTestCase(TestCase):
+    def test_clients_share_the_connection_pool(self):
+        with ClientPool(CREDENTIALS, transport=httpx.MockTransport(handler)) as pool:
+            clients = [pool.get(merchant_id) for merchant_id in CREDENTIALS]
+            self.assertIs(pool["merchant-0"], clients[0])
+            self.assertEqual(
+                len({id(client._get_http_client()) for client in clients}), 1
+            )
+            self.assertEqual(
+                [client.get_balances().data["authorization"] for client in clients],
+                [f"Bearer secret-key-{index}" for index in range(3)],
+            )
+            clients[0].close()
+            self.assertFalse(pool._http_client.is_closed)
+        self.assertTrue(pool._http_client.is_closed)
+
+    def test_least_recently_used_clients_are_evicted(self):
+        loaded = []
+
+        def load_credentials(merchant_id):
+            loaded.append(merchant_id)
+            return CREDENTIALS[merchant_id]
+
+        with ClientPool(load_credentials, max_clients=2) as pool:
+            pool.get("merchant-0")
+            pool.get("merchant-1")
+            pool.get("merchant-0")
+            pool.get("merchant-2")
+            self.assertNotIn("merchant-1", pool)
+            self.assertEqual(len(pool), 2)
+            pool.get("merchant-1")
+            self.assertEqual(
+                loaded, ["merchant-0", "merchant-1", "merchant-2", "merchant-1"]
+            )
+
+    def test_merchant_specific_options_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ClientPool(CREDENTIALS, balance_cache=BalanceCache())
+
+    def test_async_clients_share_the_connection_pool(self):
+        async def get_authorizations():
+            async with AsyncClientPool(
+                CREDENTIALS, transport=httpx.MockTransport(handler)
+            ) as pool:
+                responses = await asyncio.gather(
+                    *(
+                        pool.get(merchant_id).get_balances()
+                        for merchant_id in CREDENTIALS
+                    )
+                )
+                return [response.data["authorization"] for response in responses]
+
+        self.assertEqual(
+            asyncio.run(get_authorizations()),
+            [f"Bearer secret-key-{index}" for index in range(3)],
+        )
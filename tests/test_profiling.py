@@ -0,0 +1,99 @@
+import asyncio
+import time
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import AsyncKorapayClient, KorapayClient
+from korapay_client.enums import RequestPhase
+from korapay_client.profiling import OTHER_PHASE, Profiler
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+class ProfilerTestCase(TestCase):
+    def test_report_accumulates_phases_per_client_method(self):
+        profiler = Profiler()
+        for _ in range(2):
+            with profiler.start_span("CHARGE_VIA_CARD", {}) as span:
+                with span.phase(RequestPhase.VALIDATION):
+                    sum(range(1000))
+                with span.phase(RequestPhase.ENCRYPTION):
+                    sum(range(1000))
+        report = profiler.report()
+        self.assertEqual(list(report), ["CHARGE_VIA_CARD"])
+        charge_via_card = report["CHARGE_VIA_CARD"]
+        self.assertEqual(charge_via_card["calls"], 2)
+        self.assertEqual(charge_via_card["errors"], 0)
+        self.assertEqual(
+            list(charge_via_card["phases"]), ["validation", "encryption", OTHER_PHASE]
+        )
+        self.assertEqual(charge_via_card["phases"]["validation"]["count"], 2)
+        self.assertAlmostEqual(
+            sum(phase["wall"] for phase in charge_via_card["phases"].values()),
+            charge_via_card["wall"],
+        )
+        self.assertIn("CHARGE_VIA_CARD", profiler.format_report())
+
+    def test_errors_are_counted_and_reset_discards_timings(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.start_span("GET_BALANCES", {}):
+                raise ValueError("invalid parameters")
+        self.assertEqual(profiler.report()["GET_BALANCES"]["errors"], 1)
+        profiler.reset()
+        self.assertEqual(profiler.report(), {})
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    time.sleep(0.01)
+    return httpx.Response(
+        200, json={"status": True, "message": "Successful", "data": []}
+    )
+
+
+class ClientProfilingTestCase(TestCase):
+    def check_report(self, profiler: Profiler):
+        get_balances = profiler.report()["GET_BALANCES"]
+        self.assertEqual(get_balances["calls"], 2)
+        self.assertEqual(get_balances["errors"], 0)
+        phases = get_balances["phases"]
+        self.assertEqual(
+            list(phases), ["headers", "network", "deserialization", OTHER_PHASE]
+        )
+        self.assertEqual({phase["count"] for phase in phases.values()}, {2})
+        self.assertGreaterEqual(phases["network"]["wall"], 0.02)
+        self.assertLess(phases["headers"]["wall"], phases["network"]["wall"])
+        self.assertAlmostEqual(
+            sum(phase["wall"] for phase in phases.values()), get_balances["wall"]
+        )
+
+    def test_client_calls_are_profiled(self):
+        profiler = Profiler()
+        with KorapayClient(
+            **CLIENT_KEYS, tracer=profiler, transport=httpx.MockTransport(handler)
+        ) as client:
+            client.get_balances()
+            client.get_balances()
+        self.check_report(profiler)
+
+    def test_async_client_calls_are_profiled(self):
+        async def async_handler(request: httpx.Request) -> httpx.Response:
+            return handler(request)
+
+        async def get_balances():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS,
+                tracer=profiler,
+                transport=httpx.MockTransport(async_handler),
+            ) as client:
+                await client.get_balances()
+                await client.get_balances()
+
+        profiler = Profiler()
+        asyncio.run(get_balances())
+        self.check_report(profiler)
@@ -0,0 +1,160 @@
+import asyncio
+from decimal import Decimal
+from unittest import TestCase
+
+from korapay_client import (
+    AsyncKorapayClient,
+    Currency,
+    DiscrepancyType,
+    KorapayClient,
+    TransactionKind,
+)
+from korapay_client.reconciliation import (
+    AsyncReconciler,
+    LedgerRecord,
+    Reconciler,
+    diff_records,
+)
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+class ReconciliationTestCase(TestCase):
+    def setUp(self):
+        self.fake = FakeKorapay(balances={"NGN": 100_000})
+        self.transport = FakeKorapayTransport(self.fake)
+        client = KorapayClient(**CLIENT_KEYS, transport=self.transport)
+        for index in range(5):
+            client.charge_via_bank_transfer(
+                reference=f"charge-{index}",
+                customer_email="johndoe@example.com",
+                amount=1_000,
+                currency=Currency.NGN,
+            )
+            client.payout_to_bank_account(
+                reference=f"payout-{index}",
+                amount=2_000,
+                currency=Currency.NGN,
+                bank_code="033",
+                account_number="0000000000",
+                customer_email="johndoe@example.com",
+            )
+        self.records = [
+            *(
+                LedgerRecord(f"charge-{index}", TransactionKind.CHARGE, 1_000)
+                for index in range(5)
+            ),
+            *(
+                LedgerRecord(
+                    f"payout-{index}", TransactionKind.PAYOUT, "2000.00", "success"
+                )
+                for index in range(5)
+            ),
+            LedgerRecord("charge-1", TransactionKind.CHARGE, 1_000),
+            LedgerRecord("charge-9", TransactionKind.CHARGE, 1_000),
+        ]
+        self.records[2].amount = Decimal("999.99")
+        self.records[7].status = "failed"
+
+    def check_report(self, report):
+        self.assertEqual(report.records, 12)
+        self.assertEqual(report.matched, 8)
+        self.assertEqual(
+            {
+                (discrepancy.reference, discrepancy.type)
+                for discrepancy in report.discrepancies
+            },
+            {
+                ("charge-2", DiscrepancyType.AMOUNT_MISMATCH),
+                ("payout-2", DiscrepancyType.STATUS_MISMATCH),
+                ("charge-1", DiscrepancyType.DUPLICATE),
+                ("charge-9", DiscrepancyType.MISSING),
+            },
+        )
+
+    def test_reconcile(self):
+        reconciler = Reconciler(
+            KorapayClient(**CLIENT_KEYS, transport=self.transport),
+            concurrency=4,
+            chunk_size=4,
+        )
+        self.check_report(reconciler.run(self.records))
+
+    def test_reconcile_async(self):
+        async def reconcile():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            ) as client:
+                reconciler = AsyncReconciler(client, concurrency=4, chunk_size=4)
+                return await reconciler.run(self.records)
+
+        self.check_report(asyncio.run(reconcile()))
+
+    def test_status_map(self):
+        record = LedgerRecord("payout-0", TransactionKind.PAYOUT, status="paid")
+        reconciler = Reconciler(
+            KorapayClient(**CLIENT_KEYS, transport=self.transport),
+            status_map={"success": "paid"},
+        )
+        self.assertEqual(list(reconciler.iter_discrepancies([record])), [])
+
+    def test_diff_records(self):
+        transactions = [
+            {"reference": "a", "amount": "100.00", "status": "success"},
+            {"reference": "b", "amount": 200, "status": "success"},
+            {"reference": "c", "amount": 300, "status": "success"},
+        ]
+        records = [
+            LedgerRecord("a", TransactionKind.CHARGE, 100, "success"),
+            LedgerRecord("b", TransactionKind.CHARGE, 250),
+            LedgerRecord("d", TransactionKind.CHARGE, 400),
+        ]
+        self.assertEqual(
+            [
+                (discrepancy.reference, discrepancy.type)
+                for discrepancy in diff_records(records, transactions)
+            ],
+            [
+                ("b", DiscrepancyType.AMOUNT_MISMATCH),
+                ("d", DiscrepancyType.MISSING),
+                ("c", DiscrepancyType.UNEXPECTED),
+            ],
+        )
+
+    def test_charges_and_payouts_may_share_references(self):
+        client = KorapayClient(**CLIENT_KEYS, transport=self.transport)
+        client.payout_to_bank_account(
+            reference="charge-0",
+            amount=2_000,
+            currency=Currency.NGN,
+            bank_code="033",
+            account_number="0000000000",
+            customer_email="johndoe@example.com",
+        )
+        records = [
+            LedgerRecord("charge-0", TransactionKind.CHARGE, 1_000),
+            LedgerRecord("charge-0", TransactionKind.PAYOUT, "2000.00"),
+        ]
+        reconciler = Reconciler(client, chunk_size=1)
+        report = reconciler.run(records)
+        self.assertEqual(report.matched, 2)
+        self.assertEqual(report.discrepancies, [])
+
+    def test_duplicates_are_reported_within_the_window(self):
+        records = [
+            LedgerRecord(reference, TransactionKind.CHARGE)
+            for reference in ("a", "b", "a", "c", "a")
+        ]
+        self.assertEqual(
+            [
+                discrepancy.type
+                for discrepancy in diff_records(records, [], duplicate_window=2)
+                if discrepancy.type is DiscrepancyType.DUPLICATE
+            ],
+            [DiscrepancyType.DUPLICATE],
+        )
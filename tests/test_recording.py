@@ -0,0 +1,71 @@
+import asyncio
+import gzip
+import os
+import tempfile
+from unittest import TestCase
+
+from korapay_client import AsyncKorapayClient, Authorization, KorapayClient
+from korapay_client.testing import (
+    CassetteMissError,
+    FakeKorapay,
+    FakeKorapayTransport,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+VALID_ENCRYPTION_KEY = "a" * 32
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": VALID_ENCRYPTION_KEY,
+}
+
+
+class RecordingTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cassette.jsonl.gz")
+
+    def record(self):
+        fake = FakeKorapay(encryption_key=VALID_ENCRYPTION_KEY)
+        transport = RecordingTransport(
+            self.path,
+            transport=FakeKorapayTransport(fake),
+            secrets=["0000000000"],
+        )
+        with KorapayClient(**CLIENT_KEYS, transport=transport) as client:
+            balances = client.get_balances()
+            resolved = client.resolve_bank_account("033", "0000000000")
+            client.authorize_card_charge("KPY-CA-1", Authorization(pin="1234"))
+        return balances, resolved
+
+    def test_replay_returns_the_recorded_responses(self):
+        balances, resolved = self.record()
+        transport = ReplayTransport(self.path, secrets=["0000000000"])
+        with KorapayClient(**CLIENT_KEYS, transport=transport) as client:
+            self.assertEqual(client.get_balances(), balances)
+            self.assertEqual(
+                client.resolve_bank_account("033", "0000000000").data["bank_name"],
+                resolved.data["bank_name"],
+            )
+            with self.assertRaises(CassetteMissError):
+                client.get_balances()
+
+    def test_cassettes_contain_no_secrets(self):
+        self.record()
+        with gzip.open(self.path, "rt") as file:
+            cassette = file.read()
+        for secret in ("test-secret-key", "Bearer", "1234", "0000000000"):
+            self.assertNotIn(secret, cassette)
+
+    def test_async_clients_replay_cassettes(self):
+        balances, _ = self.record()
+
+        async def get_balances():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=ReplayTransport(self.path, repeat=True)
+            ) as client:
+                return [await client.get_balances() for _ in range(2)]
+
+        self.assertEqual(asyncio.run(get_balances()), [balances, balances])
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from korapay_client.enums import ClientMethod
+from korapay_client.references import (
+    REFERENCE_LENGTH,
+    ReferenceGenerator,
+    generate_reference,
+)
+
+
+class ReferenceGeneratorTestCase(TestCase):
+    def test_references_are_unique_and_ordered(self):
+        generator = ReferenceGenerator()
+        references = [generator.generate() for _ in range(10_000)]
+        time.sleep(0.002)
+        references += generator.batch(10_000)
+        self.assertEqual(len(set(references)), len(references))
+        self.assertEqual(references, sorted(references))
+        self.assertTrue(
+            all(len(reference) == REFERENCE_LENGTH for reference in references)
+        )
+
+    def test_references_are_unique_across_threads(self):
+        generator = ReferenceGenerator()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            batches = list(executor.map(lambda _: generator.batch(5_000), range(8)))
+        references = [reference for batch in batches for reference in batch]
+        self.assertEqual(len(set(references)), len(references))
+
+    def test_prefixes_per_client_method(self):
+        generator = ReferenceGenerator(
+            prefix="KC-", prefixes={ClientMethod.PAYOUT_TO_BANK_ACCOUNT: "PO-"}
+        )
+        self.assertTrue(
+            generator.generate(ClientMethod.PAYOUT_TO_BANK_ACCOUNT).startswith("PO-")
+        )
+        self.assertTrue(generator(ClientMethod.GET_BALANCES).startswith("KC-"))
+        self.assertTrue(generate_reference("X-").startswith("X-"))
+        with self.assertRaises(ValueError):
+            ReferenceGenerator(prefix="no spaces")
+
+    def test_timestamps_are_recovered_from_references(self):
+        before = datetime.now(timezone.utc).replace(microsecond=0)
+        reference = ReferenceGenerator(prefix="PO-").generate()
+        generated_at = ReferenceGenerator.timestamp(reference)
+        self.assertLessEqual(before, generated_at)
+        self.assertLess((generated_at - before).total_seconds(), 5)
+        with self.assertRaises(ValueError):
+            ReferenceGenerator.timestamp("not-a-generated-ref")
@@ -0,0 +1,139 @@
+import json
+from decimal import Decimal
+from unittest import TestCase
+
+from korapay_client import Currency, KorapayClient
+from korapay_client.enums import ClientMethod
+from korapay_client.testing import (
+    FakeKorapay,
+    FakeKorapayServer,
+    FakeKorapayTransport,
+    FaultInjection,
+)
+
+VALID_ENCRYPTION_KEY = "a" * 32
+
+
+def make_client(**kwargs) -> KorapayClient:
+    return KorapayClient(
+        public_key="test-public-key",
+        secret_key="test-secret-key",
+        encryption_key=VALID_ENCRYPTION_KEY,
+        **kwargs,
+    )
+
+
+class FakeKorapayTestCase(TestCase):
+    def test_payouts_are_tracked_and_debit_the_balance(self):
+        fake = FakeKorapay(balances={"NGN": 5_000})
+        client = make_client(transport=FakeKorapayTransport(fake))
+        payout = {
+            "reference": "payout-1",
+            "amount": 1_500,
+            "currency": Currency.NGN,
+            "bank_code": "033",
+            "account_number": "0000000000",
+            "customer_email": "johndoe@example.com",
+        }
+        response = client.payout_to_bank_account(**payout)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "processing")
+        self.assertEqual(fake.balances["NGN"]["available_balance"], Decimal(3_500))
+
+        duplicate = client.payout_to_bank_account(**payout)
+        self.assertEqual(duplicate.status_code, 400)
+        verified = client.get_payout_transaction("payout-1")
+        self.assertEqual(verified.data["status"], "success")
+        self.assertEqual(fake.requests[ClientMethod.PAYOUT_TO_BANK_ACCOUNT], 2)
+
+    def test_injected_errors_are_not_processed(self):
+        fake = FakeKorapay(
+            endpoint_faults={
+                ClientMethod.CHARGE_VIA_BANK_TRANSFER: FaultInjection(rate_limit_rate=1)
+            }
+        )
+        client = make_client(transport=FakeKorapayTransport(fake))
+        response = client.charge_via_bank_transfer(
+            reference="charge-1",
+            customer_email="johndoe@example.com",
+            amount=1_000,
+            currency=Currency.NGN,
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(fake.charges, {})
+        self.assertEqual(fake.errors[ClientMethod.CHARGE_VIA_BANK_TRANSFER], 1)
+
+    def test_server_serves_clients_over_http(self):
+        with FakeKorapayServer(FakeKorapay(public_key="test-public-key")) as server:
+            with make_client(base_url=server.url) as client:
+                response = client.get_balances()
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("NGN", response.data)
+
+    def test_invalid_bodies_are_rejected(self):
+        fake = FakeKorapay()
+        customer = {"name": "John Doe", "email": "johndoe@example.com"}
+        payout = {"amount": 1_000, "currency": "NGN"}
+        requests = [
+            ("/merchant/api/v1/transactions/disburse", []),
+            ("/merchant/api/v1/transactions/disburse", {"destination": []}),
+            (
+                "/merchant/api/v1/transactions/disburse",
+                {
+                    "reference": "payout-1",
+                    "destination": {**payout, "bank_account": "x"},
+                },
+            ),
+            ("/merchant/api/v1/charges/bank-transfer", []),
+            (
+                "/merchant/api/v1/charges/bank-transfer",
+                {"reference": "charge-1", **payout, "customer": "x"},
+            ),
+            ("/merchant/api/v1/virtual-bank-account", []),
+            (
+                "/merchant/api/v1/virtual-bank-account",
+                {
+                    "account_name": "John Doe",
+                    "account_reference": "vba-1",
+                    "bank_code": "000",
+                    "customer": "x",
+                    "kyc": {"bvn": "12345678901"},
+                },
+            ),
+            (
+                "/merchant/api/v1/virtual-bank-account",
+                {
+                    "account_name": "John Doe",
+                    "account_reference": "vba-1",
+                    "bank_code": "000",
+                    "customer": customer,
+                    "kyc": "x",
+                },
+            ),
+            (
+                "/merchant/api/v1/virtual-bank-account",
+                {
+                    "account_name": "John Doe",
+                    "account_reference": "vba-1",
+                    "bank_code": "000",
+                    "customer": customer,
+                    "kyc": {"nin": "12345678901"},
+                },
+            ),
+            (
+                "/merchant/api/v1/charges/mobile-money",
+                {"reference": "charge-2", **payout, "mobile_money": "x"},
+            ),
+        ]
+        for path, body in requests:
+            with self.subTest(path=path, body=body):
+                response = fake.handle(
+                    "POST",
+                    path,
+                    {},
+                    {"authorization": "Bearer test-secret-key"},
+                    json.dumps(body).encode(),
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.body["status"])
+        self.assertEqual(fake.virtual_bank_accounts, {})
@@ -0,0 +1,141 @@
+import asyncio
+from contextlib import contextmanager
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import AsyncKorapayClient, ClientError, KorapayClient
+from korapay_client.enums import RequestPhase
+from korapay_client.tracing import NoopTracer, Span, Tracer
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+class RecordingSpan(Span):
+    def __init__(self, name: str = "", attributes: dict | None = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.phases = []
+        self.errors = []
+        self.ended = False
+
+    @contextmanager
+    def phase(self, phase: RequestPhase):
+        self.phases.append(phase)
+        yield
+
+    def set_attribute(self, key, value) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.errors.append(error)
+
+    def end(self) -> None:
+        self.ended = True
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes) -> Span:
+        span = RecordingSpan(name, attributes)
+        self.spans.append(span)
+        return span
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, json={"status": True, "message": "Successful", "data": []}
+    )
+
+
+def failing_handler(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+class TracingTestCase(TestCase):
+    def test_noop_tracer_spans_do_nothing(self):
+        tracer = NoopTracer()
+        span = tracer.start_span("GET_BALANCES", {})
+        self.assertIs(tracer.start_span("CHARGE_VIA_CARD", {}), span)
+        with self.assertRaises(ValueError):
+            with span:
+                with span.phase(RequestPhase.NETWORK) as phase:
+                    self.assertIsNone(phase)
+                    span.set_attribute("http.response.status_code", 200)
+                    raise ValueError("errors propagate out of noop spans")
+
+    def test_span_records_errors_before_ending(self):
+        span = RecordingSpan()
+        error = ValueError("invalid parameters")
+        with self.assertRaises(ValueError):
+            with span:
+                raise error
+        self.assertEqual(span.errors, [error])
+        self.assertTrue(span.ended)
+
+
+class ClientTracingTestCase(TestCase):
+    def setUp(self):
+        self.tracer = RecordingTracer()
+
+    def check_span(self, span: RecordingSpan):
+        self.assertEqual(span.name, "GET_BALANCES")
+        self.assertEqual(
+            span.attributes,
+            {
+                "korapay.client_method": "GET_BALANCES",
+                "http.request.method": "GET",
+                "korapay.endpoint": "/merchant/api/v1/balances",
+                "http.response.status_code": 200,
+            },
+        )
+        self.assertEqual(
+            span.phases,
+            [
+                RequestPhase.HEADERS,
+                RequestPhase.NETWORK,
+                RequestPhase.DESERIALIZATION,
+            ],
+        )
+        self.assertEqual(span.errors, [])
+        self.assertTrue(span.ended)
+
+    def test_client_requests_are_traced(self):
+        with KorapayClient(
+            **CLIENT_KEYS, tracer=self.tracer, transport=httpx.MockTransport(handler)
+        ) as client:
+            client.get_balances()
+        (span,) = self.tracer.spans
+        self.check_span(span)
+
+    def test_async_client_requests_are_traced(self):
+        async def get_balances():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS,
+                tracer=self.tracer,
+                transport=httpx.MockTransport(handler),
+            ) as client:
+                await client.get_balances()
+
+        asyncio.run(get_balances())
+        (span,) = self.tracer.spans
+        self.check_span(span)
+
+    def test_failed_requests_record_their_error(self):
+        with KorapayClient(
+            **CLIENT_KEYS,
+            tracer=self.tracer,
+            transport=httpx.MockTransport(failing_handler),
+        ) as client:
+            with self.assertRaises(ClientError):
+                client.get_balances()
+        (span,) = self.tracer.spans
+        self.assertNotIn("http.response.status_code", span.attributes)
+        self.assertEqual([type(error) for error in span.errors], [ClientError])
+        self.assertTrue(span.ended)
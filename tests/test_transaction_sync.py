@@ -0,0 +1,178 @@
+import asyncio
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from unittest import TestCase
+
+from korapay_client import AsyncKorapayClient, Currency, KorapayClient
+from korapay_client.testing import FakeKorapay, FakeKorapayTransport
+from korapay_client.transaction_sync import (
+    AsyncTransactionSync,
+    Checkpoint,
+    InMemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    TransactionSync,
+)
+
+CLIENT_KEYS = {
+    "public_key": "test-public-key",
+    "secret_key": "test-secret-key",
+    "encryption_key": "a" * 32,
+}
+
+
+class TransactionSyncTestCase(TestCase):
+    def setUp(self):
+        self.fake = FakeKorapay()
+        self.client = KorapayClient(
+            **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+        )
+        self.account_numbers = []
+        for index in range(3):
+            account = self.client.create_virtual_bank_account(
+                account_name="John Doe",
+                account_reference=f"vba-{index}",
+                bank_code="000",
+                customer_name="John Doe",
+                bvn="12345678901",
+                customer_email="johndoe@example.com",
+            )
+            self.account_numbers.append(account.data["account_number"])
+        self.credit(5)
+        self.handled = defaultdict(list)
+
+    def credit(self, count: int) -> None:
+        for account_number in self.account_numbers:
+            for _ in range(count):
+                self.client.credit_sandbox_virtual_bank_account(
+                    account_number, 100, Currency.NGN
+                )
+
+    def handle(self, account_number, transactions):
+        self.handled[account_number].extend(
+            transaction["reference"] for transaction in transactions
+        )
+
+    def assert_each_transaction_handled_once(self, count: int):
+        for account_number in self.account_numbers:
+            references = self.handled[account_number]
+            self.assertEqual(len(references), count)
+            self.assertEqual(len(set(references)), count)
+
+    def test_only_new_transactions_are_handled(self):
+        sync = TransactionSync(
+            self.client, InMemoryCheckpointStore(), self.handle, page_size=2
+        )
+        results = sync.run(self.account_numbers)
+        self.assertEqual(
+            [result.new_transactions for result in results.values()], [5, 5, 5]
+        )
+        self.credit(3)
+        results = sync.run(self.account_numbers)
+        self.assertEqual(
+            [result.new_transactions for result in results.values()], [3, 3, 3]
+        )
+        self.assert_each_transaction_handled_once(8)
+
+    def test_checkpoints_persist_across_runs(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "checkpoints.sqlite3")
+        with SQLiteCheckpointStore(path) as store:
+            TransactionSync(self.client, store, self.handle).run(self.account_numbers)
+        self.credit(1)
+        with SQLiteCheckpointStore(path) as store:
+            TransactionSync(self.client, store, self.handle).run(self.account_numbers)
+            checkpoint = store.get(self.account_numbers[0])
+        self.assert_each_transaction_handled_once(6)
+        self.assertEqual(len(checkpoint.references), 1)
+
+    def test_failed_accounts_keep_their_checkpoint(self):
+        def fail(account_number, transactions):
+            raise RuntimeError("ledger unavailable")
+
+        store = InMemoryCheckpointStore()
+        results = TransactionSync(self.client, store, fail).run(["9999999999"])
+        self.assertIsNotNone(results["9999999999"].error)
+        results = TransactionSync(self.client, store, fail).run(self.account_numbers)
+        self.assertIsInstance(results[self.account_numbers[0]].error, RuntimeError)
+        self.assertIsNone(store.get(self.account_numbers[0]))
+
+    def test_async_sync_handles_only_new_transactions(self):
+        store = InMemoryCheckpointStore()
+
+        async def handle(account_number, transactions):
+            self.handle(account_number, transactions)
+
+        async def run():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            ) as client:
+                sync = AsyncTransactionSync(
+                    client, store, handle, concurrency=2, page_size=2
+                )
+                return await sync.run(self.account_numbers)
+
+        asyncio.run(run())
+        self.credit(2)
+        results = asyncio.run(run())
+        self.assertEqual(
+            [result.new_transactions for result in results.values()], [2, 2, 2]
+        )
+        self.assert_each_transaction_handled_once(7)
+
+    def test_undated_transactions_are_handled_once(self):
+        transactions = [
+            {"reference": "dated-1", "date": "2026-01-01 10:00:00"},
+            {"reference": "undated-1", "date": None},
+        ]
+
+        class Client:
+            def iter_virtual_bank_account_transactions(self, account_number, **params):
+                return iter(transactions)
+
+        store = InMemoryCheckpointStore()
+        sync = TransactionSync(Client(), store, self.handle)
+        sync.run(["0000000000"])
+        transactions.append({"reference": "undated-2"})
+        results = sync.run(["0000000000"])
+        self.assertEqual(results["0000000000"].new_transactions, 1)
+        self.assertEqual(
+            self.handled["0000000000"], ["dated-1", "undated-1", "undated-2"]
+        )
+        self.assertEqual(
+            store.get("0000000000").undated_references,
+            frozenset({"undated-1", "undated-2"}),
+        )
+
+    def test_sqlite_checkpoints_keep_undated_references(self):
+        with SQLiteCheckpointStore(":memory:") as store:
+            store.set(
+                Checkpoint("0000000000", "", frozenset(), 0.0, frozenset({"undated-1"}))
+            )
+            checkpoint = store.get("0000000000")
+        self.assertEqual(checkpoint.undated_references, frozenset({"undated-1"}))
+
+    def test_async_sync_calls_the_store_off_the_event_loop(self):
+        threads = []
+
+        class RecordingStore(InMemoryCheckpointStore):
+            def get(self, account_number):
+                threads.append(threading.current_thread())
+                return super().get(account_number)
+
+            def set(self, checkpoint):
+                threads.append(threading.current_thread())
+                super().set(checkpoint)
+
+        async def run():
+            async with AsyncKorapayClient(
+                **CLIENT_KEYS, transport=FakeKorapayTransport(self.fake)
+            ) as client:
+                sync = AsyncTransactionSync(client, RecordingStore(), self.handle)
+                await sync.run(self.account_numbers[:1])
+
+        asyncio.run(run())
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
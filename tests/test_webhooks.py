@@ -0,0 +1,319 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from unittest import TestCase
+
+import httpx
+
+from korapay_client import (
+    InvalidWebhookPayloadError,
+    InvalidWebhookSignatureError,
+    WebhookEventType,
+)
+from korapay_client.webhooks import (
+    ChargeEvent,
+    InMemoryDeduplicationStore,
+    SQLiteDeduplicationStore,
+    TransferEvent,
+    WebhookEvent,
+    WebhookReceiver,
+    WebhookVerifier,
+    deduplication_key,
+)
+
+SECRET_KEY = "sk_test_webhooks"
+
+TRANSFER_EVENT = {
+    "event": "transfer.success",
+    "data": {
+        "fee": "10.75",
+        "amount": "1000.00",
+        "status": "success",
+        "currency": "NGN",
+        "reference": "ref-0000000001",
+        "narration": "Naïra payout",
+    },
+}
+
+
+def compact(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf8")
+
+
+class WebhookVerifierTestCase(TestCase):
+    def setUp(self):
+        self.verifier = WebhookVerifier(SECRET_KEY)
+        self.signature = self.verifier.sign(TRANSFER_EVENT["data"])
+
+    def test_verifies_signatures_of_raw_bodies(self):
+        body = compact(TRANSFER_EVENT)
+        self.assertTrue(self.verifier.verify(body, self.signature))
+        self.assertTrue(self.verifier.verify(body.decode("utf8"), self.signature))
+        self.assertTrue(self.verifier.verify(body, self.signature.upper()))
+        self.assertTrue(
+            self.verifier.verify_data(TRANSFER_EVENT["data"], self.signature)
+        )
+
+    def test_verifies_reformatted_bodies(self):
+        body = json.dumps(TRANSFER_EVENT, indent=2).encode("utf8")
+        self.assertTrue(self.verifier.verify(body, self.signature))
+
+    def test_rejects_tampered_or_missing_signatures(self):
+        tampered = {**TRANSFER_EVENT, "data": {**TRANSFER_EVENT["data"], "amount": "9"}}
+        self.assertFalse(self.verifier.verify(compact(tampered), self.signature))
+        self.assertFalse(self.verifier.verify(compact(TRANSFER_EVENT), None))
+        with self.assertRaises(InvalidWebhookSignatureError):
+            self.verifier.parse(compact(tampered), self.signature)
+        with self.assertRaises(InvalidWebhookSignatureError):
+            WebhookVerifier("another-key").parse(
+                compact(TRANSFER_EVENT), self.signature
+            )
+
+    def test_rejects_non_ascii_signatures(self):
+        signature = "\u00e9" * 64
+        self.assertFalse(self.verifier.verify(compact(TRANSFER_EVENT), signature))
+        with self.assertRaises(InvalidWebhookSignatureError):
+            self.verifier.parse(compact(TRANSFER_EVENT), signature)
+
+    def test_signed_data_inside_other_fields_is_not_trusted(self):
+        body = (
+            b'{"event":"transfer.success","note":{"data":'
+            + compact(TRANSFER_EVENT["data"])
+            + b'},"data":{"reference":"ref-forged","amount":"1"}}'
+        )
+        self.assertFalse(self.verifier.verify(body, self.signature))
+
+    def test_parses_events_into_typed_models(self):
+        event = self.verifier.parse(compact(TRANSFER_EVENT), self.signature)
+        self.assertIsInstance(event, TransferEvent)
+        self.assertEqual(event.event, WebhookEventType.TRANSFER_SUCCESS)
+        self.assertEqual(event.data.amount, Decimal("1000.00"))
+        self.assertEqual(event.data.narration, "Naïra payout")
+
+        charge = {
+            "event": "charge.success",
+            "data": {"reference": "KPY-C-1", "payment_method": "card", "extra": 1},
+        }
+        event = self.verifier.parse(compact(charge), self.verifier.sign(charge["data"]))
+        self.assertIsInstance(event, ChargeEvent)
+        self.assertEqual(event.data.extra, 1)
+
+        unknown = {"event": "dispute.opened", "data": {"reference": "KPY-D-1"}}
+        event = self.verifier.parse(
+            compact(unknown), self.verifier.sign(unknown["data"])
+        )
+        self.assertIs(type(event), WebhookEvent)
+        self.assertEqual(event.event, "dispute.opened")
+
+    def test_rejects_invalid_payloads(self):
+        for body in (b"not json", b"[]", b'{"event":"charge.success"}'):
+            with self.assertRaises(InvalidWebhookPayloadError):
+                self.verifier.parse(body, self.signature)
+        payload = {"event": "charge.success", "data": {"amount": "1"}}
+        with self.assertRaises(InvalidWebhookPayloadError):
+            self.verifier.parse(compact(payload), self.verifier.sign(payload["data"]))
+
+
+class DeduplicationStoreTestCase(TestCase):
+    def test_in_memory_store_rejects_duplicates_until_they_expire(self):
+        now = [0.0]
+        store = InMemoryDeduplicationStore(max_size=2, ttl=10, clock=lambda: now[0])
+        self.assertTrue(store.add("charge.success:KPY-C-1"))
+        self.assertFalse(store.add("charge.success:KPY-C-1"))
+        self.assertTrue(store.add("charge.failed:KPY-C-1"))
+        now[0] = 10
+        self.assertNotIn("charge.success:KPY-C-1", store)
+        self.assertTrue(store.add("charge.success:KPY-C-1"))
+
+    def test_in_memory_store_forgets_least_recently_seen_keys(self):
+        store = InMemoryDeduplicationStore(max_size=2)
+        store.add("a")
+        store.add("b")
+        store.add("a")
+        store.add("c")
+        self.assertEqual(len(store), 2)
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+
+    def test_sqlite_store_persists_keys(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "webhooks.sqlite3")
+        key = deduplication_key(TRANSFER_EVENT)
+        with SQLiteDeduplicationStore(path) as store:
+            self.assertTrue(store.add(key))
+            self.assertFalse(store.add(key))
+        with SQLiteDeduplicationStore(path) as store:
+            self.assertIn(key, store)
+            store.discard(key)
+            self.assertTrue(store.add(key))
+        with SQLiteDeduplicationStore(":memory:", ttl=0.01) as store:
+            self.assertTrue(store.add(key))
+            time.sleep(0.02)
+            self.assertTrue(store.add(key))
+
+    def test_keys_of_decoded_and_parsed_events_match(self):
+        verifier = WebhookVerifier(SECRET_KEY)
+        event = verifier.parse(
+            compact(TRANSFER_EVENT), verifier.sign(TRANSFER_EVENT["data"])
+        )
+        self.assertEqual(deduplication_key(event), deduplication_key(TRANSFER_EVENT))
+        self.assertEqual(deduplication_key(event), "transfer.success:ref-0000000001")
+
+
+class WebhookReceiverTestCase(TestCase):
+    def post(self, receiver, payloads, signature=None):
+        async def post_all():
+            transport = httpx.ASGITransport(app=receiver)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://receiver"
+            ) as client:
+                responses = []
+                for payload in payloads:
+                    responses.append(
+                        await client.post(
+                            "/webhooks",
+                            content=compact(payload),
+                            headers={
+                                "x-korapay-signature": signature
+                                or receiver.verifier.sign(payload["data"])
+                            },
+                        )
+                    )
+                await receiver.stop()
+                return responses
+
+        return asyncio.run(post_all())
+
+    def test_acknowledges_and_processes_events(self):
+        handled = []
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            handled.append(event.data.reference)
+
+        receiver = WebhookReceiver(
+            handler,
+            secret_key=SECRET_KEY,
+            deduplication_store=InMemoryDeduplicationStore(),
+        )
+        events = [
+            {"event": "charge.success", "data": {"reference": f"KPY-C-{index}"}}
+            for index in range(3)
+        ]
+        responses = self.post(receiver, [*events, events[0]])
+        self.assertEqual([response.status_code for response in responses], [200] * 4)
+        self.assertEqual(sorted(handled), ["KPY-C-0", "KPY-C-1", "KPY-C-2"])
+        self.assertEqual(receiver.stats["duplicate"], 1)
+        self.assertEqual(receiver.stats["processed"], 3)
+
+    def test_rejects_invalid_signatures(self):
+        receiver = WebhookReceiver(lambda event: None, secret_key=SECRET_KEY)
+        (response,) = self.post(receiver, [TRANSFER_EVENT], signature="0" * 64)
+        self.assertEqual(response.status_code, 401)
+
+    def test_rejects_non_ascii_signatures(self):
+        receiver = WebhookReceiver(lambda event: None, secret_key=SECRET_KEY)
+        (response,) = self.post(
+            receiver, [TRANSFER_EVENT], signature="\u00e9".encode("latin-1") * 64
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_applies_backpressure_when_the_queue_is_full(self):
+        async def handler(event):
+            await asyncio.sleep(60)
+
+        receiver = WebhookReceiver(
+            handler,
+            secret_key=SECRET_KEY,
+            workers=1,
+            max_queue_size=1,
+            deduplication_store=InMemoryDeduplicationStore(),
+            drain_timeout=0.1,
+        )
+        events = [
+            {"event": "transfer.success", "data": {"reference": f"ref-{index}"}}
+            for index in range(4)
+        ]
+        responses = self.post(receiver, events)
+        status_codes = [response.status_code for response in responses]
+        self.assertIn(503, status_codes)
+        rejected = status_codes.index(503)
+        self.assertEqual(responses[rejected].headers["retry-after"], "30")
+        self.assertNotIn(
+            deduplication_key(events[rejected]), receiver.deduplication_store
+        )
+
+    def test_failed_events_can_be_redelivered(self):
+        errors = []
+        store = InMemoryDeduplicationStore()
+
+        def handler(event):
+            raise RuntimeError("downstream is down")
+
+        receiver = WebhookReceiver(
+            handler,
+            secret_key=SECRET_KEY,
+            deduplication_store=store,
+            on_error=lambda event, error: errors.append(error),
+        )
+        self.post(receiver, [TRANSFER_EVENT])
+        self.assertEqual(receiver.stats["failed"], 1)
+        self.assertIsInstance(errors[0], RuntimeError)
+        self.assertNotIn(deduplication_key(TRANSFER_EVENT), store)
+
+    def test_events_dropped_on_stop_can_be_redelivered(self):
+        async def handler(event):
+            await asyncio.sleep(60)
+
+        store = InMemoryDeduplicationStore()
+        receiver = WebhookReceiver(
+            handler,
+            secret_key=SECRET_KEY,
+            workers=1,
+            max_queue_size=2,
+            deduplication_store=store,
+            drain_timeout=0.1,
+        )
+        events = [
+            {"event": "transfer.success", "data": {"reference": f"ref-{index}"}}
+            for index in range(2)
+        ]
+        responses = self.post(receiver, events)
+        self.assertEqual([response.status_code for response in responses], [200] * 2)
+        self.assertEqual(receiver.stats["dropped"], 2)
+        for event in events:
+            self.assertNotIn(deduplication_key(event), store)
+
+    def test_rejects_events_received_before_start(self):
+        store = InMemoryDeduplicationStore()
+        receiver = WebhookReceiver(
+            lambda event: None, secret_key=SECRET_KEY, deduplication_store=store
+        )
+        status_code, _ = receiver.receive(
+            compact(TRANSFER_EVENT), receiver.verifier.sign(TRANSFER_EVENT["data"])
+        )
+        self.assertEqual(status_code, 503)
+        self.assertNotIn(deduplication_key(TRANSFER_EVENT), store)
+
+    def test_calls_the_deduplication_store_off_the_event_loop(self):
+        threads = []
+
+        class RecordingStore(InMemoryDeduplicationStore):
+            def add(self, key):
+                threads.append(threading.current_thread())
+                return super().add(key)
+
+        receiver = WebhookReceiver(
+            lambda event: None,
+            secret_key=SECRET_KEY,
+            deduplication_store=RecordingStore(),
+        )
+        (response,) = self.post(receiver, [TRANSFER_EVENT])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())